@@ -27,6 +27,13 @@ import os
 import subprocess
 import sys
 from config_manager import ConfigManager
+from config_models import ProfileConfig, ProgramConfig
+from event_bus import LAUNCH_PROGRAM_ADOPTED, LAUNCH_PROGRAM_SKIPPED, LAUNCH_RUN_FINISHED
+from launch_engine import LaunchEngine, Spawner, spawn_process
+from prefetch import Prefetcher
+from process_tree import is_alive
+
+LAUNCH_ALL_DELAY = 1.5 # Seconds between programs in Launch All (small delay to prevent system overload)
 
 class ToolTip:
     """Create a tooltip for a given widget"""
@@ -64,6 +71,15 @@ class ToolTip:
         """Update the tooltip text"""
         self.text = new_text
 
+class _RowSpawner(Spawner):
+    """Launches through the program rows so each row shows its launch status."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def spawn(self, program, popen_kwargs, on_result):
+        on_result(self.app.start_program_row(self.app.launch_rows[id(program)], popen_kwargs))
+
 class StreamerApp:
     """Main application class for EZ Streaming"""
     
@@ -76,6 +92,11 @@ class StreamerApp:
         self.profiles = {"Default": []}
         self.changes_made = False
         self.is_initial_loading = True  # Flag to prevent marking changes during initial load
+        self.launch_rows = {} # {id(ProgramConfig): program row} for the current Launch All
+        self.launch_engine = LaunchEngine(_RowSpawner(self), prefetcher=Prefetcher())
+        self.launch_engine.event_bus.subscribe(LAUNCH_PROGRAM_SKIPPED, self._on_launch_skipped)
+        self.launch_engine.event_bus.subscribe(LAUNCH_PROGRAM_ADOPTED, self._on_launch_adopted)
+        self.launch_engine.event_bus.subscribe(LAUNCH_RUN_FINISHED, self._on_launch_all_finished)
 
     def run(self):
         """Start the application UI and main loop"""
@@ -623,7 +644,7 @@ class StreamerApp:
             process = program["process"]
         
             # Check if process is still running
-            if process.poll() is None:
+            if is_alive(process):
                 # Process is still running, check again in 2 seconds
                 self.root.after(2000, lambda p=program: self.monitor_process(p))
             else:
@@ -643,49 +664,82 @@ class StreamerApp:
         if not self.programs:
             self.show_status("No programs configured to launch", self.warning_color, blink=True)
             return
-            
-        launched = 0
-    
-        for program in self.programs:
-            path = program["path_var"].get()
-            name = program["name_var"].get() or "Unknown"
-        
-            if path: 
-                # Update status to "Launching..."
-                program["status_var"].set("Launching...")
-                status_label = [child for child in program["frame"].winfo_children() 
-                            if isinstance(child, ttk.Label)][-1]
-                status_label.configure(foreground=self.launching_color)
-                self.root.update()
+        if self.launch_engine.running:
+            return
 
-                try:
-                    program_dir = os.path.dirname(path)
-                    process = subprocess.Popen([path], cwd=program_dir)
-                
-                    # Store the process object for status checking
-                    program["process"] = process
-                
-                    launched += 1
+        configs = [ProgramConfig(name=program["name_var"].get(), path=program["path_var"].get()) for program in self.programs]
+        self.launch_rows = {id(config): program for config, program in zip(configs, self.programs)}
+        profile = ProfileConfig(name=self.current_profile, launch_delay=LAUNCH_ALL_DELAY, programs=configs)
+        if not self.launch_engine.start(profile):
+            self.show_status("No programs were launched", self.warning_color, blink=True)
+            return
+        self._step_launch_all()
 
-                    # Update status to "Launched"
-                    program["status_var"].set("Launched")
-                    status_label.configure(foreground=self.launched_color)
-                    self.root.update()
-                
-                    # Start monitoring the process
-                    self.monitor_process(program)
+    def _step_launch_all(self):
+        """Runs one LaunchEngine step and schedules the next one on the Tk event loop"""
+        wait = self.launch_engine.step()
+        if wait is not None:
+            self.root.after(int(wait * 1000), self._step_launch_all)
 
-                    # Small delay to prevent system overload
-                    self.root.after(1500)
-                except Exception as e:
-                    # Update status to "Error"
-                    program["status_var"].set("Error")
-                    status_label.configure(foreground=self.error_color)
-                    self.show_status(f"Error launching {name}: {str(e)}", self.error_color, 5000, blink=True)
-        
-        # Show launch summary in status bar
-        if launched > 0:
-            self.show_status(f"Successfully launched {launched} programs", self.launched_color)
+    def start_program_row(self, program, popen_kwargs=None):
+        """
+        Start the program of a row and show the result in the row
+
+        Returns:
+            SpawnResult: The started process, or the error
+        """
+        program["status_var"].set("Launching...")
+        status_label = [child for child in program["frame"].winfo_children()
+                        if isinstance(child, ttk.Label)][-1]
+        status_label.configure(foreground=self.launching_color)
+        self.root.update()
+
+        result = spawn_process(program["path_var"].get(), popen_kwargs)
+        if result.process is not None:
+            # Store the process object for status checking
+            program["process"] = result.process
+            program["status_var"].set("Launched")
+            status_label.configure(foreground=self.launched_color)
+            # Start monitoring the process
+            self.monitor_process(program)
+        else:
+            program["status_var"].set("Error")
+            status_label.configure(foreground=self.error_color)
+            name = program["name_var"].get() or "Unknown"
+            self.show_status(f"Error launching {name}: {result.error}", self.error_color, 5000, blink=True)
+        return result
+
+    def _on_launch_skipped(self, data):
+        """Mark rows whose program path does not exist"""
+        program = self.launch_rows.get(id(data["program"]))
+        if program is not None:
+            program["status_var"].set("Error")
+            status_label = [child for child in program["frame"].winfo_children()
+                            if isinstance(child, ttk.Label)][-1]
+            status_label.configure(foreground=self.error_color)
+            name = data["program"].name or "Unknown"
+            self.show_status(f"Error launching {name}: program not found", self.error_color, 5000, blink=True)
+
+    def _on_launch_adopted(self, data):
+        """Mark rows whose program was already running instead of starting it twice"""
+        program = self.launch_rows.get(id(data["program"]))
+        if program is not None:
+            program["process"] = data["process"]
+            program["status_var"].set("Launched")
+            status_label = [child for child in program["frame"].winfo_children()
+                            if isinstance(child, ttk.Label)][-1]
+            status_label.configure(foreground=self.launched_color)
+            self.monitor_process(program)
+
+    def _on_launch_all_finished(self, data):
+        """Show launch summary in status bar"""
+        launched = data["launched_count"]
+        adopted = data.get("adopted_count", 0)
+        if launched > 0 or adopted > 0:
+            message = f"Successfully launched {launched} programs"
+            if adopted:
+                message += f" ({adopted} already running)"
+            self.show_status(message, self.launched_color)
         else:
             self.show_status("No programs were launched", self.warning_color, blink=True)
 
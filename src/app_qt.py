@@ -30,21 +30,27 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                               QLineEdit, QListWidget, QListWidgetItem, QFrame,
                               QMessageBox, QFileDialog, QInputDialog, QGraphicsOpacityEffect,
                               QSpinBox, QCheckBox)
-from PySide6.QtCore import Qt, Signal, QSize, QTimer, QPropertyAnimation, QEasingCurve, QRect, QEvent, QThread
+from PySide6.QtCore import Qt, Signal, Slot, QObject, QSize, QTimer, QPropertyAnimation, QEasingCurve, QRect, QEvent, QThread
 from PySide6.QtGui import QIcon, QPixmap, QBrush, QColor, QFont, QFontDatabase, QCursor
 
 from config_manager import ConfigManager
 from style_manager import StyleManager # Import StyleManager
 from process_manager import ProcessManager # Import ProcessManager
+from process_index import ProcessIndex # Shared one-sweep process lookup
 from config_models import ProfileConfig, ProgramConfig # Import model classes
 from launch_sequence import LaunchSequence # Import LaunchSequence
+from profile_transition import plan_transition
+from launch_history import LaunchHistory
+from launch_worker import LaunchWorker
+from tracing import CAT_UI, traced
 from exceptions import ProcessError, ConfigError # Import custom exceptions
-from event_bus import UIEventBus, STATUS_UPDATE, PROCESS_LIST_CHANGED, LAUNCH_SEQUENCE_STATE_CHANGED # Import Event Bus
+from event_bus import UIEventBus, STATUS_UPDATE, PROCESS_LIST_CHANGED, PROCESS_STATE_CHANGED, LAUNCH_SEQUENCE_STATE_CHANGED, PRIORITY_ADJUSTED, PROCESS_RESTART, PROCESS_STANDBY_CHANGED # Import Event Bus
 from app_locator import AppLocator # Import App Locator
 
 # Try to import resource monitoring (though we are removing the UI for it for now)
 try:
     from resource_monitor import ResourceMonitor # Keep for potential future use / ProcessManager
+    from priority_governor import GOVERNOR_INTERVAL_MS, STATE_NORMAL, PriorityGovernor
     import psutil
     RESOURCE_MONITORING_AVAILABLE = True # Keep flag, ProcessManager might still use parts
 except ImportError:
@@ -86,13 +92,31 @@ class AppLocatorWorker(QThread):
 
 
 
+class _EventBusDrainer(QObject):
+    """Delivers UIEventBus events published on background threads, in batches, on the Qt thread."""
+
+    wake = Signal()
+
+    def __init__(self, event_bus):
+        super().__init__()
+        self._event_bus = event_bus
+        self.wake.connect(self._drain, Qt.ConnectionType.QueuedConnection)
+        event_bus.set_dispatcher(self.wake.emit) # Emitting is safe from any thread
+
+    @Slot()
+    def _drain(self):
+        self._event_bus.drain()
+
+
 class ProgramWidget(QWidget):
     """Widget representing a single program in the list"""
 
     removed = Signal(object)  # Signal when program is removed
     data_changed = Signal()   # Signal when data changes
 
-    def __init__(self, name=None, path=None, use_custom_delay=False, custom_delay_value=0, parent=None): # Updated delay params
+    def __init__(self, name=None, path=None, use_custom_delay=False, custom_delay_value=0, after=None, ready_probe=None,
+                 priority="", cpu_affinity=None, io_priority="", background=False, restart_policy="never",
+                 standby=False, parent=None): # Updated delay params
         super().__init__(parent)
         # Ensure name and path are strings, not booleans or other types
         self.name = str(name) if name not in (None, False, "") else ""
@@ -102,9 +126,17 @@ class ProgramWidget(QWidget):
         self.custom_delay_value = int(custom_delay_value) if custom_delay_value is not None else 0
         if self.use_custom_delay and self.custom_delay_value == 0:
             self.custom_delay_value = 5 # Set default to 5 if enabled with 0
-
-        self.process = None
-        self.process_timer = None
+        self.after = [str(dep) for dep in after] if after else [] # Program names to launch before this one
+        self.ready_probe = dict(ready_probe) if ready_probe else {} # Readiness probe spec (config file only)
+        # Launch policy (config file only): applied to the process when it is spawned
+        self.priority = priority or ""
+        self.cpu_affinity = list(cpu_affinity) if cpu_affinity else []
+        self.io_priority = io_priority or ""
+        self.background = bool(background) # Throttled under CPU pressure by the PriorityGovernor
+        self.restart_policy = restart_policy or "never" # Relaunched by ProcessManager after unexpected exits
+        self.standby = bool(standby) # Suspended after Launch All until "Go Live"
+
+        self.process = None # Status updates come from ProcessManager's shared poller
 
         self.setup_ui()
         self.connect_signals()
@@ -343,7 +375,7 @@ class ProgramWidget(QWidget):
         """Connect widget signals to slots"""
         self.browse_btn.clicked.connect(self.browse_for_program)
         self.locate_btn.clicked.connect(self.locate_app_by_name)
-        self.launch_btn.clicked.connect(self.launch_program) # Individual launch remains immediate
+        self.launch_btn.clicked.connect(lambda: self.launch_program()) # Individual launch remains immediate
         self.remove_btn.clicked.connect(self.remove_program)
         self.close_btn.clicked.connect(self.close_program)
         self.name_edit.textChanged.connect(self.on_data_changed)
@@ -585,92 +617,92 @@ class ProgramWidget(QWidget):
         msg_box.exec()
 
 
-    def launch_program(self):
-        """Launch the program (immediately, no delay here)"""
+    @traced("ProgramWidget.launch_program", CAT_UI)
+    def launch_program(self, popen_kwargs=None, on_result=None):
+        """
+        Launch the program (immediately, no delay here).
+
+        The spawn itself runs on the app's LaunchWorker thread; the row is updated when the
+        result arrives, and on_result (if given) is then called with the SpawnResult.
+
+        Returns:
+            bool: True if the spawn was queued.
+        """
         path = self.path_edit.text()
-        app_window = self.window() # Get window ref
-        if not app_window or not isinstance(app_window, StreamerApp): return None # Safety check
+        app_window = self.window()
+        if not app_window or not isinstance(app_window, StreamerApp): return False # Safety check
         style_manager = app_window.style_manager
-        process_manager = app_window.process_manager
         event_bus = app_window.event_bus # Get event bus
 
         if not path:
             event_bus.publish(STATUS_UPDATE, {"message": "Cannot launch: No program path provided", "color": style_manager.warning_color})
-            return None
+            return False
         if not os.path.exists(path):
             event_bus.publish(STATUS_UPDATE, {"message": f"Error: Program path does not exist: {path}", "color": style_manager.error_color})
-            return None
+            return False
+        self.status_label.setText("Launching...")
+        self.status_label.setStyleSheet(style_manager.get_status_label_style('launching'))
+        program = self.to_config()
+        app_window.launch_worker.spawn(path, lambda result: self._deliver_spawn_result(app_window, program, result, on_result),
+                                      popen_kwargs, program)
+        return True
+
+    def _deliver_spawn_result(self, app_window, program, result, on_result=None):
+        """
+        Tracks a finished spawn, applies it to the row and calls on_result (runs on the Qt thread).
+
+        The row may have been deleted or moved while the spawn was queued, so the process is
+        tracked through the window that launched it, and on_result is called in any case so
+        a Launch All run never waits on a spawn forever.
+        """
         try:
-            self.status_label.setText("Launching...")
-            self.status_label.setStyleSheet(style_manager.get_status_label_style('launching'))
-            QApplication.processEvents()
-            program_dir = os.path.dirname(path)
-            self.process = subprocess.Popen([path], cwd=program_dir)
-            self.process_timer = QTimer(self)
-            self.process_timer.timeout.connect(self.check_process_status)
-            self.process_timer.start(500)
-            self.close_btn.setVisible(True)
-            process_manager.track(path, self.process) # Use ProcessManager
-            
-            # Update status to launched
-            self.status_label.setText("Launched")
-            self.status_label.setStyleSheet(style_manager.get_status_label_style('launched'))
-            
-            self.set_running_state_ui(True) # Update UI to running state
-            
-            return self.process
-        except (OSError, subprocess.SubprocessError, Exception) as e: # Catch broader errors
-            error_msg = f"Error launching '{os.path.basename(path)}': {str(e)}"
-            self.status_label.setText("Error"); self.status_label.setStyleSheet(style_manager.get_status_label_style('error'))
-            event_bus.publish(STATUS_UPDATE, {"message": error_msg, "color": style_manager.error_color})
-            # Raise ProcessError to potentially handle it higher up if needed
-            # raise ProcessError(error_msg) from e
-            return None # Keep returning None for now
-
-    def check_process_status(self):
-        """Check the status of the launched process"""
+            if result.error is None:
+                app_window.process_manager.track(result.path, result.process, program)
+            self._handle_spawn_result(result)
+        except RuntimeError as e: # The row's C++ object is gone
+            print(f"[ProgramWidget] Row for '{program.name or os.path.basename(result.path)}' no longer exists: {e}")
+        finally:
+            if on_result:
+                on_result(result)
+
+    @traced("ProgramWidget._handle_spawn_result", CAT_UI)
+    def _handle_spawn_result(self, result):
+        """Applies a finished spawn to the row."""
         app_window = self.window()
-        if not app_window or not isinstance(app_window, StreamerApp): return # Safety check
-        style_manager = app_window.style_manager
-        process_manager = app_window.process_manager
+        if app_window and isinstance(app_window, StreamerApp):
+            style_manager = app_window.style_manager
+            if result.error is None:
+                self.process = result.process
+                self.close_btn.setVisible(True)
+
+                # Update status to launched
+                self.status_label.setText("Launched")
+                self.status_label.setStyleSheet(style_manager.get_status_label_style('launched'))
 
-        if not hasattr(self, 'process') or self.process is None:
-            self.reset_status()
-            self.set_running_state_ui(False) # Update UI to not running state
-            if hasattr(self, 'process_timer') and self.process_timer: self.process_timer.stop()
-            return
-        try:
-            # Handle both subprocess.Popen and psutil.Process objects
-            is_running = False
-            if hasattr(self.process, 'poll'):
-                # subprocess.Popen object
-                return_code = self.process.poll()
-                is_running = (return_code is None)
-            elif hasattr(self.process, 'is_running'):
-                # psutil.Process object
-                try:
-                    is_running = self.process.is_running()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    is_running = False
-            
-            if is_running:
-                self.status_label.setText("Launched"); self.status_label.setStyleSheet(style_manager.get_status_label_style('launched'))
                 self.set_running_state_ui(True) # Update UI to running state
+                if result.policy_problems:
+                    app_window.event_bus.publish(STATUS_UPDATE, {
+                        "message": f"{self.get_name() or os.path.basename(result.path)}: {result.policy_problems[0]}",
+                        "color": style_manager.warning_color, "duration": 6000})
             else:
-                self.reset_status()
-                self.process = None
-                self.set_running_state_ui(False) # Update UI to not running state
-                path = self.path_edit.text()
-                if path: process_manager.untrack(path) # Use ProcessManager
-                if hasattr(self, 'process_timer') and self.process_timer: self.process_timer.stop()
-        except Exception as e: # Catch potential errors during poll()
-            print(f"Error checking process status for {self.get_name()}: {e}")
-            self.reset_status()
+                error_msg = f"Error launching '{os.path.basename(result.path)}': {result.error}"
+                self.status_label.setText("Error"); self.status_label.setStyleSheet(style_manager.get_status_label_style('error'))
+                app_window.event_bus.publish(STATUS_UPDATE, {"message": error_msg, "color": style_manager.error_color})
+
+    def apply_process_state(self, is_running: bool):
+        """Updates the row for a running-state transition published by ProcessManager."""
+        app_window = self.window()
+        if not app_window or not isinstance(app_window, StreamerApp): return # Safety check
+        style_manager = app_window.style_manager
+
+        if is_running:
+            # Pick up the tracked object in case another row or an adoption started it
+            self.process = app_window.process_manager.get_running_processes().get(self.get_path(), self.process)
+            self.status_label.setText("Launched"); self.status_label.setStyleSheet(style_manager.get_status_label_style('launched'))
+            self.set_running_state_ui(True) # Update UI to running state
+        else:
             self.process = None
-            self.set_running_state_ui(False) # Update UI to not running state
-            path = self.path_edit.text()
-            if path: process_manager.untrack(path) # Use ProcessManager
-            if hasattr(self, 'process_timer') and self.process_timer: self.process_timer.stop()
+            self.reset_status() # Also updates UI to not running state
 
     def close_program(self):
         """Close the running program after confirmation"""
@@ -683,18 +715,11 @@ class ProgramWidget(QWidget):
         if not hasattr(self, 'process') or self.process is None:
             return
             
-        # Check if process is running
-        is_running = False
-        if hasattr(self.process, 'poll'):
-            is_running = (self.process.poll() is None)
-        elif hasattr(self.process, 'is_running'):
-            try:
-                is_running = self.process.is_running()
-            except:
-                is_running = False
+        # Check if the process (or any helper it spawned) is running
+        path = self.path_edit.text()
+        is_running = process_manager.is_running(path)
                 
         if is_running:
-            path = self.path_edit.text()
             app_name = self.get_name() or "this app"
 
             # Add confirmation dialog
@@ -706,30 +731,13 @@ class ProgramWidget(QWidget):
             try:
                 # Get PID for logging
                 pid = self.process.pid if hasattr(self.process, 'pid') else "Unknown"
-                print(f"[ProgramWidget] Terminating '{app_name}' (PID: {pid})...")
+                print(f"[ProgramWidget] Terminating '{app_name}' (PID: {pid}) and its child processes...")
                 
-                # Handle termination based on process type
-                if hasattr(self.process, 'terminate'):
-                    # subprocess.Popen or psutil.Process - both have terminate()
-                    self.process.terminate()
-                    
-                    # Wait briefly for graceful termination
-                    if hasattr(self.process, 'wait'):
-                        # subprocess.Popen
-                        try:
-                            self.process.wait(timeout=0.5)
-                        except subprocess.TimeoutExpired:
-                            print(f"  Process {pid} did not terminate gracefully, killing.")
-                            self.process.kill()
-                    else:
-                        # psutil.Process - wait a bit then check
-                        import time
-                        time.sleep(0.5)
-                        if self.process.is_running():
-                            print(f"  Process {pid} did not terminate gracefully, killing.")
-                            self.process.kill()
-
-                # Update UI regardless of termination method
+                # Terminates the whole tree, escalating to kill after a short grace period
+                if not process_manager.terminate_tree(path):
+                    print(f"  Warning: Some processes of '{app_name}' are still running.")
+
+                # Update UI regardless of termination result
                 self.reset_status()
                 self.set_running_state_ui(False) # Update UI to not running state
                 process_manager.untrack(path) # Use ProcessManager
@@ -761,6 +769,23 @@ class ProgramWidget(QWidget):
         return os.path.basename(self.path_edit.text()) if not name and self.path_edit.text() else (name or "")
 
     def get_path(self): return self.path_edit.text()
+
+    def to_config(self):
+        """Returns the row's current settings as a ProgramConfig."""
+        return ProgramConfig(
+            name=self.get_name(),
+            path=self.get_path(),
+            use_custom_delay=self.use_custom_delay,
+            custom_delay_value=self.custom_delay_value,
+            after=list(self.after),
+            ready_probe=dict(self.ready_probe),
+            priority=self.priority,
+            cpu_affinity=list(self.cpu_affinity),
+            io_priority=self.io_priority,
+            background=self.background,
+            restart_policy=self.restart_policy,
+            standby=self.standby
+        )
     def on_data_changed(self):
         """Emits the data_changed signal."""
         self.data_changed.emit() # Emit signal for StreamerApp to handle
@@ -789,11 +814,6 @@ class ProgramWidget(QWidget):
                 self.status_label.setText("Launched")
                 self.status_label.setStyleSheet(app_window.style_manager.get_status_label_style('launched'))
                 self.set_running_state_ui(True)
-                
-                if not self.process_timer or not self.process_timer.isActive():
-                    self.process_timer = QTimer(self)
-                    self.process_timer.timeout.connect(self.check_process_status)
-                    self.process_timer.start(1000)
                 return True
         
         # If not tracked by ProcessManager, try to find it using ResourceMonitor logic
@@ -801,22 +821,17 @@ class ProgramWidget(QWidget):
         if RESOURCE_MONITORING_AVAILABLE and hasattr(app_window, 'resource_monitor_instance'): # Check if main app has it
             # Lazily create a ResourceMonitor instance if needed, or use a shared one from StreamerApp
             if app_window.resource_monitor_instance is None:
-                 app_window.resource_monitor_instance = ResourceMonitor()
+                 app_window.resource_monitor_instance = ResourceMonitor(app_window.process_index)
             
             monitor = app_window.resource_monitor_instance
             try:
                 found_process = monitor.get_process_by_path(path)
                 if found_process and found_process.is_running():
-                    app_window.process_manager.track(path, found_process) # Track it
+                    app_window.process_manager.track(path, found_process, self.to_config()) # Track it
                     self.process = found_process
                     self.status_label.setText("Launched")
                     self.status_label.setStyleSheet(app_window.style_manager.get_status_label_style('launched'))
                     self.set_running_state_ui(True)
-                    
-                    if not self.process_timer or not self.process_timer.isActive():
-                        self.process_timer = QTimer(self)
-                        self.process_timer.timeout.connect(self.check_process_status)
-                        self.process_timer.start(1000)
                     return True
             except Exception as e:
                 print(f"Error using ResourceMonitor to check external process for {path}: {e}")
@@ -835,7 +850,6 @@ class ProgramWidget(QWidget):
         if hasattr(self, 'last_locate_result'):
             self.last_locate_result = None
         self.set_running_state_ui(False) # Update UI to not running state
-        QApplication.processEvents()
 
 class StreamerApp(QMainWindow):
     """Main application window for EZ Streaming"""
@@ -859,11 +873,21 @@ class StreamerApp(QMainWindow):
         # --- Removed old launch sequence attributes ---
 
         self.event_bus = UIEventBus() # Instantiate Event Bus
+        self._event_bus_drainer = _EventBusDrainer(self.event_bus) # Listeners always run on the Qt thread
         self.style_manager = StyleManager() # Instantiate StyleManager
-        self.process_manager = ProcessManager(self, self.event_bus) # Instantiate ProcessManager, pass event bus
-        self.launch_sequence = LaunchSequence(self, self.event_bus) # Instantiate LaunchSequence, pass event bus
+        self.process_index = ProcessIndex() # One system process sweep shared by all lookups
         if RESOURCE_MONITORING_AVAILABLE: # Create a shared instance
-            self.resource_monitor_instance = ResourceMonitor()
+            self.resource_monitor_instance = ResourceMonitor(self.process_index)
+        self.process_manager = ProcessManager(self, self.event_bus, self.process_index, self.resource_monitor_instance) # Instantiate ProcessManager, pass event bus
+        self.launch_worker = LaunchWorker() # Spawns programs off the GUI thread
+        self.launch_history = LaunchHistory.in_dir(self.config_manager.config_dir)
+        self.launch_sequence = LaunchSequence(self, self.event_bus, self.launch_history) # Instantiate LaunchSequence, pass event bus
+        self.priority_governor = None # Throttles "background" apps under CPU pressure
+        if RESOURCE_MONITORING_AVAILABLE:
+            self.priority_governor = PriorityGovernor(self.resource_monitor_instance, self.event_bus)
+            self.governor_timer = QTimer(self)
+            self.governor_timer.timeout.connect(self._tick_priority_governor)
+            self.governor_timer.start(GOVERNOR_INTERVAL_MS)
 
 
         # self.setStyleSheet("QWidget:focus { outline: none; }") # Moved to setup_styling
@@ -882,6 +906,7 @@ class StreamerApp(QMainWindow):
         self.update_rename_button_state()
 
         self.is_initial_loading = False
+        self.process_manager.start_status_polling() # One shared status tick for all rows
         
         # Set up timer to check for externally launched processes - REMOVED as per feedback
         # if RESOURCE_MONITORING_AVAILABLE:
@@ -931,6 +956,9 @@ class StreamerApp(QMainWindow):
         profile_layout.addWidget(self.rename_profile_btn)
         self.duplicate_profile_btn = QPushButton("📋"); self.duplicate_profile_btn.setFixedSize(36, 36); self.duplicate_profile_btn.setStyleSheet("font-size: 16px;"); self.duplicate_profile_btn.setToolTip("Copy Profile")
         profile_layout.addWidget(self.duplicate_profile_btn)
+        self.apply_profile_btn = QPushButton("⇄"); self.apply_profile_btn.setFixedSize(36, 36); self.apply_profile_btn.setStyleSheet("font-size: 16px;")
+        self.apply_profile_btn.setToolTip("Switch && Apply: close running apps this profile doesn't use,\nkeep the shared ones running and launch the rest")
+        profile_layout.addWidget(self.apply_profile_btn)
         profile_layout.addWidget(QLabel("New Profile:"), 0, Qt.AlignmentFlag.AlignRight) # Align right
         self.new_profile_entry = QLineEdit(); self.new_profile_entry.setFixedWidth(200); self.new_profile_entry.setMinimumHeight(32); # Style from main stylesheet
         profile_layout.addWidget(self.new_profile_entry)
@@ -972,6 +1000,13 @@ class StreamerApp(QMainWindow):
         # --- End Custom Arrow Buttons ---
 
         profile_layout.addLayout(spin_container_layout) # Add the container layout
+        self.auto_delay_checkbox = QCheckBox("Auto")
+        self.auto_delay_checkbox.setToolTip("Learn each app's delay from how long it took to become ready in previous launches.\nThe delays above are used until enough launches are known.")
+        profile_layout.addWidget(self.auto_delay_checkbox)
+        self.load_delay_checkbox = QCheckBox("Load-aware")
+        self.load_delay_checkbox.setToolTip("Start each app as soon as CPU and disk load allow instead of waiting fixed delays.\n"
+                                            "Thresholds and the maximum wait are set per profile in the config file.")
+        profile_layout.addWidget(self.load_delay_checkbox)
         main_layout.addWidget(profile_frame)
 
     def _setup_list_header(self, main_layout):
@@ -1041,6 +1076,9 @@ class StreamerApp(QMainWindow):
         self.close_all_btn = QPushButton("Close All"); self.close_all_btn.setEnabled(False)
         button_layout.addWidget(self.close_all_btn)
         self.save_btn = QPushButton("Save Profile"); button_layout.addWidget(self.save_btn)
+        self.go_live_btn = QPushButton("Go Live"); self.go_live_btn.setVisible(False) # Shown while apps are in standby
+        self.go_live_btn.setToolTip("Resume every app waiting in standby")
+        button_layout.addWidget(self.go_live_btn)
         self.launch_all_btn = QPushButton("Launch All"); button_layout.addWidget(self.launch_all_btn)
         main_layout.addWidget(button_frame)
 
@@ -1107,12 +1145,16 @@ class StreamerApp(QMainWindow):
         self.save_btn.clicked.connect(lambda: self.save_config(True))
         self.launch_all_btn.clicked.connect(self.handle_launch_all_click) # Use new handler
         self.close_all_btn.clicked.connect(self.process_manager.close_all) # Use ProcessManager
+        self.go_live_btn.clicked.connect(self.process_manager.go_live)
         self.add_profile_btn.clicked.connect(self.new_profile_from_entry)
         self.delete_profile_btn.clicked.connect(self.delete_current_profile)
         self.duplicate_profile_btn.clicked.connect(self.duplicate_current_profile)
+        self.apply_profile_btn.clicked.connect(lambda: self.switch_and_apply_profile())
         self.rename_profile_btn.clicked.connect(self.rename_current_profile)
         self.profile_combo.currentTextChanged.connect(self.change_profile)
         self.profile_delay_spinbox.valueChanged.connect(self.on_profile_delay_changed)
+        self.auto_delay_checkbox.toggled.connect(self.on_delay_mode_changed)
+        self.load_delay_checkbox.toggled.connect(self.on_delay_mode_changed)
         self.new_profile_entry.returnPressed.connect(self.new_profile_from_entry)
         self.program_list.model().rowsMoved.connect(self.on_programs_reordered)
         self.program_list.itemSelectionChanged.connect(self.on_selection_changed)
@@ -1124,7 +1166,12 @@ class StreamerApp(QMainWindow):
         """Subscribe UI update methods to events from the event bus."""
         self.event_bus.subscribe(STATUS_UPDATE, self._handle_status_update)
         self.event_bus.subscribe(PROCESS_LIST_CHANGED, self.update_close_all_button)
+        self.event_bus.subscribe(PROCESS_STATE_CHANGED, self._handle_process_state_changed)
         self.event_bus.subscribe(LAUNCH_SEQUENCE_STATE_CHANGED, self._handle_launch_sequence_state)
+        self.event_bus.subscribe(PRIORITY_ADJUSTED, self._handle_priority_adjusted)
+        self.event_bus.subscribe(PROCESS_RESTART, self._handle_process_restart)
+        self.event_bus.subscribe(PROCESS_STANDBY_CHANGED, self._handle_standby_changed)
+        self.event_bus.subscribe(PROCESS_LIST_CHANGED, self.update_go_live_button)
 
     # --- Event Handlers ---
     def _handle_status_update(self, data):
@@ -1137,6 +1184,87 @@ class StreamerApp(QMainWindow):
         else:
             print(f"Warning: Received invalid data format for STATUS_UPDATE event: {data}")
 
+    def _handle_process_state_changed(self, data):
+        """Repaints only the rows whose process actually started or stopped."""
+        if not isinstance(data, dict):
+            print(f"Warning: Received invalid data format for PROCESS_STATE_CHANGED event: {data}")
+            return
+        widgets_by_path = self.widgets_by_path()
+        for path, is_running in data.get("running", {}).items():
+            for widget in widgets_by_path.get(path, ()):
+                widget.apply_process_state(is_running)
+
+    def _tick_priority_governor(self):
+        """Feeds the governor the running background apps of the current profile."""
+        targets = {}
+        reserved_cores = set()
+        trees = self.process_manager.process_trees
+        for program_data in self.programs:
+            widget = program_data["widget"]
+            if not widget.background:
+                reserved_cores.update(widget.cpu_affinity) # Cores pinned for the encoder etc. stay free
+            elif widget.get_path() in trees:
+                targets[widget.get_path()] = (widget.get_name(), trees[widget.get_path()].alive_members())
+        if targets or self.priority_governor.state != STATE_NORMAL:
+            self.process_manager.refresh_trees() # Shares the status poll's rate-limited sweep
+        self.priority_governor.tick(targets, reserved_cores)
+
+    def _handle_priority_adjusted(self, data):
+        """Shows what the priority governor did in the status bar."""
+        name = data.get("name") or os.path.basename(data.get("path", ""))
+        if data.get("action") == "throttled":
+            message = f"High CPU load ({data.get('system_cpu', 0):.0f}%): lowered priority of {name}"
+        else:
+            message = f"CPU load back to normal: restored priority of {name}"
+        self.show_status(message, self.style_manager.warning_color, 5000)
+
+    def _handle_process_restart(self, data):
+        """Shows crash supervisor activity on the affected rows and in the status bar."""
+        name = data.get("name") or os.path.basename(data.get("path", ""))
+        code = data.get("returncode")
+        reason = f"exited with code {code}" if code is not None else "exited"
+        state = data.get("state")
+        if state == "scheduled":
+            label, style = "Restarting...", "warning"
+            message = f"{name} {reason}; restarting in {data.get('delay', 0):.0f}s (attempt {data.get('attempt')})"
+            color = self.style_manager.warning_color
+        elif state == "abandoned":
+            label, style = "Crashed", "error"
+            message = f"{name} keeps crashing ({data.get('attempt')} restarts); not restarting it again"
+            color = self.style_manager.error_color
+        else:
+            return # "launched": the row shows the relaunch itself
+        for widget in self.widgets_by_path().get(data.get("path"), ()):
+            widget.status_label.setText(label)
+            widget.status_label.setStyleSheet(self.style_manager.get_status_label_style(style))
+        self.show_status(message, color, 8000)
+
+    def _handle_standby_changed(self, data):
+        """Marks rows in standby and announces going live."""
+        widgets_by_path = self.widgets_by_path()
+        suspended = data.get("state") == "suspended"
+        for path in data.get("paths", ()):
+            for widget in widgets_by_path.get(path, ()):
+                widget.status_label.setText("Standby" if suspended else "Launched")
+                widget.status_label.setStyleSheet(self.style_manager.get_status_label_style('warning' if suspended else 'launched'))
+        if not suspended:
+            self.show_status(f"Live: resumed {len(data.get('paths', ()))} app(s)", self.style_manager.launched_color)
+        self.update_go_live_button()
+
+    def update_go_live_button(self, data=None):
+        """Shows the Go Live button while any app waits in standby."""
+        count = len(self.process_manager.standby_paths)
+        self.go_live_btn.setVisible(count > 0)
+        self.go_live_btn.setText(f"Go Live ({count})")
+
+    def widgets_by_path(self):
+        """Returns {exe path: [ProgramWidget, ...]} for the current rows (paths can repeat)."""
+        index = {}
+        for program_data in self.programs:
+            widget = program_data["widget"]
+            index.setdefault(widget.get_path(), []).append(widget)
+        return index
+
     def _handle_launch_sequence_state(self, data):
         """Handles launch sequence state changes."""
         if isinstance(data, dict):
@@ -1165,9 +1293,26 @@ class StreamerApp(QMainWindow):
             if 0 < value < 5 and self.show_low_delay_warning:
                 self.show_low_delay_warning_message()
 
-    def add_program_ui_only(self, name="", path="", use_custom_delay=False, custom_delay_value=0):
+    def on_delay_mode_changed(self, checked):
+        profile = self.profiles.get(self.current_profile)
+        if isinstance(profile, ProfileConfig):
+            # "Auto" and "Load-aware" are exclusive modes; checking one clears the other
+            other = self.load_delay_checkbox if self.sender() is self.auto_delay_checkbox else self.auto_delay_checkbox
+            if checked and other.isChecked():
+                other.blockSignals(True)
+                other.setChecked(False)
+                other.blockSignals(False)
+            if self.auto_delay_checkbox.isChecked():
+                profile.delay_mode = "auto"
+            elif self.load_delay_checkbox.isChecked():
+                profile.delay_mode = "load"
+            else:
+                profile.delay_mode = "fixed"
+            self.on_data_changed(source="profile_setting")
+
+    def add_program_ui_only(self, name="", path="", use_custom_delay=False, custom_delay_value=0, **settings):
         """Adds a program widget to the UI list only. Does not modify config."""
-        program_widget = ProgramWidget(name, path, use_custom_delay, custom_delay_value)
+        program_widget = ProgramWidget(name, path, use_custom_delay, custom_delay_value, **settings)
         item = QListWidgetItem(self.program_list)
         self.program_list.addItem(item)
         size_hint = program_widget.sizeHint()
@@ -1250,7 +1395,7 @@ class StreamerApp(QMainWindow):
         while f"{base_name}{counter}" in self.profiles: counter += 1
         return f"{base_name}{counter}"
 
-    def monitor_process(self, program_widget): pass # Handled by widget timer
+    def monitor_process(self, program_widget): pass # Handled by ProcessManager's shared poller
 
     def on_programs_reordered(self, parent, start, end, destination, row):
         """Updates the program order in the current ProfileConfig object."""
@@ -1274,12 +1419,7 @@ class StreamerApp(QMainWindow):
                      break
             # If not found (e.g., a newly added unsaved row), create a temporary config
             if not found:
-                 new_program_configs.append(ProgramConfig(
-                     name=widget.get_name(),
-                     path=widget.get_path(),
-                     use_custom_delay=widget.use_custom_delay,
-                     custom_delay_value=widget.custom_delay_value
-                 ))
+                 new_program_configs.append(widget.to_config())
 
         # Update the ProfileConfig object's programs list
         current_profile_obj.programs = new_program_configs
@@ -1360,6 +1500,10 @@ class StreamerApp(QMainWindow):
         new_profile_obj = ProfileConfig(
             name=new_profile_name,
             launch_delay=source_profile_obj.launch_delay,
+            delay_mode=source_profile_obj.delay_mode,
+            load_cpu_threshold=source_profile_obj.load_cpu_threshold,
+            load_disk_threshold=source_profile_obj.load_disk_threshold,
+            load_max_wait=source_profile_obj.load_max_wait,
             programs=copy.deepcopy(source_profile_obj.programs) # Deep copy the list of ProgramConfig objects
         )
 
@@ -1481,6 +1625,51 @@ class StreamerApp(QMainWindow):
         new_display = self.default_profile_display_name if profile_name == "Default" else profile_name
         self.event_bus.publish(STATUS_UPDATE, {"message": f"Switched to profile: {new_display}", "color": self.style_manager.launched_color})
 
+    def switch_and_apply_profile(self, profile_name=None):
+        """
+        Switches to a profile (the selected one by default) and makes the running apps match it.
+
+        Running apps the profile doesn't use are closed in parallel, apps it shares with
+        the running set keep running (Launch All adopts them), and only the missing apps
+        are launched.
+        """
+        if profile_name is not None and profile_name != self.current_profile:
+            display_name = self.default_profile_display_name if profile_name == "Default" else profile_name
+            self.profile_combo.setCurrentText(display_name) # Goes through change_profile (unsaved changes prompt)
+            if self.current_profile != profile_name:
+                return # Switch cancelled
+        if self.launch_sequence.is_running():
+            self.show_status("Wait for the current launch to finish before applying a profile", self.style_manager.warning_color)
+            return
+
+        # Current rows, so unsaved edits are applied too
+        target = ProfileConfig(name=self.current_profile, programs=[p["widget"].to_config() for p in self.programs])
+        plan = plan_transition(self.process_manager.get_running_processes().keys(), target)
+        profile_display = self.default_profile_display_name if self.current_profile == "Default" else self.current_profile
+        if plan.is_empty:
+            self.show_status(f"Everything in '{profile_display}' is already running", self.style_manager.launched_color)
+            return
+
+        if plan.close:
+            names = sorted(os.path.basename(path) for path in plan.close)
+            result = QMessageBox.question(self, "Switch && Apply",
+                f"Close {len(names)} app(s) not used by '{profile_display}'?\n\n{chr(10).join(names)}",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+            if result != QMessageBox.StandardButton.Yes:
+                return
+            results = self.process_manager.terminate_all(plan.close)
+            failed = [os.path.basename(path) for path, closed in results.items() if not closed]
+            if failed:
+                self.show_status(f"Could not close: {', '.join(failed)}", self.style_manager.warning_color)
+
+        print(f"[StreamerApp] Applying profile '{self.current_profile}': closing {len(plan.close)}, "
+              f"keeping {len(plan.keep)}, launching {len(plan.launch)}")
+        if plan.launch:
+            self.launch_sequence.start(self.programs) # Shared apps are adopted, not started twice
+        else:
+            self.show_status(f"Applied '{profile_display}': closed {len(plan.close)}, kept {len(plan.keep)} running",
+                             self.style_manager.launched_color)
+
     def update_delete_button_state(self):
         is_default = (self.current_profile == "Default")
         self.delete_profile_btn.setEnabled(not is_default)
@@ -1507,6 +1696,13 @@ class StreamerApp(QMainWindow):
             elif clicked == dont_save_btn: event.accept()
             else: event.ignore()
         else: event.accept()
+        if event.isAccepted():
+            self.process_manager.stop_status_polling() # No exit handling (or crash restarts) while shutting down
+            self.process_manager.go_live() # Don't leave standby apps suspended after we exit
+            if self.priority_governor:
+                self.priority_governor.restore_all() # Don't leave background apps throttled after we exit
+            if self.resource_monitor_instance is not None:
+                self.resource_monitor_instance.shutdown()
 
     def update_profile_combobox(self):
         self.profile_combo.blockSignals(True) # Block signals during update
@@ -1551,6 +1747,13 @@ class StreamerApp(QMainWindow):
 
         # Load profile delay
         self.profile_delay_spinbox.setValue(profile_obj.launch_delay)
+        for checkbox, mode in ((self.auto_delay_checkbox, "auto"), (self.load_delay_checkbox, "load")):
+            checkbox.blockSignals(True) # Loading is not a change
+            checkbox.setChecked(profile_obj.delay_mode == mode)
+            checkbox.blockSignals(False)
+
+        # One process sweep answers the "already running?" check for every row below
+        self.process_index.refresh(force=True)
 
         # Load program entries using ProgramConfig objects
         for program_config in profile_obj.programs:
@@ -1558,7 +1761,15 @@ class StreamerApp(QMainWindow):
                 program_config.name,
                 program_config.path,
                 program_config.use_custom_delay,
-                program_config.custom_delay_value
+                program_config.custom_delay_value,
+                after=program_config.after,
+                ready_probe=program_config.ready_probe,
+                priority=program_config.priority,
+                cpu_affinity=program_config.cpu_affinity,
+                io_priority=program_config.io_priority,
+                background=program_config.background,
+                restart_policy=program_config.restart_policy,
+                standby=program_config.standby
             )
 
         self.update_close_all_button()
@@ -1606,10 +1817,10 @@ class StreamerApp(QMainWindow):
         if program_widget.style(): program_widget.style().unpolish(program_widget); program_widget.style().polish(program_widget)
         program_widget.update()
 
-    def _add_with_process_check(self, name, path, use_custom_delay, custom_delay_value):
+    def _add_with_process_check(self, name, path, use_custom_delay, custom_delay_value, **settings):
         """Adds a program widget and checks if the process is already running."""
         # Use add_program_ui_only as we are loading from config, not adding a new entry to config yet
-        program_widget = self.add_program_ui_only(name, path, use_custom_delay, custom_delay_value)
+        program_widget = self.add_program_ui_only(name, path, use_custom_delay, custom_delay_value, **settings)
 
         # Apply styles using the helper
         self._apply_styles_to_widget(program_widget)
@@ -1622,10 +1833,6 @@ class StreamerApp(QMainWindow):
                 program_widget.process = process
                 program_widget.status_label.setText("Launched"); program_widget.status_label.setStyleSheet(self.style_manager.get_status_label_style('launched')) # Use style manager
                 program_widget.set_running_state_ui(True) # Update UI to running state
-                if not program_widget.process_timer or not program_widget.process_timer.isActive():
-                    program_widget.process_timer = QTimer(program_widget)
-                    program_widget.process_timer.timeout.connect(program_widget.check_process_status)
-                    program_widget.process_timer.start(500) # Start timer if not already running
         else:
             # Check if process is running externally
             if not program_widget.check_if_already_running(): # If not found externally
@@ -1681,13 +1888,7 @@ class StreamerApp(QMainWindow):
         current_profile_obj.programs = [] # Clear existing programs in the object
         for program_dict in self.programs: # Iterate through the UI widget list
             widget = program_dict["widget"]
-            program_config = ProgramConfig(
-                name=widget.get_name(),
-                path=widget.get_path(),
-                use_custom_delay=widget.use_custom_delay,
-                custom_delay_value=widget.custom_delay_value
-            )
-            current_profile_obj.programs.append(program_config)
+            current_profile_obj.programs.append(widget.to_config())
 
         # Ensure minimum program slots
         while len(current_profile_obj.programs) < 2:
@@ -0,0 +1,266 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Command Line Interface for EZ Streaming - Launch, close and inspect profiles without the Qt UI
+
+Usage:
+    main.py launch <profile> [--wait]
+    main.py close <profile> [--timeout SECONDS]
+    main.py switch <profile> [--timeout SECONDS] [--wait]
+    main.py status [<profile>] [--json]
+
+Nothing here imports Qt or tkinter, so a Stream Deck button or login script gets
+its profile started without building the window.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+from config_manager import ConfigManager
+from config_models import ProfileConfig
+from event_bus import (LAUNCH_PROGRAM_ADOPTED, LAUNCH_PROGRAM_RELEASED, LAUNCH_PROGRAM_SKIPPED, LAUNCH_PROGRAM_SPAWNED,
+                       LAUNCH_PROGRAM_STARTING, UIEventBus)
+from exceptions import ConfigError
+from launch_engine import LaunchEngine, Spawner
+from launch_history import LaunchHistory
+from prefetch import Prefetcher
+from process_index import ProcessIndex, normalize_path
+from profile_transition import plan_transition
+from process_tree import ProcessTree, is_alive, terminate_trees
+
+WAIT_POLL_INTERVAL = 1.0 # Seconds between checks while 'launch --wait' stays resident
+
+
+def _find_profile(config, name):
+    """Returns the ProfileConfig for a profile name (case-insensitive), or raises ConfigError."""
+    profiles = config["profiles"]
+    for profile_name, profile in profiles.items():
+        if profile_name.lower() == name.lower() or (profile_name == "Default" and
+                                                     name.lower() == str(config["default_profile_display_name"]).lower()):
+            return profile
+    raise ConfigError(f"Profile '{name}' not found. Available: {', '.join(sorted(profiles))}")
+
+
+def run_launch(config_manager, profile, wait=False):
+    """
+    Launches a profile with a LaunchEngine, blocking until every program was started.
+
+    Delays, readiness probes and auto delays behave as in the app's Launch All.
+
+    Returns:
+        int: Process exit code (0 if every program started).
+    """
+    bus = UIEventBus()
+    failures = []
+    bus.subscribe(LAUNCH_PROGRAM_SKIPPED, lambda data: print(f"Skipping '{data['program'].name or data['program'].path}': path does not exist"))
+    bus.subscribe(LAUNCH_PROGRAM_ADOPTED, lambda data: print(f"{data['program'].name or data['program'].path} is already running (PID {data['process'].pid})"))
+    bus.subscribe(LAUNCH_PROGRAM_STARTING, lambda data: print(f"Launching {data['program'].name or data['program'].path}..."))
+
+    def on_spawned(data):
+        if data["result"].error:
+            print(f"  Error launching '{data['program'].name}': {data['result'].error}")
+            failures.append(data["program"])
+
+    def on_released(data):
+        if data["outcome"]:
+            print(f"  {data['program'].name}: {data['outcome']} after {data['seconds']:.1f}s")
+
+    bus.subscribe(LAUNCH_PROGRAM_SPAWNED, on_spawned)
+    bus.subscribe(LAUNCH_PROGRAM_RELEASED, on_released)
+
+    engine = LaunchEngine(Spawner(), bus, LaunchHistory.in_dir(config_manager.config_dir),
+                          trace_dir=config_manager.config_dir, prefetcher=Prefetcher())
+    start_time = time.time()
+    if not engine.start(profile):
+        print("No programs configured with valid paths to launch")
+        return 1
+    while True:
+        wait_for = engine.step()
+        if wait_for is None:
+            break
+        time.sleep(wait_for)
+
+    processes = [result.process for result in engine.results.values() if result.process is not None]
+    adopted = f" ({len(engine.adopted)} already running)" if engine.adopted else ""
+    print(f"Launched {len(processes)}/{len(engine.programs) - len(engine.adopted)} programs{adopted} in {time.time() - start_time:.1f}s")
+    processes += list(engine.adopted.values())
+
+    if wait and processes:
+        index = ProcessIndex()
+        trees = [ProcessTree(process) for process in processes]
+        print("Waiting for the launched programs to exit (Ctrl+C to stop waiting)...")
+        try:
+            while any(tree.is_alive() for tree in trees):
+                index.refresh(force=True)
+                for tree in trees:
+                    tree.update(index)
+                time.sleep(WAIT_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            pass
+    return 1 if failures else 0
+
+
+def _running_trees(profile, index):
+    """
+    Returns {"<path>#<pid>": ProcessTree} for every running instance of the profile's programs.
+
+    Instances are matched by exact executable path; the name is only used for processes
+    whose path cannot be read, so same-named programs elsewhere on disk are left alone.
+    """
+    trees = {}
+    seen_paths = set()
+    for program in profile.programs:
+        if not program.path or program.path in seen_paths:
+            continue
+        seen_paths.add(program.path)
+        for process in index.find_all(program.path, match_name=True):
+            tree = ProcessTree(process)
+            tree.update(index)
+            trees[f"{program.path}#{process.pid}"] = tree
+    return trees
+
+
+def run_close(profile, timeout=0.5):
+    """Closes every running program of a profile (with its child processes) in parallel."""
+    index = ProcessIndex()
+    index.refresh(force=True)
+    trees = _running_trees(profile, index)
+    if not trees:
+        print("No programs of this profile are running")
+        return 0
+    results = terminate_trees(trees, timeout)
+    failed = [key.rsplit('#', 1)[0] for key, closed in results.items() if not closed]
+    print(f"Closed {len(results) - len(failed)}/{len(results)} processes")
+    for path in failed:
+        print(f"  Failed to close: {path}")
+    return 1 if failed else 0
+
+
+def run_switch(config_manager, config, profile, timeout=0.5, wait=False):
+    """
+    Switches to a profile: closes running programs of the other profiles that it doesn't
+    use (in parallel), keeps the shared ones running and launches the rest.
+    """
+    index = ProcessIndex()
+    index.refresh(force=True)
+    others = ProfileConfig(name="", programs=[program for other in config["profiles"].values() if other is not profile
+                                              for program in other.programs])
+    running = _running_trees(others, index)
+    target_names = {os.path.basename(program.path).lower() for program in profile.programs if program.path}
+    running_exes = {}
+    for key, tree in running.items():
+        # Diff by what is actually running, not by the other profile's entry for it
+        exe = tree.root.info.get('exe')
+        if not exe:
+            if os.path.basename(key.rsplit('#', 1)[0]).lower() in target_names:
+                continue # Unreadable path with a name the target uses: it may be the target's own app
+            exe = key.rsplit('#', 1)[0]
+        running_exes[key] = exe
+    plan = plan_transition(set(running_exes.values()), profile)
+    close = {normalize_path(path) for path in plan.close}
+    trees = {key: running[key] for key, exe in running_exes.items() if normalize_path(exe) in close}
+    failed = []
+    if trees:
+        results = terminate_trees(trees, timeout)
+        failed = [running_exes[key] for key, closed in results.items() if not closed]
+        print(f"Closed {len(results) - len(failed)}/{len(results)} processes not used by '{profile.name}'")
+        for path in failed:
+            print(f"  Failed to close: {path}")
+    if plan.keep:
+        print(f"Keeping {len(plan.keep)} shared program(s) running")
+    code = run_launch(config_manager, profile, wait) # Shared programs are adopted, not started twice
+    return 1 if failed else code
+
+
+def run_status(config, profile_name=None, as_json=False):
+    """Prints which programs of each profile (or of one profile) are running."""
+    index = ProcessIndex()
+    index.refresh(force=True)
+    profiles = config["profiles"]
+    names = [profile_name] if profile_name else sorted(profiles)
+    report = {}
+    for name in names:
+        report[name] = []
+        for program in profiles[name].programs:
+            if not program.path:
+                continue
+            pids = [proc.pid for proc in index.find_all(program.path, match_name=True) if is_alive(proc)]
+            report[name].append({"name": program.name, "path": program.path, "running": bool(pids), "pids": pids})
+
+    if as_json:
+        print(json.dumps(report, indent=2))
+        return 0
+    for name, programs in report.items():
+        print(f"{name}:")
+        if not programs:
+            print("  (no programs)")
+        for program in programs:
+            state = f"running (PID {', '.join(map(str, program['pids']))})" if program["running"] else "stopped"
+            print(f"  {program['name'] or program['path']}: {state}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ezstreaming", description="Launch and close EZ Streaming profiles without the UI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    launch_parser = subparsers.add_parser("launch", help="Launch every program of a profile")
+    launch_parser.add_argument("profile", help="Profile name")
+    launch_parser.add_argument("--wait", action="store_true", help="Stay running until the launched programs exit")
+
+    close_parser = subparsers.add_parser("close", help="Close every running program of a profile")
+    close_parser.add_argument("profile", help="Profile name")
+    close_parser.add_argument("--timeout", type=float, default=0.5, help="Seconds to wait before force-killing (default 0.5)")
+
+    switch_parser = subparsers.add_parser("switch", help="Switch to a profile, keeping programs it shares with the running ones")
+    switch_parser.add_argument("profile", help="Profile name")
+    switch_parser.add_argument("--timeout", type=float, default=0.5, help="Seconds to wait before force-killing (default 0.5)")
+    switch_parser.add_argument("--wait", action="store_true", help="Stay running until the launched programs exit")
+
+    status_parser = subparsers.add_parser("status", help="Show which programs are running")
+    status_parser.add_argument("profile", nargs="?", help="Only this profile")
+    status_parser.add_argument("--json", action="store_true", help="Print JSON")
+    return parser
+
+
+def main(argv=None):
+    """Runs a CLI command and returns the process exit code."""
+    args = build_parser().parse_args(argv)
+    try:
+        with contextlib.redirect_stdout(sys.stderr): # Keep stdout clean for --json
+            config_manager = ConfigManager(show_dialogs=False)
+            config = config_manager.load_config()
+        if args.command == "status":
+            profile_name = _find_profile(config, args.profile).name if args.profile else None
+            return run_status(config, profile_name, args.json)
+        profile = _find_profile(config, args.profile)
+        if args.command == "launch":
+            return run_launch(config_manager, profile, args.wait)
+        if args.command == "switch":
+            return run_switch(config_manager, config, profile, args.timeout, args.wait)
+        return run_close(profile, args.timeout)
+    except ConfigError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,15 +22,21 @@ Configuration management module for saving and loading settings
 import os
 import json
 import sys
-import tkinter.messagebox as messagebox
 from config_models import ProfileConfig, ProgramConfig # Import model classes
 from exceptions import ConfigError # Import custom exception
+from tracing import CAT_CONFIG, traced
 
 class ConfigManager:
     """Handles saving and loading of application configuration"""
 
-    def __init__(self):
-        """Initialize the configuration manager"""
+    def __init__(self, show_dialogs=True):
+        """
+        Initialize the configuration manager
+
+        Args:
+            show_dialogs (bool): Show error dialogs (False for the headless CLI, which only prints).
+        """
+        self.show_dialogs = show_dialogs
         try:
             self.config_dir = self._get_config_dir()
             self.config_path = os.path.join(self.config_dir, "ez_streaming_config.json")
@@ -41,10 +47,20 @@ class ConfigManager:
             # Handle potential errors during directory creation
             error_msg = f"Failed to create configuration directory: {self.config_dir}\nError: {e}"
             print(error_msg)
-            messagebox.showerror("Initialization Error", error_msg)
+            self._show_error("Initialization Error", error_msg)
             # Depending on severity, might want to exit or use a fallback path
             raise ConfigError(error_msg) from e # Re-raise as custom exception
 
+    def _show_error(self, title, message):
+        """Shows an error dialog; tkinter is only imported when a dialog is actually needed."""
+        if not self.show_dialogs:
+            return
+        try:
+            import tkinter.messagebox as messagebox
+            messagebox.showerror(title, message)
+        except Exception as e: # No display or no tkinter
+            print(f"[ConfigManager] Could not show error dialog: {e}")
+
     def _get_config_dir(self):
         """Get the appropriate configuration directory for the platform"""
         try:
@@ -65,6 +81,7 @@ class ConfigManager:
         except Exception as e:
             raise ConfigError(f"Could not determine configuration directory: {e}") from e
 
+    @traced("save_config", CAT_CONFIG)
     def save_config(self, config_data):
         """
         Save configuration data to file.
@@ -99,7 +116,7 @@ class ConfigManager:
             error_msg = f"Error saving configuration to {self.config_path}: {e}"
             print(error_msg)
             # Optionally show messagebox here or let the caller handle ConfigError
-            # messagebox.showerror("Save Error", f"Failed to save configuration:\n{e}")
+            # self._show_error("Save Error", f"Failed to save configuration:\n{e}")
             raise ConfigError(error_msg) from e
         except Exception as e: # Catch any other unexpected errors
             error_msg = f"Unexpected error saving configuration: {e}"
@@ -107,6 +124,7 @@ class ConfigManager:
             raise ConfigError(error_msg) from e
 
 
+    @traced("load_config", CAT_CONFIG)
     def load_config(self):
         """
         Load configuration data from file.
@@ -190,18 +208,18 @@ class ConfigManager:
             error_msg = f"Error decoding JSON from configuration file: {str(e)}"
             print(error_msg)
             # Show error and raise ConfigError
-            messagebox.showerror("Configuration Error",
+            self._show_error("Configuration Error",
                                f"Could not load configuration file (invalid JSON).\n\n{error_msg}\n\nPlease check or delete the file. Default settings will be used for now.")
             raise ConfigError(error_msg) from e
         except (IOError, OSError) as e:
              error_msg = f"Error reading configuration file {self.config_path}: {e}"
              print(error_msg)
-             messagebox.showerror("Configuration Error",
+             self._show_error("Configuration Error",
                                 f"Could not read configuration file.\n\n{error_msg}\n\nDefault settings will be used for now.")
              raise ConfigError(error_msg) from e
         except Exception as e: # Catch any other unexpected errors during loading/processing
             error_msg = f"Unexpected error loading configuration: {e}"
             print(error_msg)
-            messagebox.showerror("Configuration Error",
+            self._show_error("Configuration Error",
                                f"Could not load configuration file.\n\n{error_msg}\n\nDefault settings will be used for now.")
             raise ConfigError(error_msg) from e
@@ -20,6 +20,19 @@ Configuration Model Classes for EZ Streaming
 
 from dataclasses import dataclass, field, asdict
 
+from launch_policy import IO_PRIORITY_LEVELS, PRIORITY_LEVELS
+from load_gate import DEFAULT_CPU_THRESHOLD, DEFAULT_DISK_THRESHOLD, DEFAULT_MAX_WAIT
+
+RESTART_POLICIES = ("never", "on_crash", "always")
+
+
+def _percent(value, default: float) -> float:
+    """Returns value if it is a number in (0, 100], else the default."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and 0 < value <= 100:
+        return float(value)
+    return default
+
+
 @dataclass
 class ProgramConfig:
     """Data class representing the configuration for a single program."""
@@ -27,6 +40,14 @@ class ProgramConfig:
     path: str = ""
     use_custom_delay: bool = False
     custom_delay_value: int = 0
+    after: list[str] = field(default_factory=list) # Names of programs that must launch first
+    ready_probe: dict = field(default_factory=dict) # Readiness probe spec; empty means a fixed delay
+    priority: str = "" # CPU priority (one of PRIORITY_LEVELS); empty leaves the OS default
+    cpu_affinity: list[int] = field(default_factory=list) # CPU cores the program may run on; empty means all
+    io_priority: str = "" # Disk I/O priority (one of IO_PRIORITY_LEVELS); empty leaves the OS default
+    background: bool = False # Throttled by the PriorityGovernor while the CPU is under pressure
+    restart_policy: str = "never" # One of RESTART_POLICIES; relaunch after an exit we did not ask for
+    standby: bool = False # Launch All suspends the program once it is ready, until "Go Live"
 
     @classmethod
     def from_dict(cls, data: dict):
@@ -36,7 +57,16 @@ class ProgramConfig:
             name=data.get("name", ""),
             path=data.get("path", ""),
             use_custom_delay=data.get("use_custom_delay", False),
-            custom_delay_value=data.get("custom_delay_value", 0)
+            custom_delay_value=data.get("custom_delay_value", 0),
+            after=[str(name) for name in data.get("after", []) if name] if isinstance(data.get("after"), list) else [],
+            ready_probe=dict(data["ready_probe"]) if isinstance(data.get("ready_probe"), dict) else {},
+            priority=data.get("priority", "") if data.get("priority") in PRIORITY_LEVELS else "",
+            cpu_affinity=sorted({cpu for cpu in data.get("cpu_affinity", []) if isinstance(cpu, int) and cpu >= 0})
+                         if isinstance(data.get("cpu_affinity"), list) else [],
+            io_priority=data.get("io_priority", "") if data.get("io_priority") in IO_PRIORITY_LEVELS else "",
+            background=bool(data.get("background", False)),
+            restart_policy=data.get("restart_policy", "never") if data.get("restart_policy") in RESTART_POLICIES else "never",
+            standby=bool(data.get("standby", False))
         )
 
     def to_dict(self) -> dict:
@@ -49,6 +79,10 @@ class ProfileConfig:
     """Data class representing the configuration for a profile."""
     name: str
     launch_delay: int = 5
+    delay_mode: str = "fixed" # "fixed", "auto" (learned from launch history) or "load" (start when CPU and disk allow)
+    load_cpu_threshold: float = DEFAULT_CPU_THRESHOLD # "load" mode: system CPU percent that holds the next launch back
+    load_disk_threshold: float = DEFAULT_DISK_THRESHOLD # "load" mode: disk busy percent that holds the next launch back
+    load_max_wait: int = DEFAULT_MAX_WAIT # "load" mode: seconds a program waits for the load to drop at most
     programs: list[ProgramConfig] = field(default_factory=list)
 
     @classmethod
@@ -64,6 +98,11 @@ class ProfileConfig:
         return cls(
             name=name,
             launch_delay=data.get("launch_delay", 5),
+            delay_mode=data.get("delay_mode", "fixed") if data.get("delay_mode") in ("fixed", "auto", "load") else "fixed",
+            load_cpu_threshold=_percent(data.get("load_cpu_threshold"), DEFAULT_CPU_THRESHOLD),
+            load_disk_threshold=_percent(data.get("load_disk_threshold"), DEFAULT_DISK_THRESHOLD),
+            load_max_wait=data["load_max_wait"] if isinstance(data.get("load_max_wait"), int) and data["load_max_wait"] >= 0
+                          else DEFAULT_MAX_WAIT,
             programs=programs
         )
 
@@ -71,5 +110,9 @@ class ProfileConfig:
         """Converts the ProfileConfig instance to a dictionary suitable for JSON serialization."""
         return {
             "launch_delay": self.launch_delay,
+            "delay_mode": self.delay_mode,
+            "load_cpu_threshold": self.load_cpu_threshold,
+            "load_disk_threshold": self.load_disk_threshold,
+            "load_max_wait": self.load_max_wait,
             "programs": [p.to_dict() for p in self.programs]
         }
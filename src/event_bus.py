@@ -18,19 +18,60 @@
 Simple Event Bus for UI Updates in EZ Streaming
 """
 
+import threading
+from collections import deque
+
 # --- Event Constants ---
 STATUS_UPDATE = "status_update" # data = {"message": str, "color": str|None, "duration": int}
 PROCESS_LIST_CHANGED = "process_list_changed" # data = None (or potentially list of running pids/paths)
 LAUNCH_SEQUENCE_STATE_CHANGED = "launch_sequence_state_changed" # data = {"state": str, "launched_count": int, "total_count": int} # state = 'started'|'finished'
+PROCESS_STATE_CHANGED = "process_state_changed" # data = {"changed": set[str], "running": {path: bool}} # only paths whose running state flipped
+
+# Published by LaunchEngine (any front-end)
+LAUNCH_PROGRAM_SKIPPED = "launch_program_skipped" # data = {"program": ProgramConfig} # path does not exist
+LAUNCH_PROGRAM_ADOPTED = "launch_program_adopted" # data = {"index": int, "program": ProgramConfig, "process": psutil.Process|subprocess.Popen} # already running, not launched again
+LAUNCH_PROGRAM_STARTING = "launch_program_starting" # data = {"index": int, "program": ProgramConfig, "dependency_delays": list[float]}
+LAUNCH_PROGRAM_SPAWNED = "launch_program_spawned" # data = {"index": int, "program": ProgramConfig, "result": SpawnResult}
+LAUNCH_PROGRAM_RELEASED = "launch_program_released" # data = {"index": int, "program": ProgramConfig, "outcome": str|None, "seconds": float|None}
+LAUNCH_RUN_FINISHED = "launch_run_finished" # data = {"launched_count": int, "adopted_count": int, "total_count": int} # every program launched
+LAUNCH_RUN_SETTLED = "launch_run_settled" # data = {"summary": dict|None} # probes done, trace written
+PROCESS_RESTART = "process_restart" # data = {"path": str, "name": str, "returncode": int|None, "state": 'scheduled'|'launched'|'abandoned', "attempt": int, "delay": float}
+PROCESS_STANDBY_CHANGED = "process_standby_changed" # data = {"paths": list[str], "state": 'suspended'|'resumed'}
+PRIORITY_ADJUSTED = "priority_adjusted" # data = {"action": 'throttled'|'restored', "path": str, "name": str, "pids": list[int], "priority": str|None, "cpu_affinity": list[int]|None, "system_cpu": float, "errors": list[str]}
 
 class UIEventBus:
-    """A simple publish-subscribe event bus for decoupling UI updates."""
+    """
+    A simple publish-subscribe event bus for decoupling UI updates.
+
+    By default publish() calls the listeners right away on the publishing thread. Once a
+    dispatcher is set (the Qt app does this), only publishes from the dispatcher's thread
+    are delivered synchronously; publishes from any other thread are queued and the
+    dispatcher's waker asks that thread to drain() them, so listeners always run on one
+    thread. Subscriptions are protected by a lock and may change from any thread.
+    """
 
     def __init__(self):
         """Initializes the event bus."""
         self._listeners = {}
+        self._lock = threading.Lock()
+        self._queue = deque() # (event_type, data) published from other threads, waiting for drain()
+        self._waker = None # Called from a publishing thread when a drain is needed
+        self._dispatch_thread = None # Ident of the thread that delivers events once a dispatcher is set
+        self._wake_pending = False
         print("[UIEventBus] Initialized.")
 
+    def set_dispatcher(self, waker):
+        """
+        Routes events published on other threads to the calling thread.
+
+        Args:
+            waker (callable): Thread-safe callable without arguments that makes the calling
+                              thread run drain() soon (e.g. emitting a queued Qt signal).
+        """
+        with self._lock:
+            self._waker = waker
+            self._dispatch_thread = threading.get_ident()
+
     def subscribe(self, event_type: str, callback):
         """
         Subscribe a callback function to an event type.
@@ -40,11 +81,12 @@ class UIEventBus:
             callback (callable): The function to call when the event is published.
                                  It should accept a single argument (the event data).
         """
-        if event_type not in self._listeners:
-            self._listeners[event_type] = []
-        if callback not in self._listeners[event_type]:
-            self._listeners[event_type].append(callback)
-            # print(f"[UIEventBus] '{callback.__name__}' subscribed to '{event_type}'.") # Optional debug log
+        with self._lock:
+            listeners = self._listeners.get(event_type, [])
+            if callback not in listeners:
+                # Copy on write, so a publish in progress keeps iterating its own snapshot
+                self._listeners[event_type] = listeners + [callback]
+                # print(f"[UIEventBus] '{callback.__name__}' subscribed to '{event_type}'.") # Optional debug log
 
     def unsubscribe(self, event_type: str, callback):
         """
@@ -54,26 +96,64 @@ class UIEventBus:
             event_type (str): The name of the event to unsubscribe from.
             callback (callable): The callback function to remove.
         """
-        if event_type in self._listeners and callback in self._listeners[event_type]:
-            self._listeners[event_type].remove(callback)
-            # print(f"[UIEventBus] '{callback.__name__}' unsubscribed from '{event_type}'.") # Optional debug log
-            if not self._listeners[event_type]: # Remove event type if no listeners left
-                del self._listeners[event_type]
+        with self._lock:
+            listeners = self._listeners.get(event_type, [])
+            if callback in listeners:
+                remaining = [listener for listener in listeners if listener != callback]
+                # print(f"[UIEventBus] '{callback.__name__}' unsubscribed from '{event_type}'.") # Optional debug log
+                if remaining:
+                    self._listeners[event_type] = remaining
+                else: # Remove event type if no listeners left
+                    del self._listeners[event_type]
 
     def publish(self, event_type: str, data=None):
         """
         Publish an event to all subscribed listeners.
 
+        Delivered immediately when published on the dispatcher's thread (or when no
+        dispatcher is set); otherwise queued for the dispatcher's thread.
+
         Args:
             event_type (str): The name of the event to publish.
             data (any, optional): Data to pass to the callback functions. Defaults to None.
         """
         # print(f"[UIEventBus] Publishing '{event_type}' with data: {data}") # Optional debug log
-        if event_type in self._listeners:
-            # Iterate over a copy in case a callback unsubscribes during iteration
-            for callback in self._listeners[event_type][:]:
-                try:
-                    callback(data)
-                except Exception as e:
-                    print(f"[UIEventBus] Error in callback for event '{event_type}': {e}")
-                    # Decide how to handle callback errors (e.g., log, remove listener?)
+        if self._waker is None or threading.get_ident() == self._dispatch_thread:
+            if self._queue:
+                self.drain() # Events other threads queued earlier go first
+            self._deliver(event_type, data)
+            return
+        with self._lock:
+            self._queue.append((event_type, data))
+            wake = not self._wake_pending # One wake per batch
+            self._wake_pending = True
+            waker = self._waker
+        if wake:
+            try:
+                waker()
+            except Exception as e:
+                print(f"[UIEventBus] Error waking the dispatcher: {e}")
+
+    def drain(self):
+        """
+        Delivers every queued event, in publish order, on the calling (dispatcher) thread.
+
+        Returns:
+            int: The number of events delivered.
+        """
+        with self._lock:
+            batch = list(self._queue)
+            self._queue.clear()
+            self._wake_pending = False # Events queued from now on need a new wake
+        for event_type, data in batch:
+            self._deliver(event_type, data)
+        return len(batch)
+
+    def _deliver(self, event_type: str, data):
+        # The listener lists are replaced, never mutated, so this snapshot is safe without the lock
+        for callback in self._listeners.get(event_type, ()):
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"[UIEventBus] Error in callback for event '{event_type}': {e}")
+                # Decide how to handle callback errors (e.g., log, remove listener?)
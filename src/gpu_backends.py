@@ -0,0 +1,304 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+GPU Sampling Backends for EZ Streaming - Batched GPU usage snapshots from NVML, GPUtil, nvidia-smi or WMI
+"""
+
+import platform
+import shutil
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Try to import GPU monitoring libraries
+try:
+    import GPUtil
+    GPU_AVAILABLE = True
+except ImportError:
+    GPU_AVAILABLE = False
+
+try:
+    # For NVIDIA GPUs
+    import pynvml
+    NVIDIA_AVAILABLE = True
+except ImportError:
+    NVIDIA_AVAILABLE = False
+
+GPU_SAMPLE_INTERVAL = 2.0 # Seconds between background GPU samples
+GPU_IDLE_TIMEOUT = 30.0   # Seconds without a latest() call after which background sampling pauses
+SUBPROCESS_TIMEOUT = 2    # Seconds allowed for nvidia-smi / wmic
+
+
+class GpuSnapshot(NamedTuple):
+    """All GPU readings from one batched backend call"""
+    utilization: Tuple[float, ...] # Percent utilization per device
+    process_memory: Dict[int, float] # {pid: percent of device memory used by the process}
+    taken_at: float # time.monotonic() of the sample
+
+    @property
+    def overall(self) -> float:
+        """Utilization of the busiest device (0.0 without devices)."""
+        return max(self.utilization, default=0.0)
+
+
+EMPTY_SNAPSHOT = GpuSnapshot((), {}, 0.0)
+
+
+class GpuBackend:
+    """
+    Interface for GPU sampling backends.
+
+    initialize() is called once and may cache device handles; sample() must read every
+    device and every per-process figure the backend supports in one call.
+    """
+
+    name = "none"
+
+    def initialize(self) -> bool:
+        """Prepares the backend. Returns False if it cannot work on this machine."""
+        return True
+
+    def sample(self) -> GpuSnapshot:
+        """Reads all devices at once."""
+        return GpuSnapshot((), {}, time.monotonic())
+
+    def shutdown(self):
+        """Releases any resources acquired by initialize()."""
+        pass
+
+
+class NvmlBackend(GpuBackend):
+    """NVIDIA backend using pynvml with device handles and memory totals cached at init."""
+
+    name = "nvml"
+
+    def __init__(self):
+        self._handles = []
+        self._memory_totals = []
+
+    def initialize(self) -> bool:
+        if not NVIDIA_AVAILABLE:
+            return False
+        try:
+            pynvml.nvmlInit()
+            self._handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+            self._memory_totals = [pynvml.nvmlDeviceGetMemoryInfo(h).total for h in self._handles]
+            return bool(self._handles)
+        except Exception as e:
+            print(f"[NvmlBackend] NVML unavailable: {e}")
+            return False
+
+    def sample(self) -> GpuSnapshot:
+        utilization = []
+        process_memory = {}
+        for handle, total in zip(self._handles, self._memory_totals):
+            try:
+                utilization.append(float(pynvml.nvmlDeviceGetUtilizationRates(handle).gpu))
+            except Exception:
+                utilization.append(0.0)
+            # Encoders and games show up as graphics processes, CUDA tools as compute processes
+            for query in ("nvmlDeviceGetComputeRunningProcesses", "nvmlDeviceGetGraphicsRunningProcesses"):
+                try:
+                    for proc in getattr(pynvml, query)(handle):
+                        if proc.usedGpuMemory and total:
+                            process_memory[proc.pid] = process_memory.get(proc.pid, 0.0) + (proc.usedGpuMemory / total) * 100.0
+                except Exception:
+                    pass
+        return GpuSnapshot(tuple(utilization), process_memory, time.monotonic())
+
+    def shutdown(self):
+        try:
+            pynvml.nvmlShutdown()
+        except Exception:
+            pass
+
+
+class NvidiaSmiBackend(GpuBackend):
+    """NVIDIA backend that shells out to nvidia-smi; only used when pynvml is missing."""
+
+    name = "nvidia-smi"
+
+    def initialize(self) -> bool:
+        return shutil.which("nvidia-smi") is not None
+
+    def _query(self, args: List[str]) -> List[List[str]]:
+        result = subprocess.run(['nvidia-smi'] + args + ['--format=csv,noheader,nounits'],
+                                capture_output=True, text=True, timeout=SUBPROCESS_TIMEOUT)
+        if result.returncode != 0:
+            return []
+        return [[field.strip() for field in line.split(',')] for line in result.stdout.strip().splitlines() if line.strip()]
+
+    def sample(self) -> GpuSnapshot:
+        utilization = []
+        process_memory = {}
+        try:
+            totals = []
+            for fields in self._query(['--query-gpu=utilization.gpu,memory.total']):
+                utilization.append(float(fields[0]))
+                totals.append(float(fields[1]))
+            total = max(totals, default=0.0) # Per-process rows do not say which device they use
+            if total:
+                for fields in self._query(['--query-compute-apps=pid,used_memory']):
+                    process_memory[int(fields[0])] = (float(fields[1]) / total) * 100.0
+        except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+            pass
+        return GpuSnapshot(tuple(utilization), process_memory, time.monotonic())
+
+
+class GPUtilBackend(GpuBackend):
+    """Vendor-neutral backend using GPUtil (overall load only)."""
+
+    name = "gputil"
+
+    def initialize(self) -> bool:
+        return GPU_AVAILABLE
+
+    def sample(self) -> GpuSnapshot:
+        try:
+            utilization = tuple(gpu.load * 100 for gpu in GPUtil.getGPUs())
+        except Exception:
+            utilization = ()
+        return GpuSnapshot(utilization, {}, time.monotonic())
+
+
+class WmiBackend(GpuBackend):
+    """Windows backend reading Win32_VideoController through wmic (overall usage only)."""
+
+    name = "wmi"
+
+    def initialize(self) -> bool:
+        return platform.system() == 'Windows'
+
+    def sample(self) -> GpuSnapshot:
+        utilization = []
+        try:
+            result = subprocess.run(
+                ['wmic', 'path', 'Win32_VideoController', 'get', 'CurrentUsage'],
+                capture_output=True, text=True, timeout=SUBPROCESS_TIMEOUT
+            )
+            if result.returncode == 0:
+                for line in result.stdout.strip().split('\n'):
+                    if line.strip() and 'CurrentUsage' not in line:
+                        try:
+                            utilization.append(float(line.strip()))
+                        except ValueError:
+                            pass
+        except (OSError, subprocess.SubprocessError):
+            pass
+        return GpuSnapshot(tuple(utilization), {}, time.monotonic())
+
+
+class FakeGpuBackend(GpuBackend):
+    """
+    Deterministic backend for GPU-less machines and tests.
+
+    Replays the given (utilization, process_memory) frames in order, repeating the last one.
+    """
+
+    name = "fake"
+
+    def __init__(self, frames: Sequence[Tuple[Sequence[float], Dict[int, float]]] = (((0.0,), {}),)):
+        self.frames = list(frames)
+        self.calls = 0
+
+    def sample(self) -> GpuSnapshot:
+        utilization, process_memory = self.frames[min(self.calls, len(self.frames) - 1)]
+        self.calls += 1
+        return GpuSnapshot(tuple(utilization), dict(process_memory), time.monotonic())
+
+
+def create_default_backend() -> GpuBackend:
+    """Returns the first backend that initializes on this machine, most precise first."""
+    for backend_class in (NvmlBackend, GPUtilBackend, NvidiaSmiBackend, WmiBackend):
+        backend = backend_class()
+        if backend.initialize():
+            print(f"[GpuBackend] Using '{backend.name}' backend")
+            return backend
+    return GpuBackend()
+
+
+class GpuSampler:
+    """
+    Runs a GpuBackend on its own cadence in a background thread.
+
+    latest() never blocks: it returns the most recent snapshot, so slow backends
+    (nvidia-smi, wmic) never stall the caller. Sampling starts with the first latest()
+    call and pauses once nobody has asked for GPU data for idle_timeout seconds, so the
+    backend's subprocesses only run while the figures are actually read.
+    """
+
+    def __init__(self, backend: GpuBackend, interval: float = GPU_SAMPLE_INTERVAL,
+                 on_sample: Optional[Callable[[GpuSnapshot], None]] = None, idle_timeout: float = GPU_IDLE_TIMEOUT):
+        self.backend = backend
+        self.interval = interval
+        self.on_sample = on_sample
+        self.idle_timeout = idle_timeout
+        self._latest = EMPTY_SNAPSHOT
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._last_read = time.monotonic()
+
+    def start(self):
+        """Starts background sampling (no-op for the null backend, while running, or after stop())."""
+        with self._lock:
+            if self._thread is not None or self._closed or type(self.backend) is GpuBackend:
+                return
+            self._last_read = time.monotonic()
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="GpuSampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops background sampling for good and shuts the backend down."""
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+        self._stop_event.set()
+        if thread is not None:
+            thread.join(timeout=SUBPROCESS_TIMEOUT + 1)
+        self.backend.shutdown()
+
+    def sample_now(self) -> GpuSnapshot:
+        """Takes a snapshot synchronously on the calling thread."""
+        try:
+            snapshot = self.backend.sample()
+        except Exception as e:
+            print(f"[GpuSampler] Error sampling '{self.backend.name}': {e}")
+            return self._latest
+        self._latest = snapshot
+        if self.on_sample:
+            self.on_sample(snapshot)
+        return snapshot
+
+    def latest(self) -> GpuSnapshot:
+        """Returns the most recent snapshot without blocking, (re)starting background sampling if paused."""
+        self._last_read = time.monotonic()
+        if self._thread is None:
+            self.start()
+        return self._latest
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            with self._lock:
+                if time.monotonic() - self._last_read > self.idle_timeout:
+                    self._thread = None # Paused; the next latest() starts a new thread
+                    return
+            self.sample_now()
+            self._stop_event.wait(self.interval)
@@ -0,0 +1,485 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Launch Engine for EZ Streaming - Front-end independent launch scheduling
+"""
+
+import os
+import subprocess
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import psutil
+
+from config_models import ProfileConfig, ProgramConfig
+from event_bus import (LAUNCH_PROGRAM_ADOPTED, LAUNCH_PROGRAM_RELEASED, LAUNCH_PROGRAM_SKIPPED, LAUNCH_PROGRAM_SPAWNED,
+                       LAUNCH_PROGRAM_STARTING, LAUNCH_RUN_FINISHED, LAUNCH_RUN_SETTLED, UIEventBus)
+from exceptions import ConfigError
+from launch_graph import LaunchGraph
+from launch_history import OUTCOME_EXITED, OUTCOME_READY, OUTCOME_TIMEOUT
+from launch_policy import apply_launch_policy
+from load_gate import LOAD_POLL_INTERVAL, LoadGate
+from prefetch import LOOKAHEAD, Prefetcher
+from process_index import ProcessIndex
+from process_tree import new_group_popen_kwargs
+from readiness import PROBE_POLL_INTERVAL_MS, CpuSettledProbe, ReadinessProbe, create_probe
+from tracing import CAT_DELAY, CAT_READY, CAT_SPAWN, tracer
+
+DELAY_MODE_FIXED = "fixed" # Configured delays are used as-is
+DELAY_MODE_AUTO = "auto"   # Delays learned from LaunchHistory; configured delays until enough launches are known
+DELAY_MODE_LOAD = "load"   # Each program starts once system CPU and disk load allow (LoadGate)
+
+LAUNCH_GAP = 0.05 # Seconds between launching and the next pass, so zero-delay dependents don't starve a UI
+PROBE_POLL_INTERVAL = PROBE_POLL_INTERVAL_MS / 1000.0
+
+
+class SpawnResult(NamedTuple):
+    """Outcome of one spawn request."""
+    path: str
+    process: Optional[subprocess.Popen] # None if the spawn failed
+    pid: Optional[int]
+    create_time: Optional[float] # Together with pid, identifies the process even after pid reuse
+    error: Optional[str]
+    policy_problems: tuple = () # Launch policy settings that could not be applied
+
+
+def spawn_process(path: str, popen_kwargs: Optional[dict] = None, program: Optional[ProgramConfig] = None) -> SpawnResult:
+    """
+    Starts a program in its own process group/session, from its own directory.
+
+    If the ProgramConfig is given, its launch policy (priority, CPU affinity, I/O priority)
+    is applied to the new process right away.
+    """
+    try:
+        # Own process group/session so the app and its helpers can be closed as one tree
+        with tracer.span("Popen", CAT_SPAWN, path=path):
+            process = subprocess.Popen([path], cwd=os.path.dirname(path), **new_group_popen_kwargs(), **(popen_kwargs or {}))
+    except (OSError, subprocess.SubprocessError, ValueError) as e:
+        return SpawnResult(path, None, None, None, str(e))
+    try:
+        create_time = psutil.Process(process.pid).create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        create_time = None # Already gone; the exit watcher will report it
+    problems = tuple(apply_launch_policy(process.pid, program)) if program is not None else ()
+    return SpawnResult(path, process, process.pid, create_time, None, problems)
+
+
+class Spawner:
+    """
+    Starts processes for a LaunchEngine.
+
+    The default implementation spawns synchronously. Front-ends override spawn() to update
+    their widgets or to move the Popen call to a worker thread; simulations override all
+    three methods to run without real executables.
+    """
+
+    process_index: Optional[ProcessIndex] = None # Used by find_running(); a private one is created on first use
+
+    def can_launch(self, program: ProgramConfig) -> bool:
+        """Returns True if the program can be started (it has an existing executable)."""
+        return bool(program.path) and os.path.exists(program.path)
+
+    def find_running(self, programs: Sequence[ProgramConfig]) -> Dict[int, object]:
+        """
+        Returns {index: process} for the programs that are already running, from one process sweep.
+
+        Matches by exact executable path; a process is matched by name only when its own
+        path cannot be read, so an unrelated program with the same file name is never adopted.
+        """
+        if self.process_index is None:
+            self.process_index = ProcessIndex()
+        self.process_index.refresh(force=True)
+        running = {}
+        for index, program in enumerate(programs):
+            process = self.process_index.find(program.path, match_name=True)
+            if process is not None:
+                running[index] = process
+        return running
+
+    def spawn(self, program: ProgramConfig, popen_kwargs: dict, on_result: Callable[[SpawnResult], None]):
+        """Starts a program and calls on_result exactly once, right away or later, with the SpawnResult."""
+        on_result(spawn_process(program.path, popen_kwargs, program))
+
+
+class _PendingProbe(NamedTuple):
+    """A readiness probe being polled for a launched program."""
+    probe: ReadinessProbe
+    launched_at: float
+    deadline: float
+
+
+class LaunchEngine:
+    """
+    Launches a profile's programs along a LaunchGraph, independent of any UI toolkit.
+
+    A program starts once every program it comes "after" has been released; a program is
+    released when its delay elapsed or, with a readiness probe, as soon as the probe passes
+    (the delay is then the timeout). In "auto" delay mode every program is probed and
+    delays come from the LaunchHistory. Programs that are already running when the run
+    starts are adopted instead: they are not launched again and count as released at once.
+    In "load" delay mode plain delays are dropped and every launch waits for the LoadGate
+    (system CPU and disk busy below the profile's thresholds, or its maximum wait).
+
+    The engine never sleeps or starts timers. Its driver calls step(), which launches
+    whatever is due and returns how many seconds may pass before the next call; progress
+    is published on the event bus (LAUNCH_PROGRAM_* and LAUNCH_RUN_* events). The clock is
+    injectable, so runs can be simulated without waiting.
+    """
+
+    def __init__(self, spawner: Optional[Spawner] = None, event_bus: Optional[UIEventBus] = None,
+                 history=None, clock: Callable[[], float] = time.time, trace_dir: Optional[str] = None,
+                 prefetcher: Optional[Prefetcher] = None, load_sampler=None):
+        """
+        Args:
+            spawner: Starts the processes (defaults to a synchronous Spawner).
+            event_bus: Receives progress events (defaults to a private bus).
+            history: LaunchHistory to learn from, or None to neither learn nor use auto delays.
+            clock: Returns the current time in seconds.
+            trace_dir: Where each run's trace is written; None keeps traces in memory only.
+            prefetcher: Warms the next programs' files while the engine waits; None disables prefetching.
+            load_sampler: Returns (system CPU percent, disk busy percent) for "load" delay mode;
+                defaults to sampling psutil.
+        """
+        self.spawner = spawner or Spawner()
+        self.event_bus = event_bus or UIEventBus()
+        self.history = history
+        self.clock = clock
+        self.trace_dir = trace_dir
+        self.prefetcher = prefetcher
+        self.load_sampler = load_sampler
+        self.load_gate: Optional[LoadGate] = None # Set for "load" delay mode runs
+        self.programs: List[ProgramConfig] = []
+        self.graph: Optional[LaunchGraph] = None
+        self.auto_delays = False
+        self.finished = False
+        self._reset_run()
+
+    def _reset_run(self):
+        self.start_time = 0.0
+        self.launched = set() # Indices already launched
+        self.spawning = set() # Indices whose spawn has not reported back yet
+        self.released_at: Dict[int, float] = {} # {index: time its dependents may start}
+        self.results: Dict[int, SpawnResult] = {}
+        self.adopted: Dict[int, object] = {} # {index: process that was already running}
+        self.gated: Optional[int] = None # Index the LoadGate is holding back
+        self.gated_since: Dict[int, float] = {} # {index: when the LoadGate started holding it back}
+        self.waiting = set() # Indices with an open "wait" trace span
+        self.probes: Dict[int, _PendingProbe] = {}
+
+    @property
+    def running(self) -> bool:
+        """True while programs of the current run are still waiting to be launched."""
+        return self.graph is not None and not self.finished
+
+    def effective_delay(self, program: ProgramConfig, profile_delay: float) -> float:
+        """Returns the seconds a program holds back the programs that come after it."""
+        if self.auto_delays:
+            learned = self.history.suggest_delay(program.path)
+            if learned is not None:
+                return learned
+        if self.load_gate is not None and not program.ready_probe:
+            return 0.0 # The LoadGate paces launches; a probe's delay stays its timeout
+        return program.custom_delay_value if program.use_custom_delay else profile_delay
+
+    def start(self, profile: ProfileConfig, programs: Optional[Sequence[ProgramConfig]] = None,
+              run_name: Optional[str] = None) -> bool:
+        """
+        Begins a run; the driver then calls step() until it returns None.
+
+        Args:
+            profile: Supplies the default delay and the delay mode.
+            programs: Programs to launch, in display order (defaults to the profile's).
+            run_name: Name of the run in traces.
+
+        Returns:
+            bool: False if there is nothing to launch.
+
+        Raises:
+            ConfigError: If the "after" dependencies form a cycle.
+        """
+        self.cancel()
+        programs = list(profile.programs if programs is None else programs)
+        launchable = []
+        for program in programs:
+            if self.spawner.can_launch(program):
+                launchable.append(program)
+            elif program.path:
+                self.event_bus.publish(LAUNCH_PROGRAM_SKIPPED, {"program": program})
+        if not launchable:
+            return False
+
+        self.auto_delays = profile.delay_mode == DELAY_MODE_AUTO and self.history is not None
+        self.load_gate = None
+        if profile.delay_mode == DELAY_MODE_LOAD:
+            self.load_gate = LoadGate(profile.load_cpu_threshold, profile.load_disk_threshold,
+                                      profile.load_max_wait, sampler=self.load_sampler)
+        running = self.spawner.find_running(launchable) # One sweep; nobody waits on these
+        delays = [0.0 if index in running else self.effective_delay(program, profile.launch_delay)
+                  for index, program in enumerate(launchable)]
+        graph = LaunchGraph.from_programs(launchable, delays)
+
+        self.programs = launchable
+        self.graph = graph
+        self.finished = False
+        self._reset_run()
+        self.start_time = self.clock()
+        if self.prefetcher is not None:
+            self.prefetcher.reset()
+        tracer.begin_run(run_name or f"Launch {profile.name}")
+        mode = "linear" if graph.is_linear else f"dependency graph, critical path {graph.critical_path():.0f}s"
+        if self.auto_delays:
+            mode += ", auto delays"
+        if self.load_gate is not None:
+            mode += f", load-aware (CPU < {self.load_gate.cpu_threshold:g}%, disk < {self.load_gate.disk_threshold:g}%)"
+        if running:
+            mode += f", {len(running)} already running"
+        print(f"[LaunchEngine] Starting run with {len(launchable)} programs ({mode}).")
+        for index, process in running.items():
+            print(f"[LaunchEngine] '{self._name(index)}' is already running (PID: {process.pid}); not launching it again")
+            self.launched.add(index)
+            self.adopted[index] = process
+            self.released_at[index] = self.start_time
+            self.event_bus.publish(LAUNCH_PROGRAM_ADOPTED, {"index": index, "program": launchable[index], "process": process})
+        return True
+
+    def step(self) -> Optional[float]:
+        """
+        Polls readiness probes and launches every program that is due.
+
+        Returns:
+            float: Seconds until step() should be called again (it may be called earlier,
+                e.g. on LAUNCH_PROGRAM_SPAWNED), or None once the run is over.
+        """
+        if self.graph is None:
+            return None
+        now = self.clock()
+        if self.probes:
+            self._poll_probes(now)
+
+        due = {}
+        if not self.finished:
+            if len(self.launched) >= len(self.programs) and not self.spawning:
+                self._finish()
+            else:
+                due = self.graph.due_times(self.launched, self.released_at, self.start_time)
+                for index in due.keys() - self.waiting:
+                    name = self._name(index)
+                    tracer.begin(("wait", index), f"wait {name}", CAT_DELAY, program=name)
+                    self.waiting.add(index)
+                ready = [index for index, due_time in due.items() if due_time <= now]
+                if ready and self.load_gate is not None:
+                    ready = self._pass_load_gate(ready, due, now)
+                if ready:
+                    for index in ready:
+                        self._launch(index)
+                    return LAUNCH_GAP
+
+        waits = [due_time - now for due_time in due.values() if due_time > now]
+        if self.gated is not None:
+            waits.append(LOAD_POLL_INTERVAL)
+        if self.probes:
+            waits.append(PROBE_POLL_INTERVAL)
+        if self.spawning:
+            waits.append(PROBE_POLL_INTERVAL) # A spawn result usually triggers a step before this
+        if not waits:
+            if not self.finished:
+                self._finish() # Nothing can become due any more (should not happen in an acyclic graph)
+            self._settle()
+            return None
+        if due and self.prefetcher is not None and not (self.gated is not None and self.load_gate.disk_busy):
+            self._prefetch_upcoming() # Not while the disk is what the launch is waiting for
+        return max(min(waits), 0.0)
+
+    def next_wakeup(self):
+        """
+        Returns (program, time, waiting_for_ready) for the next thing a countdown could show, or None.
+
+        That is the program that is due next (held back by the LoadGate at most until its
+        maximum wait) or, when everything left waits on readiness probes, the probe that
+        times out first.
+        """
+        if not self.running:
+            return None
+        if self.gated is not None:
+            return self.programs[self.gated], self.gated_since[self.gated] + self.load_gate.max_wait, False
+        due = self.graph.due_times(self.launched, self.released_at, self.start_time)
+        if due:
+            index = min(due, key=due.get)
+            return self.programs[index], due[index], False
+        if self.probes:
+            index = min(self.probes, key=lambda i: self.probes[i].deadline)
+            return self.programs[index], self.probes[index].deadline, True
+        return None
+
+    def launched_count(self) -> int:
+        """Returns how many programs of the run were started and are still running."""
+        return sum(1 for result in self.results.values() if result.process is not None and result.process.poll() is None)
+
+    def cancel(self):
+        """Abandons the current run (probes still measuring the previous run included)."""
+        if self.graph is None:
+            return
+        for index in list(self.waiting):
+            tracer.end(("wait", index))
+        self.finished = True
+        self._settle()
+
+    def _pass_load_gate(self, ready: List[int], due: Dict[int, float], now: float) -> List[int]:
+        """Returns the one due program the LoadGate lets start now (the longest due), or nothing."""
+        index = min(ready, key=lambda i: (due[i], i))
+        since = self.gated_since.setdefault(index, now)
+        verdict = self.load_gate.check(now, since)
+        if verdict is None:
+            self.gated = index
+            return []
+        self.gated = None
+        if verdict == "timeout":
+            print(f"[LaunchEngine] Load still high after {now - since:.0f}s ({self.load_gate.describe()}); "
+                  f"launching '{self._name(index)}' anyway")
+        elif now - since > self.load_gate.settle + LOAD_POLL_INTERVAL:
+            print(f"[LaunchEngine] Held '{self._name(index)}' back {now - since:.1f}s until the load dropped "
+                  f"({self.load_gate.describe()})")
+        self.load_gate.launched()
+        return [index]
+
+    def _prefetch_upcoming(self):
+        """Hands the next programs in launch order to the prefetcher while the engine waits."""
+        upcoming = [self.programs[index].path for index in self.graph.order if index not in self.launched]
+        self.prefetcher.request(upcoming[:LOOKAHEAD])
+
+    def _name(self, index: int) -> str:
+        return self.programs[index].name or "application"
+
+    def _launch(self, index: int):
+        """Launches the program at an index and records when its dependents may start."""
+        program = self.programs[index]
+        name = self._name(index)
+
+        probe = None
+        process_index = getattr(self.spawner, "process_index", None) # Shared with find_running() and the app
+        try:
+            probe = create_probe(program.ready_probe, process_index)
+        except ConfigError as e:
+            print(f"[LaunchEngine] {e}; using the fixed delay for '{name}'.")
+        if probe is None and (self.auto_delays or program.standby):
+            # Auto delays need a time-to-ready measurement for every program; standby needs to know when to suspend
+            probe = CpuSettledProbe(process_index=process_index)
+
+        print(f"[LaunchEngine] Launching '{name}' (Index: {index})")
+        tracer.end(("wait", index))
+        self.waiting.discard(index)
+        self.launched.add(index)
+        self.spawning.add(index)
+        self.event_bus.publish(LAUNCH_PROGRAM_STARTING, {
+            "index": index,
+            "program": program,
+            "dependency_delays": [self.graph.delays[dep] for dep in self.graph.dependencies[index]]
+        })
+        tracer.begin(("spawn", index), f"spawn {name}", CAT_SPAWN, program=name)
+        graph = self.graph
+        self.spawner.spawn(program, probe.popen_kwargs() if probe else {},
+                           lambda result: self._handle_spawned(graph, index, probe, result))
+
+    def _handle_spawned(self, graph, index, probe, result: SpawnResult):
+        """Receives a spawn result (possibly from a later event loop iteration)."""
+        if graph is not self.graph or index not in self.spawning:
+            if probe is not None:
+                probe.stop()
+            return # Result from a run that has since been cancelled
+        self.spawning.discard(index)
+        tracer.end(("spawn", index), error=result.error)
+        self.results[index] = result
+        if probe is None or result.process is None:
+            if probe is not None:
+                probe.stop() # Releases anything popen_kwargs() opened for the failed spawn
+            self._release(index, self.clock() + self.graph.delays[index], None)
+        else:
+            self._start_probe(index, probe, result.process)
+        self.event_bus.publish(LAUNCH_PROGRAM_SPAWNED, {"index": index, "program": self.programs[index], "result": result})
+
+    def _start_probe(self, index, probe, process):
+        """Starts polling a readiness probe for a launched program."""
+        name = self._name(index)
+        print(f"[LaunchEngine] Waiting for '{name}' to be ready ({probe.describe()}, timeout {self.graph.delays[index]:g}s)")
+        probe.start(process)
+        tracer.begin(("ready", index), f"ready {name}", CAT_READY, program=name, probe=probe.describe())
+        now = self.clock()
+        self.probes[index] = _PendingProbe(probe, now, now + self.graph.delays[index])
+
+    def _poll_probes(self, now: float):
+        """Releases programs whose probe passed, whose process exited or whose delay ran out."""
+        for index, pending in list(self.probes.items()):
+            name = self._name(index)
+            elapsed = now - pending.launched_at
+            try:
+                ready = pending.probe.check()
+            except Exception as e:
+                print(f"[LaunchEngine] Readiness probe for '{name}' failed: {e}")
+                ready = False
+            if ready:
+                print(f"[LaunchEngine] '{name}' ready after {elapsed:.1f}s")
+                outcome = OUTCOME_READY
+            elif pending.probe.process.poll() is not None:
+                print(f"[LaunchEngine] '{name}' exited before it was ready")
+                outcome = OUTCOME_EXITED
+            elif now >= pending.deadline:
+                print(f"[LaunchEngine] '{name}' not ready after {elapsed:.0f}s; continuing anyway")
+                outcome = OUTCOME_TIMEOUT
+            else:
+                continue
+            if self.history is not None:
+                self.history.record(self.programs[index].path, elapsed, outcome)
+            tracer.end(("ready", index), outcome=outcome)
+            self._stop_probe(index)
+            self._release(index, now, outcome, elapsed)
+
+    def _release(self, index, released_at, outcome, elapsed=None):
+        self.released_at[index] = released_at
+        self.event_bus.publish(LAUNCH_PROGRAM_RELEASED, {
+            "index": index,
+            "program": self.programs[index],
+            "outcome": outcome, # None for a plain delay
+            "seconds": elapsed
+        })
+
+    def _stop_probe(self, index):
+        pending = self.probes.pop(index, None)
+        if pending:
+            pending.probe.stop()
+            tracer.end(("ready", index), outcome="abandoned")
+
+    def _finish(self):
+        """Marks every program as launched; probes of the last programs keep measuring."""
+        print("[LaunchEngine] Run finished.")
+        self.finished = True
+        self.event_bus.publish(LAUNCH_RUN_FINISHED, {
+            "launched_count": self.launched_count(),
+            "adopted_count": len(self.adopted),
+            "total_count": len(self.programs)
+        })
+
+    def _settle(self):
+        """Ends the run once nothing is measured any more: saves the history and writes the trace."""
+        for index in list(self.probes):
+            self._stop_probe(index)
+        if self.history is not None:
+            self.history.save()
+        summary = tracer.end_run(self.trace_dir)
+        if summary:
+            print(f"[LaunchEngine] Run took {summary['total_s']:.1f}s: {summary['by_category_s']}")
+        self.graph = None
+        self.event_bus.publish(LAUNCH_RUN_SETTLED, {"summary": summary})
@@ -0,0 +1,132 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Launch Graph for EZ Streaming - Dependency ordering of a profile's programs
+"""
+
+from typing import Dict, Iterable, List, Sequence, Set
+
+from exceptions import ConfigError
+
+
+class LaunchGraph:
+    """
+    Directed acyclic graph of launch steps built from each program's "after" list.
+
+    A step may start once every step it depends on has been released; a step is released
+    when its delay (or, later, its readiness check) has elapsed after it launched. Steps
+    without dependencies start immediately, so independent branches run concurrently and
+    the total launch time is the critical path instead of the sum of all delays.
+
+    If no program declares any dependency, each program depends on the one before it,
+    which reproduces the classic one-after-another launch sequence.
+    """
+
+    def __init__(self, names: Sequence[str], dependencies: Sequence[Iterable[int]], delays: Sequence[float]):
+        """
+        Args:
+            names: Display name of each step.
+            dependencies: For each step, the indices of the steps it waits for.
+            delays: Seconds each step holds back its dependents after it launched.
+        """
+        self.names = list(names)
+        self.dependencies: List[List[int]] = [sorted(set(deps)) for deps in dependencies]
+        self.delays = [float(delay) for delay in delays]
+        self.dependents: List[List[int]] = [[] for _ in self.names]
+        for index, deps in enumerate(self.dependencies):
+            for dep in deps:
+                self.dependents[dep].append(index)
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_programs(cls, programs: Sequence, delays: Sequence[float]) -> "LaunchGraph":
+        """
+        Builds the graph for a list of programs.
+
+        Args:
+            programs: Objects with 'name' and 'after' attributes (ProgramConfig or ProgramWidget).
+            delays: Effective delay in seconds for each program.
+
+        Raises:
+            ConfigError: If the "after" dependencies form a cycle.
+        """
+        names = [(getattr(program, 'name', '') or '').strip() for program in programs]
+        afters = [list(getattr(program, 'after', None) or []) for program in programs]
+
+        if not any(afters):
+            return cls(names, [[index - 1] if index else [] for index in range(len(names))], delays)
+
+        by_name: Dict[str, List[int]] = {}
+        for index, name in enumerate(names):
+            if name:
+                by_name.setdefault(name.lower(), []).append(index)
+
+        dependencies = []
+        for index, after in enumerate(afters):
+            deps = set()
+            for dep_name in after:
+                matches = by_name.get(str(dep_name).strip().lower())
+                if not matches:
+                    print(f"[LaunchGraph] '{names[index] or index}' waits for unknown program '{dep_name}'; ignoring.")
+                    continue
+                deps.update(matches)
+            dependencies.append(deps)
+        return cls(names, dependencies, delays)
+
+    @property
+    def is_linear(self) -> bool:
+        """True if every step simply waits for the previous one."""
+        return all(deps == ([index - 1] if index else []) for index, deps in enumerate(self.dependencies))
+
+    def _topological_order(self) -> List[int]:
+        """Returns the steps in dependency order (Kahn's algorithm), keeping list order among peers."""
+        remaining = [len(deps) for deps in self.dependencies]
+        order = [index for index, count in enumerate(remaining) if count == 0]
+        for index in order: # order grows while it is walked
+            for dependent in self.dependents[index]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    order.append(dependent)
+        if len(order) != len(self.names):
+            cycle = [self.names[index] or str(index) for index, count in enumerate(remaining) if count > 0]
+            raise ConfigError(f"Launch dependencies form a cycle between: {', '.join(cycle)}")
+        return order
+
+    def due_times(self, launched: Set[int], released_at: Dict[int, float], start_time: float) -> Dict[int, float]:
+        """
+        Returns when each not-yet-launched step may start, for steps whose dependencies are all released.
+
+        Args:
+            launched: Indices of steps that were already launched (or skipped).
+            released_at: {index: time the step released its dependents}.
+            start_time: Time the sequence started (due time of steps without dependencies).
+        """
+        due = {}
+        for index in self.order:
+            if index in launched:
+                continue
+            deps = self.dependencies[index]
+            if all(dep in released_at for dep in deps):
+                due[index] = max((released_at[dep] for dep in deps), default=start_time)
+        return due
+
+    def critical_path(self) -> float:
+        """Returns the seconds from the first launch to the last one if every delay runs in full."""
+        start: Dict[int, float] = {}
+        for index in self.order:
+            start[index] = max((start[dep] + self.delays[dep] for dep in self.dependencies[index]), default=0.0)
+        return max(start.values(), default=0.0)
@@ -0,0 +1,116 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Launch History for EZ Streaming - Learns how long each program takes to become ready
+"""
+
+import json
+import math
+import os
+from typing import Dict, List, Optional
+
+from process_index import normalize_path
+
+HISTORY_FILENAME = "launch_history.json"
+HISTORY_LENGTH = 20       # Most recent launches kept per executable
+MIN_SAMPLES = 3           # Launches needed before an auto delay is suggested
+READY_PERCENTILE = 90     # Percentile of time-to-ready the auto delay covers
+SAFETY_MARGIN = 1.2       # Multiplier on top of the percentile
+TROUBLE_PENALTY = 10.0    # Seconds added at a 100% trouble rate (timeouts, early exits)
+MIN_AUTO_DELAY = 1.0
+MAX_AUTO_DELAY = 60.0
+
+OUTCOME_READY = "ready"     # Became ready; seconds is the time it took
+OUTCOME_TIMEOUT = "timeout" # Not ready within the delay; seconds is the delay (a lower bound)
+OUTCOME_EXITED = "exited"   # Exited before it became ready
+
+
+class LaunchHistory:
+    """
+    Per-executable record of recent launches, stored as JSON next to the profile config.
+
+    Each launch is kept as [seconds, outcome]. suggest_delay() turns the history into a
+    delay that covers a high percentile of observed time-to-ready plus a penalty for
+    launches that timed out or exited early, so delays shrink towards the real need and
+    grow again after a slow (e.g. cold-cache) start.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, List[list]] = {}
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def in_dir(cls, config_dir: str) -> "LaunchHistory":
+        """Creates the history stored in the given configuration directory."""
+        return cls(os.path.join(config_dir, HISTORY_FILENAME))
+
+    def load(self):
+        """Loads the history file; a missing or unreadable file starts an empty history."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._entries = {key: [list(entry) for entry in entries][-HISTORY_LENGTH:]
+                             for key, entries in data.items() if isinstance(entries, list)}
+        except FileNotFoundError:
+            self._entries = {}
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[LaunchHistory] Could not read {self.path}: {e}")
+            self._entries = {}
+
+    def save(self):
+        """Writes the history if it changed (atomically, via a temporary file)."""
+        if not self._dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"[LaunchHistory] Could not write {self.path}: {e}")
+
+    def record(self, exe_path: str, seconds: float, outcome: str = OUTCOME_READY):
+        """Records one launch of an executable."""
+        if not exe_path:
+            return
+        entries = self._entries.setdefault(normalize_path(exe_path), [])
+        entries.append([round(float(seconds), 2), outcome])
+        del entries[:-HISTORY_LENGTH]
+        self._dirty = True
+
+    def launches(self, exe_path: str) -> List[list]:
+        """Returns the recorded [seconds, outcome] entries for an executable, oldest first."""
+        return [list(entry) for entry in self._entries.get(normalize_path(exe_path), [])]
+
+    def suggest_delay(self, exe_path: str) -> Optional[float]:
+        """
+        Returns the learned delay for an executable, or None until MIN_SAMPLES launches are known.
+
+        Exited launches only count towards the trouble rate; timeouts count as both
+        trouble and a sample of at least the delay that was used.
+        """
+        entries = self._entries.get(normalize_path(exe_path), [])
+        samples = sorted(seconds for seconds, outcome in entries if outcome != OUTCOME_EXITED)
+        if len(samples) < MIN_SAMPLES:
+            return None
+        rank = max(math.ceil(READY_PERCENTILE / 100.0 * len(samples)) - 1, 0) # Nearest-rank percentile
+        trouble_rate = sum(1 for _, outcome in entries if outcome != OUTCOME_READY) / len(entries)
+        delay = samples[rank] * SAFETY_MARGIN + trouble_rate * TROUBLE_PENALTY
+        return round(min(max(delay, MIN_AUTO_DELAY), MAX_AUTO_DELAY), 1)
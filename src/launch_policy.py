@@ -0,0 +1,135 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Launch Policy for EZ Streaming - CPU priority, CPU affinity and I/O priority of launched programs
+"""
+
+import sys
+from typing import List
+
+import psutil
+
+PRIORITY_LEVELS = ("idle", "below_normal", "normal", "above_normal", "high")
+IO_PRIORITY_LEVELS = ("idle", "low", "normal", "high")
+
+if sys.platform == "win32":
+    _PRIORITY_VALUES = {
+        "idle": psutil.IDLE_PRIORITY_CLASS,
+        "below_normal": psutil.BELOW_NORMAL_PRIORITY_CLASS,
+        "normal": psutil.NORMAL_PRIORITY_CLASS,
+        "above_normal": psutil.ABOVE_NORMAL_PRIORITY_CLASS,
+        "high": psutil.HIGH_PRIORITY_CLASS # "realtime" is deliberately not offered
+    }
+    _IO_PRIORITY_ARGS = {
+        "idle": (psutil.IOPRIO_VERYLOW,),
+        "low": (psutil.IOPRIO_LOW,),
+        "normal": (psutil.IOPRIO_NORMAL,),
+        "high": (psutil.IOPRIO_HIGH,)
+    }
+else:
+    # Nice values; raising priority (negative nice) needs elevated rights on Linux/macOS
+    _PRIORITY_VALUES = {"idle": 19, "below_normal": 10, "normal": 0, "above_normal": -5, "high": -10}
+    if hasattr(psutil, "IOPRIO_CLASS_BE"): # Linux
+        _IO_PRIORITY_ARGS = {
+            "idle": (psutil.IOPRIO_CLASS_IDLE,),
+            "low": (psutil.IOPRIO_CLASS_BE, 7),
+            "normal": (psutil.IOPRIO_CLASS_BE, 4),
+            "high": (psutil.IOPRIO_CLASS_BE, 0)
+        }
+    else:
+        _IO_PRIORITY_ARGS = {} # No I/O priority API (macOS)
+
+
+def priority_value(level: str):
+    """Returns the psutil nice()/priority class value for one of PRIORITY_LEVELS."""
+    return _PRIORITY_VALUES[level]
+
+
+def has_launch_policy(program) -> bool:
+    """True if a ProgramConfig asks for any non-default scheduling."""
+    return bool(program.priority or program.cpu_affinity or program.io_priority)
+
+
+def describe_launch_policy(program) -> str:
+    """Short human-readable description for logs."""
+    parts = []
+    if program.priority:
+        parts.append(f"priority {program.priority}")
+    if program.cpu_affinity:
+        parts.append(f"cores {','.join(map(str, program.cpu_affinity))}")
+    if program.io_priority:
+        parts.append(f"I/O {program.io_priority}")
+    return ", ".join(parts) or "default scheduling"
+
+
+def apply_launch_policy(pid: int, program) -> List[str]:
+    """
+    Applies a ProgramConfig's priority, CPU affinity and I/O priority to a running process.
+
+    Called right after the process is created, so helper processes it starts afterwards
+    inherit the same settings (on Windows and Linux/macOS alike). Settings the OS refuses,
+    e.g. raising priority without elevated rights, are skipped.
+
+    Args:
+        pid (int): Process to adjust.
+        program: ProgramConfig with priority, cpu_affinity and io_priority.
+
+    Returns:
+        list[str]: A message for every setting that could not be applied (empty on success).
+    """
+    if not has_launch_policy(program):
+        return []
+    try:
+        process = psutil.Process(pid)
+    except psutil.NoSuchProcess:
+        return ["process exited before its launch policy could be applied"]
+
+    problems = []
+    if program.priority:
+        try:
+            process.nice(_PRIORITY_VALUES[program.priority])
+        except KeyError:
+            problems.append(f"unknown priority '{program.priority}'")
+        except (psutil.AccessDenied, psutil.NoSuchProcess, OSError) as e:
+            problems.append(f"could not set priority '{program.priority}': {e}")
+
+    if program.cpu_affinity:
+        cpu_count = psutil.cpu_count() or 1
+        cpus = sorted({cpu for cpu in program.cpu_affinity if 0 <= cpu < cpu_count})
+        if not hasattr(process, "cpu_affinity"):
+            problems.append("CPU affinity is not supported on this system")
+        elif not cpus:
+            problems.append(f"none of cores {program.cpu_affinity} exist (this system has {cpu_count})")
+        else:
+            try:
+                process.cpu_affinity(cpus)
+            except (psutil.AccessDenied, psutil.NoSuchProcess, OSError, ValueError) as e:
+                problems.append(f"could not set CPU affinity {cpus}: {e}")
+
+    if program.io_priority:
+        args = _IO_PRIORITY_ARGS.get(program.io_priority)
+        if not hasattr(process, "ionice") or args is None:
+            problems.append(f"I/O priority '{program.io_priority}' is not supported on this system")
+        else:
+            try:
+                process.ionice(*args)
+            except (psutil.AccessDenied, psutil.NoSuchProcess, OSError, ValueError) as e:
+                problems.append(f"could not set I/O priority '{program.io_priority}': {e}")
+
+    for problem in problems:
+        print(f"[LaunchPolicy] '{program.name or program.path}': {problem}")
+    return problems
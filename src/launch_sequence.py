@@ -18,10 +18,14 @@
 Launch Sequence State Machine for EZ Streaming
 """
 import time
-import os
 from PySide6.QtCore import QObject, QTimer, Signal
-from PySide6.QtWidgets import QApplication # For processEvents
-from event_bus import UIEventBus, STATUS_UPDATE, LAUNCH_SEQUENCE_STATE_CHANGED # Import event bus and constants
+from event_bus import (UIEventBus, STATUS_UPDATE, LAUNCH_SEQUENCE_STATE_CHANGED, # Import event bus and constants
+                       LAUNCH_PROGRAM_ADOPTED, LAUNCH_PROGRAM_RELEASED, LAUNCH_PROGRAM_SPAWNED, LAUNCH_PROGRAM_STARTING,
+                       LAUNCH_RUN_FINISHED)
+from exceptions import ConfigError
+from launch_engine import LaunchEngine, SpawnResult, Spawner
+from launch_history import OUTCOME_READY, OUTCOME_TIMEOUT
+from prefetch import Prefetcher
 
 # Define states
 STATE_IDLE = "idle"
@@ -30,8 +34,42 @@ STATE_LAUNCHING = "launching"
 STATE_COMPLETE = "complete"
 STATE_ERROR = "error" # Not currently used, but could be
 
+
+class _WidgetSpawner(Spawner):
+    """Launches through the ProgramWidget rows, which spawn on the LaunchWorker and update their status."""
+
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.process_index = getattr(sequence.app, "process_index", None) # Share the app's sweep
+
+    def find_running(self, programs):
+        """Processes ProcessManager already tracks count as running without a sweep; the rest come from one."""
+        process_manager = getattr(self.sequence.app, "process_manager", None)
+        tracked = {}
+        if process_manager is not None:
+            for index, program in enumerate(programs):
+                if process_manager.is_running(program.path):
+                    tracked[index] = process_manager.get_running_processes()[program.path]
+        if len(tracked) == len(programs):
+            return tracked
+        running = super().find_running(programs)
+        running.update(tracked)
+        return running
+
+    def spawn(self, program, popen_kwargs, on_result):
+        widget = self.sequence.widgets.get(id(program))
+        if widget is None or not widget.launch_program(popen_kwargs, on_result):
+            on_result(SpawnResult(program.path, None, None, None, "Program could not be launched"))
+
+
 class LaunchSequence(QObject):
-    """Manages the state and execution of the program launch sequence."""
+    """
+    Drives a LaunchEngine from the Qt event loop for the "Launch All" button.
+
+    The engine decides what launches when (dependency graph, delays, readiness probes,
+    auto delays); this class only runs its step() on a QTimer, turns its events into
+    status bar messages and launches through the ProgramWidget rows.
+    """
 
     # Signals can still be useful for direct Qt connections if needed,
     # but primary communication will be via event bus.
@@ -40,19 +78,25 @@ class LaunchSequence(QObject):
     # sequence_finished = Signal(int, int)
     # sequence_error = Signal(str)
 
-    def __init__(self, app_ref, event_bus: UIEventBus):
+    def __init__(self, app_ref, event_bus: UIEventBus, history=None):
         super().__init__()
         self.app = app_ref # Reference to the main StreamerApp instance (needed for profile/widget access)
         self.event_bus = event_bus
-        self.queue = [] # List of ProgramWidget dictionaries {"widget":..., "item":...}
-        self.current_index = 0
+        config_manager = getattr(app_ref, "config_manager", None)
+        self.engine = LaunchEngine(_WidgetSpawner(self), event_bus, history,
+                                   trace_dir=getattr(config_manager, "config_dir", None), prefetcher=Prefetcher())
+        self.widgets = {} # {id(ProgramConfig): ProgramWidget} for the current run
         self.state = STATE_IDLE
-        self.delay_timer = QTimer(self)
-        self.delay_timer.setSingleShot(True)
-        self.delay_timer.timeout.connect(self._handle_delay_finished)
+        self.step_timer = QTimer(self)
+        self.step_timer.setSingleShot(True)
+        self.step_timer.timeout.connect(self._step)
         self.countdown_timer = QTimer(self) # For status updates during delay
         self.countdown_timer.timeout.connect(self._update_countdown_status)
-        self.countdown_end_time = 0
+        event_bus.subscribe(LAUNCH_PROGRAM_ADOPTED, self._on_program_adopted)
+        event_bus.subscribe(LAUNCH_PROGRAM_STARTING, self._on_program_starting)
+        event_bus.subscribe(LAUNCH_PROGRAM_SPAWNED, self._on_program_spawned)
+        event_bus.subscribe(LAUNCH_PROGRAM_RELEASED, self._on_program_released)
+        event_bus.subscribe(LAUNCH_RUN_FINISHED, self._on_run_finished)
 
     def is_running(self):
         """Check if the sequence is currently active."""
@@ -64,8 +108,22 @@ class LaunchSequence(QObject):
             print("Launch sequence already running.")
             return
 
-        self.queue = [p for p in program_widget_dicts if p["widget"].get_path() and os.path.exists(p["widget"].get_path())]
-        if not self.queue:
+        profile = self.app.profiles.get(self.app.current_profile)
+        widgets = [p["widget"] for p in program_widget_dicts]
+        configs = [widget.to_config() for widget in widgets] # Current (possibly unsaved) rows, in display order
+        self.widgets = {id(config): widget for config, widget in zip(configs, widgets)}
+        try:
+            started = profile is not None and self.engine.start(profile, configs, f"Launch {self.app.current_profile}")
+        except ConfigError as e:
+            print(f"[LaunchSequence] {e}")
+            self.event_bus.publish(STATUS_UPDATE, {
+                "message": f"Cannot launch: {e}",
+                "color": self.app.style_manager.error_color,
+                "duration": 8000
+            })
+            self.state = STATE_IDLE
+            return
+        if not started:
             self.event_bus.publish(STATUS_UPDATE, {
                 "message": "No programs configured with valid paths to launch",
                 "color": self.app.style_manager.warning_color,
@@ -74,64 +132,41 @@ class LaunchSequence(QObject):
             self.state = STATE_IDLE
             return
 
-        print(f"[LaunchSequence] Starting sequence with {len(self.queue)} programs.")
-        self.current_index = 0
         self.state = STATE_LAUNCHING # Initial state is to launch the first one
+        self.app.process_manager.arm_standby()
         self.event_bus.publish(LAUNCH_SEQUENCE_STATE_CHANGED, {"state": "started"})
         # self.app.launch_all_btn.setEnabled(False) # UI update handled by subscriber
-        self._process_next()
+        self._step()
 
-    def _process_next(self):
-        """Processes the next item in the launch queue."""
-        if self.current_index >= len(self.queue):
-            self._finish_sequence()
+    def _step(self):
+        """Lets the engine launch what is due and schedules its next step."""
+        self.step_timer.stop()
+        wait = self.engine.step()
+        if wait is None:
+            self.countdown_timer.stop()
             return
-
-        program_data = self.queue[self.current_index]
-        widget = program_data["widget"]
-
-        # Determine delay for the *next* launch (if applicable)
-        # Delay is applied *before* launching the current app (except for the first)
-        delay_ms = 0
-        if self.current_index > 0:
-            prev_widget_data = self.queue[self.current_index - 1] # Get previous widget for delay calc
-            prev_widget = prev_widget_data["widget"]
-            current_profile_obj = self.app.profiles.get(self.app.current_profile)
-            profile_delay = current_profile_obj.launch_delay if current_profile_obj else 5
-            effective_delay = prev_widget.custom_delay_value if prev_widget.use_custom_delay else profile_delay
-            delay_ms = effective_delay * 1000
-
-            # Check for low delay warning (using previous widget's delay setting)
-            if 0 < effective_delay < 5 and self.app.show_low_delay_warning:
-                # Let the main app handle showing the warning dialog if needed
-                # This could also be an event, e.g., event_bus.publish("low_delay_warning_check")
-                self.app.show_low_delay_warning_message()
-
-
-        if delay_ms > 0:
-            print(f"[LaunchSequence] Delaying {delay_ms}ms before launching '{widget.get_name()}'")
+        self.step_timer.start(int(wait * 1000))
+        if self.engine.running and self.engine.next_wakeup() is not None:
             self.state = STATE_DELAYING
-            self.countdown_end_time = time.time() + (delay_ms / 1000.0)
-            self.countdown_timer.start(100) # Update status approx 10 times/sec
-            self._update_countdown_status() # Show initial time
-            self.delay_timer.start(delay_ms) # Start the actual delay timer
-        else:
-            # No delay, launch immediately
-            self._launch_current()
-
-    def _handle_delay_finished(self):
-        """Called when the QTimer for the delay finishes."""
-        print("[LaunchSequence] Delay finished.")
-        if self.countdown_timer.isActive():
-            self.countdown_timer.stop()
-        self._launch_current()
+            if not self.countdown_timer.isActive():
+                self.countdown_timer.start(100) # Update status approx 10 times/sec
+                self._update_countdown_status() # Show initial time
 
     def _update_countdown_status(self):
         """Updates the status label during a delay via event bus."""
-        remaining_time = self.countdown_end_time - time.time()
-        if remaining_time > 0 and self.current_index < len(self.queue):
-            next_app_name = self.queue[self.current_index]["widget"].get_name() or "next app"
-            status_msg = f"Launching {next_app_name} in {int(remaining_time + 0.99)}s..."
+        wakeup = self.engine.next_wakeup()
+        remaining_time = wakeup[1] - time.time() if wakeup else 0
+        if remaining_time > 0:
+            program, _, waiting_for_ready = wakeup
+            next_app_name = program.name or "next app"
+            if self.engine.gated is not None:
+                gate = self.engine.load_gate
+                status_msg = (f"System busy (CPU {gate.cpu:.0f}%, disk {gate.disk:.0f}%): "
+                              f"launching {next_app_name} when it calms down, at most {int(remaining_time + 0.99)}s...")
+            elif waiting_for_ready:
+                status_msg = f"Waiting for {next_app_name} to be ready ({int(remaining_time + 0.99)}s)..."
+            else:
+                status_msg = f"Launching {next_app_name} in {int(remaining_time + 0.99)}s..."
             self.event_bus.publish(STATUS_UPDATE, {
                 "message": status_msg,
                 "color": self.app.style_manager.warning_color,
@@ -142,43 +177,59 @@ class LaunchSequence(QObject):
             if self.countdown_timer.isActive():
                 self.countdown_timer.stop()
 
-    def _launch_current(self):
-        """Launches the program at the current index."""
-        if self.current_index >= len(self.queue):
-            self._finish_sequence() # Should not happen here, but safety check
-            return
-
-        program_data = self.queue[self.current_index]
-        widget = program_data["widget"]
-        app_name = widget.get_name() or "application"
-        print(f"[LaunchSequence] Launching '{app_name}' (Index: {self.current_index})")
+    def _on_program_starting(self, data):
+        """Shows the launch in the status bar (and the low delay warning if it applies)."""
+        # Check for low delay warning on the edges this launch waited for
+        if self.app.show_low_delay_warning and any(0 < delay < 5 for delay in data["dependency_delays"]):
+            # Let the main app handle showing the warning dialog if needed
+            self.app.show_low_delay_warning_message()
         self.state = STATE_LAUNCHING
         self.event_bus.publish(STATUS_UPDATE, {
-            "message": f"Launching {app_name}...",
+            "message": f"Launching {data['program'].name or 'application'}...",
             "color": self.app.style_manager.launching_color,
             "duration": 3000 # Longer duration for launch message
         })
-        QApplication.processEvents() # Update UI
-
-        process = widget.launch_program() # This uses ProcessManager.track which publishes PROCESS_LIST_CHANGED
-
-        # Move to the next item immediately after attempting launch
-        self.current_index += 1
-        # Schedule the next processing step very shortly after
-        QTimer.singleShot(50, self._process_next) # 50ms delay before processing next
 
-    def _finish_sequence(self):
-        """Called when the launch sequence is complete."""
+    def _on_program_adopted(self, data):
+        """Shows a program that was already running as launched and tracks it instead of starting it again."""
+        widget = self.widgets.get(id(data["program"]))
+        if widget is None:
+            return
+        process = data["process"]
+        process_manager = self.app.process_manager
+        if not process_manager.is_running(data["program"].path):
+            process_manager.track(data["program"].path, process, data["program"]) # Row state follows via PROCESS_STATE_CHANGED
+        widget.process = process_manager.get_running_processes().get(data["program"].path, process)
+        widget.status_label.setText("Launched")
+        widget.status_label.setStyleSheet(self.app.style_manager.get_status_label_style('launched'))
+        widget.set_running_state_ui(True)
+
+    def _on_program_spawned(self, data):
+        """A spawn result came back from the LaunchWorker; dependents may be due now."""
+        self.step_timer.start(0)
+
+    def _on_program_released(self, data):
+        """Suspends a "standby" program once it finished initializing (its probe passed or timed out)."""
+        program = data["program"]
+        if program.standby and data["outcome"] in (OUTCOME_READY, OUTCOME_TIMEOUT) and id(program) in self.widgets:
+            self.app.process_manager.enter_standby(program.path)
+
+    def _on_run_finished(self, data):
+        """Called when every program of the sequence was launched."""
         print("[LaunchSequence] Sequence finished.")
         self.state = STATE_COMPLETE
-        launched_count = len([p for p in self.queue if p["widget"].process and p["widget"].process.poll() is None])
-        total_count = len(self.queue)
+        self.countdown_timer.stop()
+        launched_count = data["launched_count"]
+        adopted_count = data.get("adopted_count", 0)
+        total_count = data["total_count"]
 
         status_data = {"duration": 5000}
-        if launched_count > 0:
-             final_msg = f"Successfully launched {launched_count}/{total_count} programs"
+        if launched_count > 0 or adopted_count > 0:
+             final_msg = f"Successfully launched {launched_count}/{total_count - adopted_count} programs"
+             if adopted_count:
+                 final_msg += f" ({adopted_count} already running)"
              color = self.app.style_manager.launched_color
-             if launched_count < total_count:
+             if launched_count + adopted_count < total_count:
                  final_msg += " (some may have failed)"
                  color = self.app.style_manager.warning_color
              status_data["message"] = final_msg
@@ -193,9 +244,6 @@ class LaunchSequence(QObject):
             "launched_count": launched_count,
             "total_count": total_count
         })
-
-        # Reset internal state
-        self.queue = []
-        self.current_index = 0
+        # Probes of the last programs keep measuring for the history; the step timer keeps polling them
         # self.app.launch_all_btn.setEnabled(True) # UI update handled by subscriber
         # self.sequence_finished.emit(launched_count, total_count) # Replaced by event bus
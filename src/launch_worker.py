@@ -0,0 +1,84 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Launch Worker for EZ Streaming - Spawns programs off the Qt GUI thread
+"""
+
+import queue
+import threading
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+
+from config_models import ProgramConfig
+from launch_engine import SpawnResult, spawn_process
+
+
+class LaunchWorker(QObject):
+    """
+    Performs subprocess.Popen calls on a dedicated thread.
+
+    Creating a process (especially a large Electron app on a loaded machine) can take
+    hundreds of milliseconds; doing it here keeps the event loop responsive. Requests
+    are served in order, and each result is handed to its callback on the Qt thread
+    through a queued signal.
+    """
+
+    spawn_finished = Signal(object, object) # SpawnResult, callback
+
+    def __init__(self):
+        super().__init__()
+        self._requests = queue.Queue()
+        self._thread = None
+        self.spawn_finished.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+
+    def spawn(self, path: str, callback: Callable[[SpawnResult], None], popen_kwargs: Optional[dict] = None,
+              program: Optional[ProgramConfig] = None):
+        """
+        Queues a program to be started in its own process group, from its own directory.
+
+        Args:
+            path (str): Executable to start.
+            callback: Called on the Qt thread with the SpawnResult.
+            popen_kwargs (dict, optional): Extra subprocess.Popen arguments (e.g. pipes for probes).
+            program (ProgramConfig, optional): Launch policy (priority, affinity, I/O) to apply.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="LaunchWorker", daemon=True)
+            self._thread.start()
+        self._requests.put((path, callback, dict(popen_kwargs or {}), program))
+
+    def stop(self):
+        """Lets the worker thread exit once queued spawns are done."""
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            path, callback, popen_kwargs, program = request
+            self.spawn_finished.emit(spawn_process(path, popen_kwargs, program), callback)
+
+    @Slot(object, object)
+    def _deliver(self, result, callback):
+        try:
+            callback(result)
+        except Exception as e:
+            print(f"[LaunchWorker] Error handling spawn result for '{result.path}': {e}")
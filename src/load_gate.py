@@ -0,0 +1,143 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Load Gate for EZ Streaming - Holds launches back while the CPU or a disk is busy
+"""
+
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import psutil
+
+from resource_monitor import SystemCpuMeter
+
+DEFAULT_CPU_THRESHOLD = 70.0  # System CPU percent below which the next app may start
+DEFAULT_DISK_THRESHOLD = 60.0 # Busy percent of the busiest disk below which the next app may start
+DEFAULT_MAX_WAIT = 60         # Seconds a program waits for the load to drop before it starts anyway
+LOAD_SETTLE = 1.0             # Seconds the load must stay below both thresholds after the previous launch
+LOAD_POLL_INTERVAL = 0.5      # Seconds between samples while a launch is held back
+
+
+class SystemLoadSampler:
+    """
+    Measures system CPU and disk busy percentages since the previous sample.
+
+    Disk busy is the share of wall time the busiest disk spent on I/O: psutil's busy_time
+    where the OS reports it (Linux, BSD), read_time + write_time elsewhere (Windows, macOS),
+    which over-counts overlapping requests and is therefore capped at 100%.
+    """
+
+    def __init__(self):
+        self._cpu = SystemCpuMeter() # Own window; other CPU readers (the priority governor) cannot shorten it
+        self._disk_times: Dict[str, float] = {}
+        self._sampled_at: Optional[float] = None
+        self.sample() # Prime the counters
+
+    @staticmethod
+    def _read_disk_times() -> Dict[str, float]:
+        """Returns {disk: milliseconds spent on I/O so far}; empty if the OS does not say."""
+        try:
+            counters = psutil.disk_io_counters(perdisk=True) or {}
+        except (OSError, RuntimeError):
+            return {}
+        times = {}
+        for disk, io in counters.items():
+            busy = getattr(io, "busy_time", None)
+            times[disk] = busy if busy is not None else io.read_time + io.write_time
+        return times
+
+    def sample(self) -> Tuple[float, float]:
+        """Returns (system CPU percent, busiest disk busy percent) since the previous call."""
+        now = time.monotonic()
+        cpu = self._cpu.read()
+        disk_times = self._read_disk_times()
+        disk = 0.0
+        if self._sampled_at is not None and now > self._sampled_at:
+            elapsed_ms = (now - self._sampled_at) * 1000
+            for name, busy in disk_times.items():
+                previous = self._disk_times.get(name)
+                if previous is not None and busy >= previous:
+                    disk = max(disk, min((busy - previous) / elapsed_ms * 100, 100.0))
+        self._disk_times = disk_times
+        self._sampled_at = now
+        return cpu, disk
+
+
+class LoadGate:
+    """
+    Decides when the next program of a "load" delay mode run may start.
+
+    A launch is allowed once system CPU and disk busy have both stayed below their
+    thresholds for LOAD_SETTLE seconds since the previous launch, so programs start as
+    fast as the machine absorbs them. A program that has waited max_wait seconds starts
+    regardless, so a background update can slow a launch down but never stall it.
+    """
+
+    def __init__(self, cpu_threshold: float = DEFAULT_CPU_THRESHOLD, disk_threshold: float = DEFAULT_DISK_THRESHOLD,
+                 max_wait: float = DEFAULT_MAX_WAIT, settle: float = LOAD_SETTLE,
+                 sampler: Optional[Callable[[], Tuple[float, float]]] = None):
+        """
+        Args:
+            cpu_threshold: System CPU percent that counts as busy.
+            disk_threshold: Disk busy percent that counts as busy.
+            max_wait: Seconds after which a held-back program starts anyway.
+            settle: Seconds the load must stay low before each launch.
+            sampler: Returns (cpu percent, disk busy percent); defaults to a SystemLoadSampler.
+        """
+        self.cpu_threshold = float(cpu_threshold)
+        self.disk_threshold = float(disk_threshold)
+        self.max_wait = float(max_wait)
+        self.settle = float(settle)
+        self._sample = sampler or SystemLoadSampler().sample
+        self.cpu = 0.0
+        self.disk = 0.0
+        self._quiet_since: Optional[float] = None
+
+    @property
+    def disk_busy(self) -> bool:
+        """True if the last sample found a disk above its threshold."""
+        return self.disk >= self.disk_threshold
+
+    def launched(self):
+        """Restarts the settle period after a launch; the new app's own load has to pass first."""
+        self._quiet_since = None
+        self._sample() # The next sample covers only the time after this launch
+
+    def check(self, now: float, waiting_since: float) -> Optional[str]:
+        """
+        Samples the load and says whether a program that is due may start.
+
+        Args:
+            now: Current time (the engine's clock).
+            waiting_since: When the program became due.
+
+        Returns:
+            None to keep waiting, "clear" if the load dropped, or "timeout" after max_wait.
+        """
+        self.cpu, self.disk = self._sample()
+        if self.cpu >= self.cpu_threshold or self.disk_busy:
+            self._quiet_since = None
+        elif self._quiet_since is None:
+            self._quiet_since = now
+        if self._quiet_since is not None and now - self._quiet_since >= self.settle:
+            return "clear"
+        if now - waiting_since >= self.max_wait:
+            return "timeout"
+        return None
+
+    def describe(self) -> str:
+        return f"CPU {self.cpu:.0f}%/{self.cpu_threshold:g}%, disk {self.disk:.0f}%/{self.disk_threshold:g}%"
@@ -30,6 +30,11 @@ if current_dir not in sys.path:
 
 def main():
     """Main entry point for EZ Streaming application"""
+    # Headless subcommands (launch/close/switch/status) never import Qt or tkinter
+    if len(sys.argv) > 1 and sys.argv[1] in ("launch", "close", "switch", "status"):
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
     # Check if we should use the Qt version (default) or Tkinter version
     use_tkinter = "--tkinter" in sys.argv or "-tk" in sys.argv
     
@@ -0,0 +1,184 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Metrics Store for EZ Streaming - Constant-memory history of per-process resource samples
+"""
+
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# NumPy makes window queries vectorized; plain Python is used when it is missing
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+CHANNELS = ("cpu", "memory", "gpu", "io")
+FINE_RESOLUTION = 1.0     # Seconds per slot in the recent-history ring
+FINE_SLOTS = 600          # 10 minutes at 1 s resolution
+ROLLUP_RESOLUTION = 60.0  # Seconds per slot in the session ring
+ROLLUP_SLOTS = 1440       # 24 hours of 1-minute rollups
+MAX_SERIES = 64           # Least recently updated series are evicted beyond this
+
+
+class _Ring:
+    """
+    Preallocated ring of float32 values per channel plus float64 timestamps.
+
+    Samples that land in the same bucket (resolution seconds wide) are averaged into
+    one slot, so the ring downsamples on write and never grows.
+    """
+
+    def __init__(self, slots: int, resolution: float):
+        self.slots = slots
+        self.resolution = resolution
+        self.times = array('d', bytes(8 * slots))
+        self.values = {channel: array('f', bytes(4 * slots)) for channel in CHANNELS}
+        self.head = 0   # Index of the slot written last (the current bucket); the oldest is head + 1 once full
+        self.count = 0  # Number of filled slots
+        self._bucket = None
+        self._sums = dict.fromkeys(CHANNELS, 0.0)
+        self._n = 0
+
+    def add(self, timestamp: float, row: Dict[str, float]):
+        """Adds a sample, averaging it into the current slot if it shares the bucket."""
+        bucket = int(timestamp // self.resolution)
+        if bucket != self._bucket:
+            self._bucket = bucket
+            self._sums = dict.fromkeys(CHANNELS, 0.0)
+            self._n = 0
+            self.head = (self.head + 1) % self.slots if self.count else 0
+            self.count = min(self.count + 1, self.slots)
+        self._n += 1
+        self.times[self.head] = timestamp
+        for channel in CHANNELS:
+            self._sums[channel] += row.get(channel, 0.0)
+            self.values[channel][self.head] = self._sums[channel] / self._n
+
+    def window(self, channel: str, since: Optional[float]):
+        """Returns the channel's values with timestamps >= since, oldest first."""
+        if not self.count:
+            return []
+        start = (self.head + 1) % self.slots if self.count == self.slots else 0
+        if NUMPY_AVAILABLE:
+            times = np.roll(np.frombuffer(self.times, dtype=np.float64), -start)[:self.count]
+            values = np.roll(np.frombuffer(self.values[channel], dtype=np.float32), -start)[:self.count]
+            return values if since is None else values[times >= since]
+        order = [(start + i) % self.slots for i in range(self.count)]
+        values = self.values[channel]
+        if since is None:
+            return [values[i] for i in order]
+        return [values[i] for i in order if self.times[i] >= since]
+
+
+class _Series:
+    """Recent 1 s history plus whole-session 1 minute rollups for one process."""
+
+    def __init__(self):
+        self.fine = _Ring(FINE_SLOTS, FINE_RESOLUTION)
+        self.rollup = _Ring(ROLLUP_SLOTS, ROLLUP_RESOLUTION)
+
+    def add(self, timestamp: float, row: Dict[str, float]):
+        self.fine.add(timestamp, row)
+        self.rollup.add(timestamp, row)
+
+
+class MetricsStore:
+    """
+    Fixed-size per-process history of cpu/memory/gpu/io samples.
+
+    Memory use is bounded by MAX_SERIES * (FINE_SLOTS + ROLLUP_SLOTS) slots no matter how
+    long a stream runs. Queries return min/max/mean/p95 over any trailing window.
+    """
+
+    def __init__(self, max_series: int = MAX_SERIES):
+        self.max_series = max_series
+        self._series: "OrderedDict[object, _Series]" = OrderedDict()
+
+    def record(self, key, sample, timestamp: Optional[float] = None):
+        """
+        Records one sample for a process.
+
+        Args:
+            key: Identifies the series (ResourceMonitor uses the pid).
+            sample: Any object with cpu/memory/gpu/io attributes (e.g. a ResourceSample).
+            timestamp (float, optional): time.monotonic() of the sample. Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+            if len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+        else:
+            self._series.move_to_end(key)
+        series.add(timestamp, {channel: float(getattr(sample, channel, 0.0) or 0.0) for channel in CHANNELS})
+
+    def forget(self, key):
+        """Drops the history for a series."""
+        self._series.pop(key, None)
+
+    def keys(self):
+        """Returns the keys of all recorded series."""
+        return list(self._series.keys())
+
+    def stats(self, key, channel: str, window: Optional[float] = None,
+              now: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """
+        Summarizes a channel over a trailing window.
+
+        Windows up to 10 minutes are answered from the 1 s ring; longer windows (or
+        window=None for the whole session) from the 1 minute rollups.
+
+        Returns:
+            Dict with 'min', 'max', 'mean', 'p95' and 'count', or None if there is no data.
+        """
+        series = self._series.get(key)
+        if series is None or channel not in CHANNELS:
+            return None
+        if now is None:
+            now = time.monotonic()
+        use_fine = window is not None and window <= FINE_SLOTS * FINE_RESOLUTION
+        ring = series.fine if use_fine else series.rollup
+        values = ring.window(channel, None if window is None else now - window)
+        if len(values) == 0:
+            return None
+
+        if NUMPY_AVAILABLE:
+            return {
+                'min': float(values.min()),
+                'max': float(values.max()),
+                'mean': float(values.mean()),
+                'p95': float(np.percentile(values, 95)),
+                'count': int(values.size)
+            }
+        ordered = sorted(values)
+        count = len(ordered)
+        rank = 0.95 * (count - 1) # Linear interpolation, same as numpy's default
+        lower = int(rank)
+        upper = min(lower + 1, count - 1)
+        return {
+            'min': ordered[0],
+            'max': ordered[-1],
+            'mean': sum(ordered) / count,
+            'p95': ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower),
+            'count': count
+        }
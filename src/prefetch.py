@@ -0,0 +1,175 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Prefetcher for EZ Streaming - Warms the page cache with upcoming programs' files during launch delays
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, Optional
+
+from tracing import CAT_PREFETCH, tracer
+
+RUN_BUDGET = 1024 * 1024 * 1024     # Bytes prefetched per launch run at most
+PROGRAM_BUDGET = 384 * 1024 * 1024  # Bytes prefetched per program at most
+MAX_FILE_SIZE = 256 * 1024 * 1024   # Larger files (game assets, installers) are skipped
+MAX_FILES = 400                     # Files considered per install directory
+SCAN_DEPTH = 2                      # Subdirectory levels below the executable's directory
+READ_CHUNK = 1024 * 1024            # Chunk size of the read fallback
+READ_RATE_LIMIT = 150 * 1024 * 1024 # Bytes/s of the read fallback, so running apps keep their disk
+LOOKAHEAD = 2                       # Upcoming programs the launch engine prefetches
+
+# Code and packed resources an app maps at startup (the executable itself is always included)
+PREFETCH_EXTENSIONS = {
+    ".exe", ".dll", ".so", ".dylib", ".node", ".pak", ".asar", ".dat", ".bin", ".jar", ".pyd", ".qm"
+}
+
+FADVISE_AVAILABLE = hasattr(os, "posix_fadvise") # Linux; Windows and macOS use sequential reads
+
+
+class Prefetcher:
+    """
+    Reads upcoming programs' executables and install directories into the OS page cache.
+
+    request() queues programs; a daemon thread then hints each file to the kernel with
+    posix_fadvise(WILLNEED), which schedules asynchronous readahead, or (where that is not
+    available) reads it sequentially at a limited rate. Every file is warmed at most once
+    per run, and a run never reads more than its byte budget, so a cold start gets the
+    benefit without the prefetch itself competing with the programs being launched.
+    """
+
+    def __init__(self, run_budget: int = RUN_BUDGET, program_budget: int = PROGRAM_BUDGET):
+        self.run_budget = run_budget
+        self.program_budget = program_budget
+        self._pending = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._requested = set() # Executables queued this run
+        self._warmed = set()    # Files warmed this run
+        self._generation = 0    # Bumped by reset() so an in-flight program stops early
+        self.bytes_used = 0
+
+    def reset(self):
+        """Starts a new run: clears the queue, the budget and what counts as warmed."""
+        with self._condition:
+            self._pending.clear()
+            self._requested.clear()
+            self._warmed.clear()
+            self._generation += 1
+            self.bytes_used = 0
+
+    def request(self, exe_paths: Iterable[str]):
+        """Queues executables (and their install directories) for prefetching; repeats are ignored."""
+        with self._condition:
+            for path in exe_paths:
+                if path and path not in self._requested:
+                    self._requested.add(path)
+                    self._pending.append(path)
+            if not self._pending:
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="Prefetcher", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                path = self._pending.popleft()
+                generation = self._generation
+            try:
+                self._prefetch_program(path, generation)
+            except Exception as e:
+                print(f"[Prefetcher] Could not prefetch '{path}': {e}")
+
+    def _prefetch_program(self, exe_path: str, generation: int):
+        files = self.files_for(exe_path)
+        used = 0
+        with tracer.span(f"prefetch {os.path.basename(exe_path)}", CAT_PREFETCH, path=exe_path):
+            for path, size in files:
+                with self._condition:
+                    if generation != self._generation:
+                        return # A new run started
+                    if path in self._warmed:
+                        continue
+                    if used + size > self.program_budget or self.bytes_used + size > self.run_budget:
+                        continue # Smaller files further down may still fit
+                    self._warmed.add(path)
+                    self.bytes_used += size
+                used += size
+                self._warm(path, size, generation)
+        print(f"[Prefetcher] Warmed {used / 1_000_000:.0f} MB for '{os.path.basename(exe_path)}'")
+
+    @staticmethod
+    def files_for(exe_path: str) -> List[tuple]:
+        """
+        Returns [(path, size)] to warm for an executable: the executable first, then the
+        libraries and packed resources of its directory (SCAN_DEPTH levels deep), largest first.
+        """
+        try:
+            files = [(exe_path, os.path.getsize(exe_path))]
+        except OSError:
+            return []
+        found = []
+        pending = [(os.path.dirname(exe_path), 0)]
+        while pending and len(found) < MAX_FILES:
+            directory, depth = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if len(found) >= MAX_FILES:
+                            break
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if depth < SCAN_DEPTH:
+                                    pending.append((entry.path, depth + 1))
+                            elif ((os.path.splitext(entry.name)[1].lower() in PREFETCH_EXTENSIONS or ".so." in entry.name)
+                                  and entry.path != exe_path):
+                                size = entry.stat().st_size
+                                if 0 < size <= MAX_FILE_SIZE:
+                                    found.append((entry.path, size))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        found.sort(key=lambda item: item[1], reverse=True)
+        return files + found
+
+    def _warm(self, path: str, size: int, generation: int):
+        """Brings one file into the page cache."""
+        try:
+            with open(path, 'rb', buffering=0) as f:
+                if FADVISE_AVAILABLE:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED) # Kernel readahead, returns at once
+                    return
+                buffer = bytearray(READ_CHUNK)
+                started = time.monotonic()
+                done = 0
+                while done < size and generation == self._generation:
+                    read = f.readinto(buffer)
+                    if not read:
+                        break
+                    done += read
+                    ahead = done / READ_RATE_LIMIT - (time.monotonic() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except OSError:
+            pass # Locked or unreadable files are simply not warmed
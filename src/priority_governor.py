@@ -0,0 +1,188 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Priority Governor for EZ Streaming - Throttles "background" apps while the CPU is under pressure
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import psutil
+
+from event_bus import PRIORITY_ADJUSTED, UIEventBus
+from launch_policy import priority_value
+from resource_monitor import ResourceMonitor
+
+GOVERNOR_INTERVAL_MS = 2000  # How often the app calls tick()
+PRESSURE_HIGH = 85.0         # System CPU percent that counts as pressure
+PRESSURE_LOW = 60.0          # System CPU percent that counts as relief
+ENGAGE_TICKS = 3             # Consecutive pressured ticks before throttling (~6 s)
+RELEASE_TICKS = 5            # Consecutive relieved ticks before restoring (~10 s)
+THROTTLED_PRIORITY = "idle"  # Launch policy priority level used while throttled
+BACKGROUND_CORE_SHARE = 0.25 # Share of cores (the highest-numbered ones) background apps keep by default
+
+STATE_NORMAL = "normal"
+STATE_THROTTLED = "throttled"
+
+
+class _Saved(NamedTuple):
+    """Scheduling a process had before it was throttled."""
+    process: psutil.Process
+    path: str
+    name: str
+    nice: object # nice value (POSIX) or priority class (Windows)
+    affinity: Optional[List[int]]
+
+
+class PriorityGovernor:
+    """
+    Lowers the priority and CPU affinity of apps marked "background" under CPU pressure.
+
+    tick() reads system CPU from the ResourceMonitor. Once it stays at or above
+    PRESSURE_HIGH for ENGAGE_TICKS ticks, every process of every background app gets
+    THROTTLED_PRIORITY and is confined to cores the other apps are not pinned to. Once CPU
+    stays at or below PRESSURE_LOW for RELEASE_TICKS ticks, each process gets back the
+    exact priority and affinity it had before. The gap between the two thresholds and the
+    tick counts are the hysteresis that keeps it from flapping.
+
+    Every adjustment is logged and published as PRIORITY_ADJUSTED.
+    """
+
+    def __init__(self, monitor: ResourceMonitor, event_bus: UIEventBus,
+                 high: float = PRESSURE_HIGH, low: float = PRESSURE_LOW,
+                 engage_ticks: int = ENGAGE_TICKS, release_ticks: int = RELEASE_TICKS):
+        if low >= high:
+            raise ValueError("The relief threshold must be below the pressure threshold")
+        self.monitor = monitor
+        self.event_bus = event_bus
+        self.high = high
+        self.low = low
+        self.engage_ticks = engage_ticks
+        self.release_ticks = release_ticks
+        self.state = STATE_NORMAL
+        self.system_cpu = 0.0
+        self._streak = 0 # Consecutive ticks pointing towards the other state
+        self._saved: Dict[Tuple[int, float], _Saved] = {} # {(pid, create_time): scheduling before throttling}
+        self.monitor.system_cpu() # Prime the counters
+
+    def tick(self, targets: Dict[str, Tuple[str, Iterable[psutil.Process]]], reserved_cores: Iterable[int] = ()):
+        """
+        Takes one sample and throttles or restores background apps as needed.
+
+        Args:
+            targets: {exe path: (display name, live processes of the app's tree)} for every
+                running background app.
+            reserved_cores: Cores other apps are pinned to; background apps are kept off them.
+        """
+        self.system_cpu = self.monitor.system_cpu()
+        if self.state == STATE_NORMAL:
+            self._streak = self._streak + 1 if self.system_cpu >= self.high else 0
+            if self._streak >= self.engage_ticks:
+                self.state = STATE_THROTTLED
+                self._streak = 0
+                print(f"[PriorityGovernor] CPU at {self.system_cpu:.0f}% for {self.engage_ticks} samples; throttling background apps")
+        else:
+            self._streak = self._streak + 1 if self.system_cpu <= self.low else 0
+            if self._streak >= self.release_ticks:
+                print(f"[PriorityGovernor] CPU at {self.system_cpu:.0f}% for {self.release_ticks} samples; restoring background apps")
+                self.restore_all()
+                self.state = STATE_NORMAL
+                self._streak = 0
+
+        if self.state == STATE_THROTTLED:
+            cores = self._background_cores(set(reserved_cores))
+            for path, (name, processes) in targets.items():
+                self._throttle(path, name, list(processes), cores)
+        self._forget_exited()
+
+    def restore_all(self):
+        """Gives every throttled process back its original priority and affinity (e.g. on exit)."""
+        by_path: Dict[str, List[_Saved]] = {}
+        for saved in self._saved.values():
+            by_path.setdefault(saved.path, []).append(saved)
+        self._saved = {}
+        for path, entries in by_path.items():
+            pids = []
+            errors = []
+            for saved in entries:
+                try:
+                    saved.process.nice(saved.nice)
+                    if saved.affinity is not None:
+                        saved.process.cpu_affinity(saved.affinity)
+                    pids.append(saved.process.pid)
+                except psutil.NoSuchProcess:
+                    continue
+                except (psutil.AccessDenied, OSError, ValueError) as e:
+                    errors.append(f"PID {saved.process.pid}: {e}")
+            self._publish("restored", path, entries[0].name, pids, None, None, errors)
+
+    def _background_cores(self, reserved: Set[int]) -> Optional[List[int]]:
+        """Returns the cores background apps are confined to, or None if affinity is unavailable."""
+        cpu_count = psutil.cpu_count() or 1
+        if cpu_count < 2 or not hasattr(psutil.Process, "cpu_affinity"):
+            return None
+        free = [cpu for cpu in range(cpu_count) if cpu not in reserved]
+        if reserved and free:
+            return free
+        share = max(1, int(cpu_count * BACKGROUND_CORE_SHARE))
+        return list(range(cpu_count - share, cpu_count))
+
+    def _throttle(self, path: str, name: str, processes: List[psutil.Process], cores: Optional[List[int]]):
+        """Throttles the processes of one app that are not throttled yet (new helpers included)."""
+        target_nice = priority_value(THROTTLED_PRIORITY)
+        pids = []
+        errors = []
+        for process in processes:
+            try:
+                key = (process.pid, process.create_time())
+                if key in self._saved:
+                    continue
+                nice = process.nice()
+                affinity = process.cpu_affinity() if cores is not None else None
+                self._saved[key] = _Saved(process, path, name, nice, affinity)
+                if nice != target_nice:
+                    process.nice(target_nice)
+                if cores is not None and sorted(affinity) != cores:
+                    process.cpu_affinity(cores)
+                pids.append(process.pid)
+            except psutil.NoSuchProcess:
+                continue
+            except (psutil.AccessDenied, OSError, ValueError) as e:
+                errors.append(f"PID {process.pid}: {e}")
+        if pids or errors:
+            self._publish("throttled", path, name, pids, THROTTLED_PRIORITY, cores, errors)
+
+    def _forget_exited(self):
+        for key in [key for key, saved in self._saved.items() if not saved.process.is_running()]:
+            del self._saved[key]
+
+    def _publish(self, action: str, path: str, name: str, pids: List[int], priority, cores, errors: List[str]):
+        label = name or path
+        if action == "throttled":
+            message = f"Throttled '{label}' (PIDs {pids}) to priority {priority}" + (f", cores {cores}" if cores else "")
+        else:
+            message = f"Restored '{label}' (PIDs {pids})"
+        print(f"[PriorityGovernor] {message} at {self.system_cpu:.0f}% CPU" + (f"; errors: {errors}" if errors else ""))
+        self.event_bus.publish(PRIORITY_ADJUSTED, {
+            "action": action,
+            "path": path,
+            "name": name,
+            "pids": pids,
+            "priority": priority,
+            "cpu_affinity": cores,
+            "system_cpu": self.system_cpu,
+            "errors": errors
+        })
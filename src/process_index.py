@@ -0,0 +1,128 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Process Index for EZ Streaming - One-sweep lookup of running processes by executable path
+"""
+
+import os
+import time
+from typing import Dict, List, Optional
+
+import psutil
+
+DEFAULT_TTL = 2.0 # Seconds a sweep stays valid before the next lookup rebuilds it
+
+
+def normalize_path(path: str) -> str:
+    """Normalizes an executable path for comparisons (case-insensitive where the OS is)."""
+    return os.path.normcase(os.path.normpath(path))
+
+
+class ProcessIndex:
+    """
+    Snapshot of the system process list, keyed by normalized exe path, by lowercase name,
+    by parent pid and (on POSIX) by process group.
+
+    A single psutil.process_iter sweep fills all maps; every lookup made within the TTL
+    is answered from the snapshot, so loading a profile or polling stats for many rows
+    costs one system scan instead of one per row.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self._by_exe: Dict[str, List[psutil.Process]] = {}
+        self._by_name: Dict[str, List[psutil.Process]] = {}
+        self._children: Dict[int, List[psutil.Process]] = {}
+        self._groups: Dict[int, List[psutil.Process]] = {}
+        self._built_at: Optional[float] = None
+
+    def refresh(self, force: bool = False):
+        """Rebuilds the index if it is older than the TTL (or unconditionally with force=True)."""
+        if not force and self._built_at is not None and time.monotonic() - self._built_at < self.ttl:
+            return
+
+        by_exe: Dict[str, List[psutil.Process]] = {}
+        by_name: Dict[str, List[psutil.Process]] = {}
+        children: Dict[int, List[psutil.Process]] = {}
+        groups: Dict[int, List[psutil.Process]] = {}
+        track_groups = hasattr(os, 'getpgid')
+        try:
+            for proc in psutil.process_iter(['pid', 'ppid', 'name', 'exe']):
+                exe = proc.info.get('exe')
+                name = proc.info.get('name')
+                ppid = proc.info.get('ppid')
+                if exe:
+                    by_exe.setdefault(normalize_path(exe), []).append(proc)
+                if name:
+                    by_name.setdefault(name.lower(), []).append(proc)
+                if ppid:
+                    children.setdefault(ppid, []).append(proc)
+                if track_groups:
+                    # Orphaned helpers are reparented on POSIX but keep their process group
+                    try:
+                        groups.setdefault(os.getpgid(proc.pid), []).append(proc)
+                    except OSError:
+                        pass
+        except Exception as e:
+            print(f"[ProcessIndex] Error sweeping processes: {e}")
+
+        self._by_exe = by_exe
+        self._by_name = by_name
+        self._children = children
+        self._groups = groups
+        self._built_at = time.monotonic()
+
+    def invalidate(self):
+        """Forces the next lookup to perform a fresh sweep."""
+        self._built_at = None
+
+    def find_all(self, exe_path: str, match_name: bool = False) -> List[psutil.Process]:
+        """
+        Returns every indexed process running the given executable.
+
+        Args:
+            exe_path (str): Path of the executable to look for.
+            match_name (bool): Also accept processes whose name matches the executable's
+                               basename when their exe path could not be read (e.g. access
+                               denied). A readable exe path that differs never matches, so an
+                               unrelated python.exe or Update.exe is not mistaken for the program.
+        """
+        if not exe_path:
+            return []
+        self.refresh()
+
+        matches = list(self._by_exe.get(normalize_path(exe_path), []))
+        if match_name:
+            for proc in self._by_name.get(os.path.basename(exe_path).lower(), []):
+                if not proc.info.get('exe'):
+                    matches.append(proc)
+        return matches
+
+    def find(self, exe_path: str, match_name: bool = False) -> Optional[psutil.Process]:
+        """Returns the first indexed process running the given executable, or None."""
+        matches = self.find_all(exe_path, match_name)
+        return matches[0] if matches else None
+
+    def children_of(self, pid: int) -> List[psutil.Process]:
+        """Returns the indexed direct children of a pid."""
+        self.refresh()
+        return list(self._children.get(pid, []))
+
+    def group_members(self, pgid: int) -> List[psutil.Process]:
+        """Returns the indexed members of a POSIX process group (always empty on Windows)."""
+        self.refresh()
+        return list(self._groups.get(pgid, []))
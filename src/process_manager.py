@@ -21,32 +21,249 @@ import sys
 import subprocess
 import time
 import os # Added for basename
+import select
+import threading
 import psutil  # Add psutil for process monitoring
-from PySide6.QtWidgets import QApplication, QMessageBox
-from event_bus import UIEventBus, PROCESS_LIST_CHANGED, STATUS_UPDATE # Import event bus and constants
+from collections import deque
+from PySide6.QtCore import QObject, Qt, QTimer, Signal, Slot
+from PySide6.QtWidgets import QMessageBox
+from process_index import ProcessIndex
+from process_tree import ProcessTree, is_alive, terminate_trees
+from resource_monitor import ResourceMonitor, ProcessStatsProvider
+from tracing import CAT_UI, traced
+from event_bus import UIEventBus, PROCESS_LIST_CHANGED, PROCESS_RESTART, PROCESS_STANDBY_CHANGED, PROCESS_STATE_CHANGED, STATUS_UPDATE # Import event bus and constants
+
+STATUS_POLL_INTERVAL_MS = 2000 # Safety-net tick; exits normally arrive from ProcessExitWatcher
+TREE_REFRESH_INTERVAL = 10.0 # Seconds between routine sweeps for new helper processes of tracked trees
+EXIT_WATCH_FALLBACK_TIMEOUT = 0.5 # Seconds per psutil.wait_procs round when pidfds are unavailable
+RESTART_BASE_DELAY_MS = 2000 # First automatic restart after an unexpected exit; doubles per restart
+RESTART_MAX_DELAY_MS = 60000 # Backoff cap
+CRASH_LOOP_LIMIT = 5 # Restarts allowed within CRASH_LOOP_WINDOW before the supervisor gives up
+CRASH_LOOP_WINDOW = 300.0 # Seconds
+
+
+class _ExitSignalBridge(QObject):
+    """Carries exit notifications from the watcher thread to the Qt thread."""
+
+    process_exited = Signal(str, object, object) # path, process, returncode
+
+    def __init__(self, handler):
+        super().__init__()
+        self._handler = handler
+        self.process_exited.connect(self._deliver, Qt.ConnectionType.QueuedConnection)
+
+    @Slot(str, object, object)
+    def _deliver(self, path, process, returncode):
+        self._handler(path, process, returncode)
+
+
+class ProcessExitWatcher:
+    """
+    Background thread that blocks until watched processes exit and reports each exit once.
+
+    On Linux every process gets a pidfd and the thread sleeps in poll() until one becomes
+    readable, so exits are seen immediately without any periodic wakeups. Elsewhere the
+    whole watched set is handed to psutil.wait_procs in one call. Exited Popen children
+    are reaped here so no zombies are left behind.
+    """
+
+    def __init__(self, on_exit):
+        """
+        Args:
+            on_exit (callable): Called from the watcher thread as on_exit(path, process, returncode).
+        """
+        self._on_exit = on_exit
+        self._lock = threading.Lock()
+        self._watched = {} # {path: process}
+        self._changed = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self._use_pidfd = self._pidfd_supported()
+        self._wake_r, self._wake_w = os.pipe() if self._use_pidfd else (None, None)
+
+    @staticmethod
+    def _pidfd_supported():
+        """Checks that os.pidfd_open exists and the running kernel implements it."""
+        if not hasattr(os, "pidfd_open"):
+            return False
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+            return True
+        except OSError:
+            return False
+
+    def watch(self, path, process):
+        """Starts watching a process; replaces any process previously watched for the path."""
+        with self._lock:
+            self._watched[path] = process
+        self._wake()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="ProcessExitWatcher", daemon=True)
+            self._thread.start()
+
+    def unwatch(self, path):
+        """Stops watching the process for a path (e.g. when it is closed on purpose)."""
+        with self._lock:
+            removed = self._watched.pop(path, None) is not None
+        if removed:
+            self._wake()
+
+    def stop(self):
+        """Stops the watcher thread."""
+        self._stopping = True
+        self._wake()
+
+    def _wake(self):
+        """Interrupts the blocking wait so the thread picks up watch-list changes."""
+        self._changed.set()
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"x")
+            except OSError:
+                pass
+
+    def _run(self):
+        if self._use_pidfd:
+            self._run_pidfd()
+        else:
+            self._run_wait_procs()
+
+    def _run_pidfd(self):
+        """Blocks in poll() on one pidfd per watched process plus the wake pipe."""
+        poller = select.poll()
+        poller.register(self._wake_r, select.POLLIN)
+        fds = {} # {fd: (path, process)}
+        while not self._stopping:
+            with self._lock:
+                watched = dict(self._watched)
+            # Close pidfds for processes that are no longer watched
+            for fd, (path, process) in list(fds.items()):
+                if watched.get(path) is not process:
+                    poller.unregister(fd); os.close(fd); del fds[fd]
+            # Open pidfds for newly watched processes
+            open_processes = {id(process) for _, process in fds.values()}
+            for path, process in watched.items():
+                if id(process) in open_processes:
+                    continue
+                try:
+                    fd = os.pidfd_open(process.pid)
+                except OSError: # Already gone before we could watch it
+                    self._report_exit(path, process)
+                    continue
+                fds[fd] = (path, process)
+                poller.register(fd, select.POLLIN)
+
+            for fd, _ in poller.poll():
+                if fd == self._wake_r:
+                    os.read(self._wake_r, 512)
+                    continue
+                path, process = fds.pop(fd)
+                poller.unregister(fd); os.close(fd)
+                self._report_exit(path, process)
+
+        for fd in fds:
+            os.close(fd)
+
+    def _run_wait_procs(self):
+        """Waits on the whole watched set with psutil.wait_procs, re-reading it every round."""
+        handles = {} # {id(process): psutil.Process}
+        while not self._stopping:
+            self._changed.clear()
+            with self._lock:
+                watched = dict(self._watched)
+            if not watched:
+                handles.clear()
+                self._changed.wait()
+                continue
+
+            by_handle = {}
+            for path, process in watched.items():
+                handle = handles.get(id(process))
+                if handle is None:
+                    try:
+                        handle = process if isinstance(process, psutil.Process) else psutil.Process(process.pid)
+                    except psutil.NoSuchProcess:
+                        self._report_exit(path, process)
+                        continue
+                    handles[id(process)] = handle
+                by_handle[handle] = (path, process)
+            handles = {key: handle for key, handle in handles.items() if handle in by_handle}
+
+            try:
+                gone, _ = psutil.wait_procs(list(by_handle), timeout=EXIT_WATCH_FALLBACK_TIMEOUT)
+            except Exception as e:
+                print(f"[ProcessExitWatcher] Error waiting on processes: {e}")
+                time.sleep(EXIT_WATCH_FALLBACK_TIMEOUT)
+                continue
+            for handle in gone:
+                path, process = by_handle[handle]
+                self._report_exit(path, process, handle.returncode)
+
+    def _report_exit(self, path, process, returncode=None):
+        """Reaps the process if it is our child and hands the exit to the callback once."""
+        with self._lock:
+            if self._watched.get(path) is not process:
+                return # Unwatched or replaced meanwhile
+            del self._watched[path]
+        if hasattr(process, 'poll'):
+            # Reaps the zombie; the psutil exit code (if any) wins when psutil reaped it first
+            polled = process.poll()
+            if returncode is None:
+                returncode = polled
+        try:
+            self._on_exit(path, process, returncode)
+        except Exception as e:
+            print(f"[ProcessExitWatcher] Error reporting exit for {path}: {e}")
+
 
 class ProcessManager:
     """Manages running processes launched by the application."""
 
-    def __init__(self, parent_app, event_bus: UIEventBus):
+    def __init__(self, parent_app, event_bus: UIEventBus, process_index: ProcessIndex = None,
+                 resource_monitor: ResourceMonitor = None):
         """
         Initializes the ProcessManager.
 
         Args:
             parent_app: The main StreamerApp instance.
             event_bus (UIEventBus): The application's event bus.
+            process_index (ProcessIndex, optional): Shared system process index. A private one is created if omitted.
+            resource_monitor (ResourceMonitor, optional): Shared monitor used for stats. Created on first use if omitted.
         """
         self.parent_app = parent_app # Reference to the main StreamerApp (still needed for widgets)
         self.event_bus = event_bus
+        self.process_index = process_index if process_index is not None else ProcessIndex()
+        self.resource_monitor = resource_monitor
+        self._stats_provider = None # Created lazily by get_process_stats()
         self.running_processes = {} # Dictionary to store {path: process_object}
+        self.process_trees = {} # {path: ProcessTree} covering each tracked process and its descendants
+        self._process_states = {} # Last published running state {path: bool}
+        self._status_timer = None # Shared poller, created by start_status_polling()
+        self._trees_refreshed_at = None # Monotonic time of the last routine refresh_trees() sweep
+        self.last_exit_codes = {} # {path: returncode} of the most recent exit seen by the watcher
+        # Crash supervisor (programs with a restart_policy other than "never")
+        self._requested_exits = set() # Paths we were asked to close; their exits are not restarted
+        self._restart_times = {} # {path: deque of monotonic restart times inside CRASH_LOOP_WINDOW}
+        self._restart_tokens = {} # {path: int}; bumped to cancel a scheduled restart
+        self._supervising = True # Cleared by stop_status_polling() at shutdown
+        self.tracked_programs = {} # {path: ProgramConfig} the process was last launched with; kept after it exits
+        # Warm standby: programs launched ahead of time and suspended until go_live()
+        self.standby_paths = set()
+        self.live = False # Set by go_live(); programs finishing their launch afterwards stay running
+        self._exit_bridge = _ExitSignalBridge(self._handle_process_exit)
+        self._exit_watcher = ProcessExitWatcher(self._exit_bridge.process_exited.emit)
 
-    def track(self, path, process):
+    @traced("ProcessManager.track", CAT_UI)
+    def track(self, path, process, program=None):
         """
         Starts tracking a launched process.
 
         Args:
             path (str): The executable path of the process.
             process: The subprocess object or psutil.Process object.
+            program (ProgramConfig, optional): The row it was launched from. Its restart policy
+                and name are kept with the entry, so the crash supervisor still knows them
+                after the profile is switched or the row is removed.
         """
         if path and process:
             # Handle both subprocess.Popen and psutil.Process objects
@@ -56,8 +273,16 @@ class ProcessManager:
                 pid = "Unknown"
             
             print(f"[ProcessManager] Tracking: {path} (PID: {pid})")
+            self._requested_exits.discard(path)
+            self.last_exit_codes.pop(path, None)
+            self._cancel_restart(path) # A manual launch supersedes a scheduled restart
+            if program is not None:
+                self.tracked_programs[path] = program
             self.running_processes[path] = process
+            self.process_trees[path] = ProcessTree(process)
+            self._exit_watcher.watch(path, process)
             self.event_bus.publish(PROCESS_LIST_CHANGED) # Publish event instead of direct UI call
+            self._publish_state_changes({path: True})
 
     def untrack(self, path):
         """
@@ -69,31 +294,347 @@ class ProcessManager:
         if path in self.running_processes:
             print(f"[ProcessManager] Untracking: {path}")
             del self.running_processes[path]
+            self.process_trees.pop(path, None)
+            self.standby_paths.discard(path)
+            self._exit_watcher.unwatch(path)
             self.event_bus.publish(PROCESS_LIST_CHANGED) # Publish event instead of direct UI call
+            self._publish_state_changes({path: False})
 
     def get_running_processes(self):
         """Returns the dictionary of currently tracked running processes."""
         return self.running_processes
 
     def is_running(self, path):
-        """Checks if a process with the given path is currently tracked and running."""
-        process = self.running_processes.get(path)
-        if process is None:
+        """Checks if a process with the given path (or any of its descendants) is tracked and running."""
+        tree = self.process_trees.get(path)
+        return tree.is_alive() if tree else False
+
+    def refresh_trees(self):
+        """
+        Grows every tracked process tree from one shared index sweep.
+
+        The status poll and the priority governor both call this on their ticks; the sweep
+        runs at most every TREE_REFRESH_INTERVAL seconds for both together. Exits arrive from
+        ProcessExitWatcher, and closing, standby and launcher exits sweep on demand, so only
+        newly spawned helpers are picked up later.
+        """
+        if not self.process_trees:
+            return
+        now = time.monotonic()
+        if self._trees_refreshed_at is not None and now - self._trees_refreshed_at < TREE_REFRESH_INTERVAL:
+            return
+        self._trees_refreshed_at = now
+        self.process_index.refresh()
+        for tree in self.process_trees.values():
+            tree.update(self.process_index)
+
+    def terminate_tree(self, path, timeout=0.5):
+        """
+        Terminates the tracked process for a path together with all of its descendants.
+
+        Returns:
+            bool: True if the whole tree is gone (the path is untracked in that case).
+        """
+        self._requested_exits.add(path)
+        self._cancel_restart(path)
+        self._resume_trees([path]) # A suspended app cannot handle the close request
+        tree = self.process_trees.get(path)
+        if tree is None:
+            return True
+        self.process_index.refresh(force=True) # Pick up helpers spawned since the last sweep
+        tree.update(self.process_index)
+        closed = tree.terminate(timeout)
+        if closed:
+            self.untrack(path)
+        return closed
+
+    def terminate_all(self, paths=None, timeout=0.5):
+        """
+        Terminates several tracked process trees at once (all tracked ones by default).
+
+        All trees are signalled together and share one deadline, then the closed paths
+        are untracked in a single batch with one list update and one state event.
+
+        Returns:
+            dict: {path: True if the whole tree is gone}.
+        """
+        if paths is None:
+            paths = list(self.process_trees.keys())
+        for path in paths:
+            self._requested_exits.add(path)
+            self._cancel_restart(path)
+        self._resume_trees(paths) # Suspended apps cannot handle the close request
+        trees = {path: self.process_trees[path] for path in paths if path in self.process_trees}
+        if not trees:
+            return {}
+        print(f"[ProcessManager] Closing {len(trees)} process tree(s) in parallel...")
+        self.process_index.refresh(force=True) # Pick up helpers spawned since the last sweep
+        for tree in trees.values():
+            tree.update(self.process_index)
+        try:
+            results = terminate_trees(trees, timeout)
+        except Exception as e:
+            print(f"[ProcessManager] Error closing processes: {e}")
+            results = {path: not tree.is_alive() for path, tree in trees.items()}
+        for path, closed in results.items():
+            if not closed:
+                print(f"[ProcessManager] Warning: {path} still running after termination attempts.")
+        self._untrack_many([path for path, closed in results.items() if closed])
+        return results
+
+    # --- Warm Standby ---
+
+    def arm_standby(self):
+        """Lets programs marked "standby" be suspended again (called when a launch run starts)."""
+        self.live = False
+
+    def enter_standby(self, path):
+        """
+        Suspends a tracked program together with all of its helper processes.
+
+        The program keeps its memory and initialized state but gets no CPU time until
+        go_live() resumes it. Nothing happens once go_live() was called for this run.
+
+        Returns:
+            bool: True if the program is now suspended.
+        """
+        tree = self.process_trees.get(path)
+        if self.live or tree is None or path in self.standby_paths:
             return False
-            
-        # Handle both subprocess.Popen and psutil.Process objects
-        if hasattr(process, 'poll'):
-            # subprocess.Popen object
-            return process.poll() is None
-        elif hasattr(process, 'is_running'):
-            # psutil.Process object
-            try:
-                return process.is_running()
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                return False
-        else:
+        self.process_index.refresh(force=True) # Catch helpers spawned during initialization
+        tree.update(self.process_index)
+        paused = tree.suspend()
+        if not paused:
+            print(f"[ProcessManager] Could not suspend {path}")
             return False
-    
+        self.standby_paths.add(path)
+        print(f"[ProcessManager] Standby: suspended {path} ({len(paused)} process(es))")
+        self.event_bus.publish(PROCESS_STANDBY_CHANGED, {"paths": [path], "state": "suspended"})
+        return True
+
+    def go_live(self):
+        """
+        Resumes every program in standby at once.
+
+        Returns:
+            list[str]: The paths that were resumed.
+        """
+        self.live = True
+        paths = self._resume_trees(list(self.standby_paths))
+        if paths:
+            print(f"[ProcessManager] Go live: resumed {len(paths)} program(s)")
+            self.event_bus.publish(PROCESS_STANDBY_CHANGED, {"paths": paths, "state": "resumed"})
+        return paths
+
+    def _resume_trees(self, paths):
+        """Resumes the suspended trees among paths and returns the paths resumed."""
+        resumed = []
+        for path in paths:
+            if path not in self.standby_paths:
+                continue
+            self.standby_paths.discard(path)
+            tree = self.process_trees.get(path)
+            if tree is not None:
+                tree.resume()
+                resumed.append(path)
+        return resumed
+
+    # --- Shared Status Polling ---
+
+    def start_status_polling(self, interval_ms=STATUS_POLL_INTERVAL_MS):
+        """Starts the single timer that checks every tracked process in one batched tick."""
+        if self._status_timer is None:
+            self._status_timer = QTimer()
+            self._status_timer.timeout.connect(self.poll_status)
+        self._status_timer.start(interval_ms)
+
+    def stop_status_polling(self):
+        """
+        Stops the shared status timer and the exit watcher thread, and with them the crash
+        supervisor: scheduled restarts are cancelled and later exits are not restarted.
+        """
+        if self._status_timer is not None:
+            self._status_timer.stop()
+        self._exit_watcher.stop()
+        self._supervising = False
+        for path in list(self._restart_tokens):
+            self._cancel_restart(path)
+
+    def _handle_process_exit(self, path, process, returncode):
+        """Qt-thread handler for an exit reported by ProcessExitWatcher."""
+        if self.running_processes.get(path) is not process:
+            return # Already untracked or replaced by a relaunch
+        self.last_exit_codes[path] = returncode
+        tree = self.process_trees.get(path)
+        if tree is not None:
+            # Launchers often exit right after starting the real app; keep tracking the tree
+            self.process_index.refresh(force=True)
+            tree.update(self.process_index)
+            if tree.is_alive():
+                print(f"[ProcessManager] Launcher exited: {path} (code: {returncode}); {len(tree.alive_members())} child process(es) still running")
+                return
+        print(f"[ProcessManager] Process exited: {path} (code: {returncode})")
+        del self.running_processes[path]
+        self.process_trees.pop(path, None)
+        self.standby_paths.discard(path)
+        self.event_bus.publish(PROCESS_LIST_CHANGED)
+        self._publish_state_changes({path: False})
+        self._supervise_exit(path, returncode)
+
+    def poll_status(self):
+        """
+        Checks all tracked process trees once and untracks the ones that fully exited.
+        Only real running -> stopped transitions are published, so idle ticks cost no UI work.
+        """
+        self.refresh_trees() # Rate-limited; picks up helpers spawned since the last sweep
+        exited = [path for path in self.running_processes if not self.is_running(path)]
+        if not exited:
+            return
+
+        returncodes = {path: self._final_returncode(path) for path in exited}
+        for path in exited:
+            print(f"[ProcessManager] Process exited: {path}")
+        self._untrack_many(exited)
+        for path in exited:
+            self._supervise_exit(path, returncodes[path])
+
+    def _final_returncode(self, path):
+        """
+        Exit code of the last process of a tree that just exited, or None if unknown.
+
+        If the watcher already reported the root exiting while helpers lived on (a launcher),
+        the code of whichever helper exited last is not available.
+        """
+        if path in self.last_exit_codes:
+            return None
+        process = self.running_processes.get(path)
+        if isinstance(process, subprocess.Popen):
+            return process.poll()
+        return None
+
+    # --- Crash Supervisor ---
+
+    def _supervise_exit(self, path, returncode):
+        """
+        Schedules a restart after an exit we did not ask for, if the program's restart_policy wants one.
+
+        "on_crash" restarts on a non-zero exit code (negative codes are signals on Linux/macOS)
+        and on an exit whose code is unknown (adopted processes, apps behind a launcher), since
+        only a clean exit code tells a crash from a normal shutdown; "always" restarts after any
+        exit. Restarts back off exponentially from RESTART_BASE_DELAY_MS, and after
+        CRASH_LOOP_LIMIT restarts within CRASH_LOOP_WINDOW the program is left stopped.
+        """
+        if path in self._requested_exits:
+            self._requested_exits.discard(path)
+            return
+        if not self._supervising:
+            return
+        policy, name = self._restart_settings(path)
+        if policy == "never" or (policy == "on_crash" and returncode == 0):
+            return
+
+        now = time.monotonic()
+        history = self._restart_times.setdefault(path, deque())
+        while history and now - history[0] > CRASH_LOOP_WINDOW:
+            history.popleft()
+        if len(history) >= CRASH_LOOP_LIMIT:
+            print(f"[ProcessManager] '{name}' exited (code: {returncode}) {len(history)} times within "
+                  f"{CRASH_LOOP_WINDOW:.0f}s; not restarting it again")
+            self._publish_restart(path, name, returncode, "abandoned", len(history), 0.0)
+            return
+
+        delay_ms = min(RESTART_BASE_DELAY_MS * 2 ** len(history), RESTART_MAX_DELAY_MS)
+        history.append(now)
+        attempt = len(history)
+        token = self._restart_tokens.get(path, 0) + 1
+        self._restart_tokens[path] = token
+        print(f"[ProcessManager] '{name}' exited unexpectedly (code: {returncode}); restart {attempt} in {delay_ms / 1000:g}s")
+        self._publish_restart(path, name, returncode, "scheduled", attempt, delay_ms / 1000)
+        QTimer.singleShot(delay_ms, lambda: self._restart(path, token, returncode, attempt))
+
+    def _restart(self, path, token, returncode, attempt):
+        """Relaunches a supervised program unless the restart was cancelled in the meantime."""
+        if self._restart_tokens.get(path) != token or path in self.running_processes:
+            return
+        self._restart_tokens.pop(path, None)
+        _, name = self._restart_settings(path)
+        widgets = self.parent_app.widgets_by_path().get(path) if self.parent_app is not None else None
+        program = self.tracked_programs.get(path)
+        if widgets:
+            self._publish_restart(path, name, returncode, "launched", attempt, 0.0)
+            widgets[0].launch_program() # The row shows the relaunch
+        elif program is not None and getattr(self.parent_app, "launch_worker", None) is not None:
+            # Launched from another profile or its row was removed: relaunch it without a row
+            self._publish_restart(path, name, returncode, "launched", attempt, 0.0)
+            self.parent_app.launch_worker.spawn(path, lambda result: self._handle_restart_spawn(program, result),
+                                                program=program)
+
+    def _handle_restart_spawn(self, program, result):
+        """Tracks a program relaunched by the supervisor without a row (runs on the Qt thread)."""
+        if result.error is None:
+            self.track(result.path, result.process, program)
+        else:
+            print(f"[ProcessManager] Restarting '{program.name or os.path.basename(result.path)}' failed: {result.error}")
+
+    def _restart_settings(self, path):
+        """
+        Returns (restart_policy, display name) for a path: from the program it was launched
+        with, or from its row in the current profile if it was tracked without one.
+        """
+        program = self.tracked_programs.get(path)
+        if program is not None:
+            return program.restart_policy, program.name or os.path.basename(path)
+        widgets = self.parent_app.widgets_by_path().get(path) if self.parent_app is not None else None
+        if not widgets:
+            return "never", os.path.basename(path)
+        return getattr(widgets[0], "restart_policy", "never"), widgets[0].get_name() or os.path.basename(path)
+
+    def _cancel_restart(self, path):
+        if path in self._restart_tokens:
+            self._restart_tokens[path] += 1
+
+    def _publish_restart(self, path, name, returncode, state, attempt, delay):
+        self.event_bus.publish(PROCESS_RESTART, {
+            "path": path,
+            "name": name,
+            "returncode": returncode,
+            "state": state,
+            "attempt": attempt,
+            "delay": delay
+        })
+
+    def _untrack_many(self, paths):
+        """Untracks several paths with one list update and one state event for the batch."""
+        paths = [path for path in paths if path in self.running_processes]
+        if not paths:
+            return
+        for path in paths:
+            del self.running_processes[path]
+            self.process_trees.pop(path, None)
+            self.standby_paths.discard(path)
+            self._exit_watcher.unwatch(path)
+        self.event_bus.publish(PROCESS_LIST_CHANGED) # One list update for the whole batch
+        self._publish_state_changes({path: False for path in paths})
+
+    def _publish_state_changes(self, states):
+        """
+        Publishes PROCESS_STATE_CHANGED for the paths whose running state actually flipped.
+
+        Args:
+            states (dict): {path: is_running} as observed by the caller.
+        """
+        changed = {path for path, running in states.items() if self._process_states.get(path, False) != running}
+        for path, running in states.items():
+            if running:
+                self._process_states[path] = True
+            else:
+                self._process_states.pop(path, None)
+        if changed:
+            self.event_bus.publish(PROCESS_STATE_CHANGED, {
+                "changed": changed,
+                "running": {path: states[path] for path in changed}
+            })
+
     def find_running_process(self, exe_path):
         """
         Find if a process is running on the system by its executable path.
@@ -102,55 +643,44 @@ class ProcessManager:
         if not exe_path or not os.path.exists(exe_path):
             return None
             
-        exe_name = os.path.basename(exe_path).lower()
-        
-        try:
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
-                try:
-                    # Check by exact exe path first
-                    if proc.info['exe'] and os.path.normpath(proc.info['exe'].lower()) == os.path.normpath(exe_path.lower()):
-                        return proc
-                    # Also check by name for processes that might have been moved
-                    elif proc.info['name'] and proc.info['name'].lower() == exe_name:
-                        # Verify it's likely the same program
-                        return proc
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-        except Exception as e:
-            print(f"[ProcessManager] Error finding process: {e}")
-        
-        return None
+        # Answered from the shared one-sweep index; names only match processes whose path can't be read
+        return self.process_index.find(exe_path, match_name=True)
     
     def get_process_stats(self, exe_path):
         """
-        Get CPU, memory, and GPU usage for a process.
+        Get CPU, memory, and GPU usage for a process without blocking.
         Returns dict with 'cpu', 'memory', and 'gpu' percentages, or None if not found.
+        For tracked programs the figures are summed over the whole process tree.
+        Values come from a primed stats provider, so the first call reports 0% CPU and later
+        calls report the usage since the previous sample.
         """
-        proc = self.find_running_process(exe_path)
-        if not proc:
-            return None
-            
-        try:
-            # Get CPU and memory usage
-            cpu_percent = proc.cpu_percent(interval=0.1)  # Short interval for responsiveness
-            memory_info = proc.memory_info()
-            memory_percent = proc.memory_percent()
-            
-            # GPU usage would require additional libraries like GPUtil or pynvml
-            # For now, we'll set it to 0 or estimate based on process type
-            gpu_percent = 0  # Placeholder
-            
-            return {
-                'cpu': round(cpu_percent, 1),
-                'memory': round(memory_percent, 1),
-                'gpu': round(gpu_percent, 1),
-                'pid': proc.pid
-            }
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
+        # Prefer the tracked tree; otherwise answer from the shared index (no per-call scan)
+        tree = self.process_trees.get(exe_path)
+        members = tree.alive_members() if tree else []
+        if not members:
+            proc = self.find_running_process(exe_path)
+            if not proc:
+                return None
+            members = [proc]
+
+        if self._stats_provider is None:
+            if self.resource_monitor is None:
+                self.resource_monitor = ResourceMonitor(self.process_index)
+            self._stats_provider = ProcessStatsProvider(self.resource_monitor)
+
+        samples = self._stats_provider.get_many(members)
+        if not samples:
             return None
+        return {
+            'cpu': round(min(sum(s.cpu for s in samples.values()), 100.0), 1),
+            'memory': round(sum(s.memory for s in samples.values()), 1),
+            'gpu': round(max(s.gpu for s in samples.values()), 1), # Per-process GPU may be device-wide; don't double count
+            'pid': next(member.pid for member in members if member.pid in samples), # The root, or whatever was sampled instead
+            'process_count': len(samples)
+        }
 
     def close_all(self):
-        """Attempts to close all tracked running processes."""
+        """Closes every tracked program in parallel after confirmation."""
         if not self.running_processes:
             self.event_bus.publish(STATUS_UPDATE, {
                 "message": "No running programs to close",
@@ -165,75 +695,16 @@ class ProcessManager:
         if result != QMessageBox.StandardButton.Yes:
             return
 
-        paths_to_close = list(self.running_processes.keys()) # Copy keys as dict changes during iteration
-        closed_count = 0
+        widgets_by_path = self.parent_app.widgets_by_path() # One lookup table instead of a scan per app
+        results = self.terminate_all()
+        closed_count = sum(1 for closed in results.values() if closed)
         failed_to_close = []
+        for path, closed in results.items():
+            if not closed:
+                widgets = widgets_by_path.get(path)
+                failed_to_close.append((widgets[0].get_name() if widgets else None) or os.path.basename(path))
 
-        print(f"[ProcessManager] Attempting to close {len(paths_to_close)} processes.")
-
-        for path in paths_to_close:
-            process = self.running_processes.get(path)
-            if process and process.poll() is None:
-                app_name = path # Fallback name
-                # Find the corresponding widget to get a better name and reset its UI
-                widget_found = False
-                for program_data in self.parent_app.programs: # Need parent ref to access UI widgets
-                    widget = program_data["widget"]
-                    if widget.get_path() == path:
-                        app_name = widget.get_name() or os.path.basename(path)
-                        print(f"[ProcessManager] Closing '{app_name}' (PID: {process.pid})...")
-                        try:
-                            print(f"  Terminating PID {process.pid}...")
-                            process.terminate()
-                            try:
-                                process.wait(timeout=0.5)
-                            except subprocess.TimeoutExpired:
-                                print(f"  Process {process.pid} did not terminate gracefully, killing.")
-                                if sys.platform == "win32":
-                                    try: subprocess.run(['taskkill', '/F', '/PID', str(process.pid)], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                                    except Exception: process.kill()
-                                else: process.kill()
-
-                            if process.poll() is not None:
-                                closed_count += 1
-                                self.untrack(path) # Untrack publishes PROCESS_LIST_CHANGED
-                                widget.reset_status() # Update widget UI directly
-                                widget.close_btn.setVisible(False)
-                            else:
-                                print(f"  Warning: Process {process.pid} still running after termination attempts.")
-                                failed_to_close.append(app_name)
-
-                        except Exception as e:
-                            print(f"  Error terminating process {process.pid}: {e}")
-                            failed_to_close.append(app_name)
-                            # Attempt to untrack even on error
-                            self.untrack(path)
-                            widget.reset_status()
-                            widget.close_btn.setVisible(False)
-
-
-                        widget_found = True
-                        break # Found the widget for this path
-
-                if not widget_found:
-                    # If widget not found, try basic termination
-                    print(f"[ProcessManager] Closing '{app_name}' (PID: {process.pid}) directly (no widget found)...")
-                    try:
-                        process.terminate()
-                        process.wait(timeout=0.1)
-                    except Exception:
-                        process.kill()
-                    finally:
-                        if process.poll() is not None:
-                            closed_count += 1
-                            self.untrack(path) # Untrack publishes PROCESS_LIST_CHANGED
-                        else:
-                            failed_to_close.append(app_name)
-
-
-                QApplication.processEvents() # Allow UI updates between closures
-
-        # Publish final status update
+        # Row updates arrive through the single PROCESS_STATE_CHANGED published by terminate_all
         status_data = {"duration": 5000}
         if failed_to_close:
              status_data["message"] = f"Closed {closed_count} programs. Failed to close: {', '.join(failed_to_close)}"
@@ -242,8 +713,3 @@ class ProcessManager:
              status_data["message"] = f"Closed {closed_count} programs successfully."
              status_data["color"] = self.parent_app.style_manager.launched_color
         self.event_bus.publish(STATUS_UPDATE, status_data)
-
-        # Final PROCESS_LIST_CHANGED event is published by the last untrack call(s)
-        # self._update_ui() # No longer needed
-
-    # Removed _update_ui as it's replaced by event publishing
@@ -0,0 +1,283 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Process Trees for EZ Streaming - Tracks launcher-style apps together with the helpers they spawn
+"""
+
+import os
+import signal
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+import psutil
+
+from process_index import ProcessIndex
+
+
+def new_group_popen_kwargs() -> dict:
+    """
+    Popen keyword arguments that start a program in its own process group (Windows)
+    or session (POSIX), so the whole tree can be signalled as a unit.
+    """
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def is_alive(process) -> bool:
+    """Checks a subprocess.Popen or psutil.Process object without blocking."""
+    if process is None:
+        return False
+    if hasattr(process, 'poll'):
+        # subprocess.Popen object (poll() also reaps it)
+        return process.poll() is None
+    try:
+        return process.is_running() and process.status() != psutil.STATUS_ZOMBIE
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+
+class ProcessTree:
+    """
+    A tracked root process plus every descendant discovered so far.
+
+    Descendants are found from the parent-pid map (and, on POSIX, the process-group map)
+    of a shared ProcessIndex sweep, so growing every tracked tree costs one system scan in
+    total. Members stay in the tree after their parent exits (e.g. Discord's Update.exe
+    handing over to Discord.exe), and the tree counts as running while any member is alive.
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root: The subprocess.Popen or psutil.Process that was launched or adopted.
+        """
+        self.root = root
+        self.root_pid = root.pid
+        self.members: Dict[int, psutil.Process] = {}
+        self._seen: Dict[int, float] = {}    # {pid: create_time} of every member adopted so far
+        self._parents: Dict[int, float] = {} # {pid: create_time} of members whose children belong to the tree
+        self._started_at = 0.0
+        try:
+            handle = root if isinstance(root, psutil.Process) else psutil.Process(root.pid)
+            self._started_at = handle.create_time()
+            self.members[root.pid] = handle
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+        self._seen[root.pid] = self._started_at
+        self._parents[root.pid] = self._started_at
+        self.pgid = self._own_group_id()
+
+    def _own_group_id(self) -> Optional[int]:
+        """Returns the root's process group on POSIX if the root leads its own group."""
+        if sys.platform == "win32":
+            return None
+        try:
+            pgid = os.getpgid(self.root_pid)
+        except OSError:
+            return None
+        return pgid if pgid == self.root_pid else None
+
+    def update(self, index: ProcessIndex):
+        """Adds descendants found in the index sweep and drops members that exited."""
+        pending = list(self._parents.items())
+        if self.pgid is not None and self._group_is_ours():
+            # Helpers orphaned by an exited launcher are reparented but stay in our session's group
+            self._adopt(index.group_members(self.pgid), pending, self._started_at)
+        while pending:
+            pid, created = pending.pop()
+            member = self.members.get(pid)
+            if member is not None and member.is_running(): # psutil compares create times, so a reused pid fails
+                self._adopt(index.children_of(pid), pending, created)
+                continue
+            try:
+                occupant = self._current_create_time(pid)
+            except psutil.AccessDenied:
+                continue # Cannot tell whether the pid is still ours; look again on the next update
+            if occupant == created:
+                self._adopt(index.children_of(pid), pending, created)
+                continue
+            # The parent exited: its orphans keep its pid as ppid on Windows, so walk it one last
+            # time, counting only children started before anything that has reused the pid
+            self._parents.pop(pid, None)
+            self._adopt(index.children_of(pid), pending, created, occupant)
+
+        for pid, member in list(self.members.items()):
+            if pid != self.root_pid and not is_alive(member):
+                del self.members[pid]
+
+    @staticmethod
+    def _current_create_time(pid: int) -> Optional[float]:
+        """Returns the create time of whatever process holds the pid now, or None if none does."""
+        try:
+            return psutil.Process(pid).create_time()
+        except psutil.NoSuchProcess:
+            return None
+
+    def _adopt(self, candidates, pending: list, not_before: float, not_after: Optional[float] = None):
+        """
+        Adds unseen candidates started within [not_before, not_after) and queues them for a child walk.
+
+        A reused pid belongs to a process started after the original, so children of a
+        parent (or group) cannot predate it, and children of a pid's new owner start after it.
+        """
+        for proc in candidates:
+            try:
+                created = proc.create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            if self._seen.get(proc.pid) == created:
+                continue
+            if created < not_before or (not_after is not None and created >= not_after):
+                continue
+            self._seen[proc.pid] = created
+            self._parents[proc.pid] = created
+            self.members[proc.pid] = proc
+            pending.append((proc.pid, created))
+
+    def _group_is_ours(self) -> bool:
+        """
+        True unless the root's pid now belongs to another process. POSIX does not reuse a pid
+        while a group with that id has members, so a reused pid means our group is gone and
+        the pgid may name someone else's.
+        """
+        try:
+            occupant = self._current_create_time(self.pgid)
+        except psutil.AccessDenied:
+            return False
+        return occupant is None or occupant == self._started_at
+
+    def alive_members(self) -> List[psutil.Process]:
+        """Returns psutil handles for every member that is still running (root included)."""
+        members = []
+        for pid, member in self.members.items():
+            if pid == self.root_pid:
+                if is_alive(self.root):
+                    members.append(member)
+            elif is_alive(member):
+                members.append(member)
+        return members
+
+    def is_alive(self) -> bool:
+        """True while the root or any discovered descendant is running."""
+        return is_alive(self.root) or any(is_alive(m) for pid, m in self.members.items() if pid != self.root_pid)
+
+    def suspend(self) -> List[psutil.Process]:
+        """Pauses every member (SIGSTOP / NtSuspendProcess) and returns the members paused."""
+        paused = []
+        for member in self.alive_members(): # Parents first, so none can start a new helper meanwhile
+            try:
+                member.suspend()
+                paused.append(member)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return paused
+
+    def resume(self) -> List[psutil.Process]:
+        """Continues every member and returns the members resumed."""
+        resumed = []
+        for member in reversed(self.alive_members()): # Helpers first, so the app finds them responsive
+            try:
+                member.resume()
+                resumed.append(member)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return resumed
+
+    def send_terminate(self) -> List[psutil.Process]:
+        """
+        Asks every member to exit (children first) and returns the members signalled.
+        On POSIX the root's process group is signalled too, catching helpers not seen yet.
+        """
+        members = self.alive_members()
+        if self.pgid is not None and self._group_is_ours():
+            try:
+                os.killpg(self.pgid, signal.SIGTERM)
+            except OSError:
+                pass
+        for member in reversed(members):
+            try:
+                member.terminate()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return members
+
+    def send_kill(self) -> List[psutil.Process]:
+        """Force-kills every member that is still alive and returns them."""
+        members = self.alive_members()
+        if self.pgid is not None and self._group_is_ours():
+            try:
+                os.killpg(self.pgid, signal.SIGKILL)
+            except OSError:
+                pass
+        for member in members:
+            try:
+                member.kill() # TerminateProcess on Windows, SIGKILL elsewhere
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return members
+
+    def terminate(self, timeout: float = 0.5) -> bool:
+        """
+        Terminates the whole tree: SIGTERM/terminate, wait up to timeout, then kill stragglers.
+
+        Returns:
+            bool: True if every member is gone afterwards.
+        """
+        _, alive = psutil.wait_procs(self.send_terminate(), timeout=timeout)
+        if alive:
+            psutil.wait_procs(self.send_kill(), timeout=timeout)
+        if hasattr(self.root, 'poll'):
+            self.root.poll() # Reap the Popen child
+        return not self.is_alive()
+
+
+def terminate_trees(trees: Dict[object, ProcessTree], timeout: float = 0.5) -> Dict[object, bool]:
+    """
+    Terminates many process trees in parallel against one shared deadline.
+
+    Every tree is signalled first, then all members are awaited together with a single
+    psutil.wait_procs call; whatever is still alive at the deadline is killed in one batch.
+    Closing N hung apps therefore takes about 2 * timeout instead of N times that.
+
+    Args:
+        trees (dict): {key: ProcessTree} to terminate (keys are usually exe paths).
+        timeout (float): Seconds to wait for a graceful exit, and again after killing.
+
+    Returns:
+        dict: {key: True if the whole tree is gone afterwards}.
+    """
+    members = []
+    for tree in trees.values():
+        members.extend(tree.send_terminate())
+    _, alive = psutil.wait_procs(members, timeout=timeout)
+
+    if alive:
+        stragglers = {proc.pid for proc in alive}
+        killed = []
+        for tree in trees.values():
+            if stragglers.intersection(tree.members):
+                killed.extend(tree.send_kill())
+        psutil.wait_procs(killed, timeout=timeout)
+
+    results = {}
+    for key, tree in trees.items():
+        if hasattr(tree.root, 'poll'):
+            tree.root.poll() # Reap the Popen child
+        results[key] = not tree.is_alive()
+    return results
@@ -0,0 +1,60 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Profile Transition for EZ Streaming - Plans a switch between profiles that keeps shared apps running
+"""
+
+from typing import Iterable, List, NamedTuple
+
+from config_models import ProfileConfig, ProgramConfig
+from process_index import normalize_path
+
+
+class ProfileTransition(NamedTuple):
+    """What switching to a profile changes, by executable path."""
+    close: List[str]             # Running paths the target profile does not use
+    keep: List[str]              # Running paths the target profile uses too
+    launch: List[ProgramConfig]  # Target programs that are not running yet
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.close and not self.launch
+
+
+def plan_transition(running_paths: Iterable[str], target: ProfileConfig) -> ProfileTransition:
+    """
+    Diffs the running programs against a target profile.
+
+    Paths are compared normalized (case-insensitively on Windows), so a program shared by
+    both profiles is kept even if the two entries spell its path differently.
+
+    Args:
+        running_paths: Executable paths of the programs that are running now.
+        target: The profile to switch to.
+
+    Returns:
+        ProfileTransition: Paths to close and keep (as given), programs to launch (in profile order).
+    """
+    wanted = {normalize_path(program.path) for program in target.programs if program.path}
+    running = {}
+    for path in running_paths:
+        if path:
+            running.setdefault(normalize_path(path), path)
+    close = [path for key, path in running.items() if key not in wanted]
+    keep = [path for key, path in running.items() if key in wanted]
+    launch = [program for program in target.programs if program.path and normalize_path(program.path) not in running]
+    return ProfileTransition(close, keep, launch)
@@ -0,0 +1,318 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Readiness Probes for EZ Streaming - Detects when a launched app is actually ready
+"""
+
+import os
+import re
+import socket
+import subprocess
+import tempfile
+import time
+from typing import Optional
+
+import psutil
+
+from exceptions import ConfigError
+from process_index import ProcessIndex
+from process_tree import ProcessTree
+
+PROBE_POLL_INTERVAL_MS = 250 # How often the launch sequence checks pending probes
+TCP_CONNECT_TIMEOUT = 0.05   # Seconds; probes target local services, so a refusal is immediate
+DEFAULT_CPU_THRESHOLD = 5.0  # Percent (of one core) the app must stay below
+DEFAULT_CPU_SETTLE = 2.0     # Seconds the app must stay below the threshold
+OUTPUT_LOG_DIR = os.path.join(tempfile.gettempdir(), "EZStreaming", "output") # Where "output" probes redirect apps to
+MAX_OUTPUT_LOGS = 20         # Output logs kept; older ones are deleted when a new launch needs one
+OUTPUT_READ_LIMIT = 1 << 20  # Bytes an output probe reads per poll, so a chatty app cannot stall the UI
+
+
+class ReadinessProbe:
+    """
+    Base class for readiness probes.
+
+    A probe is created before launch (popen_kwargs() can ask for extra Popen arguments),
+    started with the new process, then polled with check() until it passes or the
+    program's configured delay runs out. check() must return quickly: it runs on the UI thread.
+    """
+
+    kind = ""
+
+    def popen_kwargs(self) -> dict:
+        """Extra keyword arguments the probe needs when the program is started."""
+        return {}
+
+    def start(self, process):
+        """Begins watching a freshly launched process (a subprocess.Popen)."""
+        self.process = process
+        self.started_at = time.monotonic()
+
+    def check(self) -> bool:
+        """Returns True once the app is ready."""
+        raise NotImplementedError
+
+    def stop(self):
+        """Releases anything the probe holds once it is no longer polled."""
+        pass
+
+    def describe(self) -> str:
+        """Short human-readable description for logs."""
+        return self.kind
+
+
+class TcpPortProbe(ReadinessProbe):
+    """Ready once a TCP port accepts connections (e.g. OBS WebSocket on 4455)."""
+
+    kind = "tcp"
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        self.port = int(port)
+        self.host = host
+
+    def check(self) -> bool:
+        try:
+            with socket.create_connection((self.host, self.port), timeout=TCP_CONNECT_TIMEOUT):
+                return True
+        except OSError:
+            return False
+
+    def describe(self) -> str:
+        return f"tcp {self.host}:{self.port}"
+
+
+class PathExistsProbe(ReadinessProbe):
+    """Ready once a file, socket or named pipe exists (e.g. a lock file or IPC socket)."""
+
+    kind = "path"
+
+    def __init__(self, path: str):
+        self.path = os.path.expandvars(os.path.expanduser(path))
+
+    def check(self) -> bool:
+        return os.path.exists(self.path)
+
+    def describe(self) -> str:
+        return f"path {self.path}"
+
+
+class CpuSettledProbe(ReadinessProbe):
+    """
+    Ready once the app's whole process tree stays below a CPU threshold for a while.
+
+    Descendants come from a ProcessTree grown from a shared ProcessIndex (re-swept at most
+    once per its TTL), and one psutil handle per member is kept between polls, so a poll
+    costs a few reads per member instead of a walk of the system process table.
+    """
+
+    kind = "cpu"
+
+    def __init__(self, below: float = DEFAULT_CPU_THRESHOLD, settle: float = DEFAULT_CPU_SETTLE,
+                 process_index: Optional[ProcessIndex] = None):
+        self.below = float(below)
+        self.settle = float(settle)
+        self.process_index = process_index
+        self._tree: Optional[ProcessTree] = None
+        self._handles = {}
+        self._quiet_since: Optional[float] = None
+
+    def start(self, process):
+        super().start(process)
+        if self.process_index is None:
+            self.process_index = ProcessIndex()
+        self._tree = ProcessTree(process)
+        self._handles = {}
+        self._quiet_since = None
+
+    def _tree_cpu(self) -> float:
+        """Sums cpu_percent since the previous check over the root and its descendants."""
+        self._tree.update(self.process_index)
+        total = 0.0
+        handles = {}
+        for member in self._tree.alive_members():
+            try:
+                # Our own handle per member: cpu_percent measures since this probe's previous call only
+                handle = self._handles.get(member.pid) or psutil.Process(member.pid)
+                total += handle.cpu_percent(None) # First call per handle primes the counter and reads 0
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            handles[member.pid] = handle
+        self._handles = handles
+        return total
+
+    def check(self) -> bool:
+        now = time.monotonic()
+        primed = bool(self._handles) # The very first reading is always 0 and proves nothing
+        if self._tree_cpu() >= self.below or not primed:
+            self._quiet_since = None
+            return False
+        if self._quiet_since is None:
+            self._quiet_since = now
+        return now - self._quiet_since >= self.settle
+
+    def describe(self) -> str:
+        return f"cpu below {self.below:g}% for {self.settle:g}s"
+
+
+class ChildProcessProbe(ReadinessProbe):
+    """Ready once the app spawned a child process (optionally one with a given name)."""
+
+    kind = "child"
+
+    def __init__(self, name: str = ""):
+        self.name = name.lower()
+
+    def check(self) -> bool:
+        try:
+            children = psutil.Process(self.process.pid).children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return False
+        if not self.name:
+            return bool(children)
+        for child in children:
+            try:
+                if child.name().lower() == self.name:
+                    return True
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return False
+
+    def describe(self) -> str:
+        return f"child {self.name or '(any)'}"
+
+
+class OutputMatchProbe(ReadinessProbe):
+    """
+    Ready once a line of the app's stdout/stderr matches a regular expression.
+
+    The program's output is redirected to a per-launch log file (not a pipe), and check()
+    reads whatever was appended since the last poll. The app keeps writing to the file
+    after EZ Streaming exits, so closing the launcher can never break a running app's output.
+    """
+
+    kind = "output"
+
+    def __init__(self, pattern: str):
+        try:
+            self.pattern = re.compile(pattern)
+        except re.error as e:
+            raise ConfigError(f"Invalid output pattern '{pattern}': {e}") from e
+        self.log_path: Optional[str] = None
+        self._writer = None
+        self._reader = None
+        self._partial = ""
+        self._matched = False
+
+    def popen_kwargs(self) -> dict:
+        os.makedirs(OUTPUT_LOG_DIR, exist_ok=True)
+        _prune_output_logs()
+        fd, self.log_path = tempfile.mkstemp(prefix="output-", suffix=".log", dir=OUTPUT_LOG_DIR)
+        self._writer = os.fdopen(fd, "wb")
+        return {"stdout": self._writer, "stderr": subprocess.STDOUT}
+
+    def start(self, process):
+        super().start(process)
+        self._close_writer() # The child holds its own copy of the handle
+        if self.log_path:
+            print(f"[OutputMatchProbe] Output of PID {process.pid} goes to {self.log_path}")
+            try:
+                self._reader = open(self.log_path, "rb")
+            except OSError as e:
+                print(f"[OutputMatchProbe] Cannot read {self.log_path}: {e}")
+
+    def check(self) -> bool:
+        if self._matched or self._reader is None:
+            return self._matched
+        try:
+            chunk = self._reader.read(OUTPUT_READ_LIMIT)
+        except OSError:
+            return False
+        if not chunk:
+            return False
+        lines = (self._partial + chunk.decode('utf-8', errors='replace')).split('\n')
+        self._partial = lines.pop()[-OUTPUT_READ_LIMIT:] # An unfinished line is matched again once it grows
+        self._matched = any(self.pattern.search(line) for line in lines) or bool(self.pattern.search(self._partial))
+        return self._matched
+
+    def stop(self):
+        self._close_writer()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def describe(self) -> str:
+        return f"output /{self.pattern.pattern}/"
+
+
+def _prune_output_logs():
+    """Deletes all but the newest output logs (files an app still has open may refuse on Windows)."""
+    try:
+        logs = [entry for entry in os.scandir(OUTPUT_LOG_DIR) if entry.name.endswith(".log")]
+    except OSError:
+        return
+    logs.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in logs[MAX_OUTPUT_LOGS - 1:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def create_probe(spec: Optional[dict], process_index: Optional[ProcessIndex] = None) -> Optional[ReadinessProbe]:
+    """
+    Creates a probe from a ProgramConfig.ready_probe spec.
+
+    process_index is the shared index "cpu" probes find the app's helper processes in;
+    they create their own if it is omitted.
+
+    Supported specs:
+        {"type": "tcp", "port": 4455, "host": "127.0.0.1"}
+        {"type": "path", "path": "%APPDATA%/app/ready.lock"}
+        {"type": "cpu", "below": 5, "settle": 2}
+        {"type": "child", "name": "Discord.exe"}
+        {"type": "output", "pattern": "Server started"}
+
+    Returns:
+        The probe, or None if the spec is empty (fixed delay).
+
+    Raises:
+        ConfigError: If the spec is malformed.
+    """
+    if not spec:
+        return None
+    if not isinstance(spec, dict):
+        raise ConfigError(f"Readiness probe must be an object, got: {spec!r}")
+    kind = spec.get("type")
+    try:
+        if kind == "tcp":
+            return TcpPortProbe(spec["port"], spec.get("host", "127.0.0.1"))
+        if kind == "path":
+            return PathExistsProbe(spec["path"])
+        if kind == "cpu":
+            return CpuSettledProbe(spec.get("below", DEFAULT_CPU_THRESHOLD), spec.get("settle", DEFAULT_CPU_SETTLE),
+                                   process_index)
+        if kind == "child":
+            return ChildProcessProbe(spec.get("name", ""))
+        if kind == "output":
+            return OutputMatchProbe(spec["pattern"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ConfigError(f"Invalid '{kind}' readiness probe {spec!r}: {e}") from e
+    raise ConfigError(f"Unknown readiness probe type: {kind!r}")
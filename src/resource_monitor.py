@@ -13,109 +13,87 @@ Resource Monitor for EZ Streaming - Monitors CPU, GPU, and Memory usage of proce
 import psutil
 import os
 import platform
-from typing import Dict, Optional, Tuple
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+from process_index import ProcessIndex
+from metrics_store import MetricsStore
+from gpu_backends import GpuBackend, GpuSampler, create_default_backend
 
-# Try to import GPU monitoring libraries
-try:
-    import GPUtil
-    GPU_AVAILABLE = True
-except ImportError:
-    GPU_AVAILABLE = False
+STATS_MIN_INTERVAL = 1.0 # Seconds before ProcessStatsProvider takes a fresh sample
+STATS_IDLE_TIMEOUT = 60.0 # Seconds a process may go unrequested before its cached handle and sample are dropped
 
-try:
-    # For NVIDIA GPUs
-    import pynvml
-    NVIDIA_AVAILABLE = True
-except ImportError:
-    NVIDIA_AVAILABLE = False
+
+class SystemCpuMeter:
+    """
+    System-wide CPU usage since this meter's previous reading.
+
+    psutil.cpu_percent(None) measures since the previous call by anyone in the process, so
+    two users (the priority governor, the load gate) would shorten each other's windows;
+    each meter keeps its own cpu_times() snapshot instead.
+    """
+
+    def __init__(self):
+        self._last = self._busy_and_total(psutil.cpu_times())
+
+    @staticmethod
+    def _busy_and_total(times) -> Tuple[float, float]:
+        total = sum(times)
+        # Guest time is already included in user time on Linux
+        total -= getattr(times, 'guest', 0.0) + getattr(times, 'guest_nice', 0.0)
+        idle = times.idle + getattr(times, 'iowait', 0.0)
+        return total - idle, total
+
+    def read(self) -> float:
+        """Returns CPU usage (0-100) since the previous read() or since the meter was created."""
+        busy, total = self._busy_and_total(psutil.cpu_times())
+        last_busy, last_total = self._last
+        self._last = (busy, total)
+        if total <= last_total:
+            return 0.0
+        return min(max((busy - last_busy) / (total - last_total) * 100.0, 0.0), 100.0)
+
+
+class ResourceSample(NamedTuple):
+    """Resource usage of one process from a single sample_many() pass"""
+    pid: int
+    cpu: float     # Percent of total CPU capacity (0-100)
+    memory: float  # Percent of total RAM
+    rss: int       # Resident set size in bytes
+    gpu: float     # Percent GPU usage
+    io: float      # Disk read + write throughput in MB/s since the previous sample
 
 
 class ResourceMonitor:
     """Monitors system resources for running processes"""
     
-    def __init__(self):
+    def __init__(self, process_index: Optional[ProcessIndex] = None, gpu_backend: Optional[GpuBackend] = None):
+        """
+        Args:
+            process_index (ProcessIndex, optional): Shared system process index.
+            gpu_backend (GpuBackend, optional): GPU backend to sample. The best available one is picked if omitted.
+        """
         self.system = platform.system()
-        self._init_gpu_monitoring()
-        
-    def _init_gpu_monitoring(self):
-        """Initialize GPU monitoring if available"""
-        self.gpu_initialized = False
-        
-        if NVIDIA_AVAILABLE:
-            try:
-                pynvml.nvmlInit()
-                self.gpu_count = pynvml.nvmlDeviceGetCount()
-                self.gpu_initialized = True
-            except:
-                pass
+        self.process_index = process_index if process_index is not None else ProcessIndex()
+        # System constants, read once instead of on every sample
+        self.cpu_count = psutil.cpu_count() or 1
+        self.total_memory = psutil.virtual_memory().total
+        self.metrics = MetricsStore() # History of every sample taken through sample_many
+        self._cpu_meter = SystemCpuMeter() # Own window, unaffected by other cpu_percent() callers
+        self._last_io = {} # {pid: (monotonic time, read + write bytes)} for io rates
+        # GPU readings are taken on their own cadence in a background thread, started by the first read
+        self.gpu_sampler = GpuSampler(gpu_backend if gpu_backend is not None else create_default_backend())
+
+    def shutdown(self):
+        """Stops background GPU sampling."""
+        self.gpu_sampler.stop()
     
     def get_process_by_path(self, exe_path: str) -> Optional[psutil.Process]:
         """Find a running process by its executable path"""
         if not exe_path:
             return None
             
-        exe_name = os.path.basename(exe_path).lower()
-        
-        try:
-            for proc in psutil.process_iter(['pid', 'name', 'exe']):
-                try:
-                    # Check by exact path first, using normcase for case-insensitivity
-                    if proc.info['exe'] and os.path.normcase(os.path.normpath(proc.info['exe'])) == os.path.normcase(os.path.normpath(exe_path)):
-                        return proc
-                    # Check by name as fallback
-                    elif proc.info['name'] and proc.info['name'].lower() == exe_name:
-                        # Verify it's the right process by checking if paths match, using normcase
-                        if proc.exe() and os.path.normcase(os.path.normpath(proc.exe())) == os.path.normcase(os.path.normpath(exe_path)):
-                            return proc
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-        except:
-            pass
-        
-        return None
-    
-    def _get_gpu_usage_nvidia_smi(self, pid: int) -> float:
-        """Get GPU usage using nvidia-smi command (most accurate for process-specific)"""
-        try:
-            import subprocess
-            
-            # First get the overall GPU usage
-            result = subprocess.run(
-                ['nvidia-smi', '--query-gpu=utilization.gpu', '--format=csv,noheader,nounits'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            
-            if result.returncode == 0:
-                try:
-                    overall_gpu = float(result.stdout.strip())
-                    
-                    # Try to get process-specific info
-                    proc_result = subprocess.run(
-                        ['nvidia-smi', '--query-compute-apps=pid,used_memory', '--format=csv,noheader,nounits'],
-                        capture_output=True,
-                        text=True,
-                        timeout=2
-                    )
-                    
-                    if proc_result.returncode == 0 and proc_result.stdout.strip():
-                        # If our process is using GPU, return overall usage
-                        # (process-specific GPU % is not available via nvidia-smi)
-                        lines = proc_result.stdout.strip().split('\n')
-                        for line in lines:
-                            if str(pid) in line:
-                                return overall_gpu
-                    
-                    # If process not found in GPU processes, return 0
-                    return 0.0
-                    
-                except ValueError:
-                    pass
-        except Exception:
-            pass
-        
-        return 0.0
+        # Exact exe path match only, answered from the shared one-sweep index
+        return self.process_index.find(exe_path)
     
     def get_process_resources(self, process: psutil.Process) -> Dict[str, float]:
         """
@@ -133,102 +111,76 @@ class ResourceMonitor:
         if not process:
             return resources
         
-        try:
-            # CPU usage (percentage of total CPU)
-            # Changed interval to None for non-blocking call
-            cpu_percent = process.cpu_percent(interval=None)
-            # Normalize to 0-100 range (psutil returns per-core percentage)
-            cpu_count = psutil.cpu_count()
-            resources['cpu'] = min(cpu_percent / cpu_count if cpu_count else cpu_percent, 100.0)
-            
-            # Memory usage (percentage of total RAM)
-            memory_info = process.memory_info()
-            total_memory = psutil.virtual_memory().total
-            resources['memory'] = (memory_info.rss / total_memory) * 100.0
-            
-            # GPU usage - try multiple methods
-            gpu_usage = 0.0
-            
-            # Removed initial call to _get_gpu_usage_nvidia_smi for performance.
-            # Rely on pynvml and GPUtil first.
-            if self.gpu_initialized and NVIDIA_AVAILABLE:
-                gpu_usage = self._get_nvidia_gpu_usage(process.pid)
-            
-            if gpu_usage == 0.0: # If pynvml didn't work or wasn't available
-                if GPU_AVAILABLE:
-                    gpu_usage = self._get_gpu_usage_gputil()
-                else:
-                    gpu_usage = self._get_gpu_usage_windows()
-            
-            resources['gpu'] = gpu_usage
-                
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
-            
+        sample = self.sample_many([process]).get(process.pid)
+        if sample:
+            resources['cpu'] = sample.cpu
+            resources['memory'] = sample.memory
+            resources['gpu'] = sample.gpu
         return resources
     
-    def _get_nvidia_gpu_usage(self, pid: int) -> float:
-        """Get GPU usage for a specific process using NVIDIA tools"""
-        try:
-            # Get the default GPU (index 0)
-            handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-            
-            # Get overall GPU utilization
-            util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-            
-            # Try to get process-specific usage
+    def system_cpu(self) -> float:
+        """Returns system-wide CPU usage (0-100) since the previous call (or since creation), without blocking."""
+        return self._cpu_meter.read()
+
+    def sample_many(self, processes: Iterable[psutil.Process]) -> Dict[int, ResourceSample]:
+        """
+        Sample resource usage for many processes in one pass.
+
+        Each process is read once inside Process.oneshot(), and GPU figures come from the
+        GpuSampler's latest snapshot instead of a query per process. Processes that vanished or deny access
+        are left out of the result. Every sample is also recorded in self.metrics.
+
+        Returns:
+            Dict of {pid: ResourceSample}
+        """
+        samples = {}
+        gpu_by_pid, overall_gpu = self._sample_gpu_batch()
+        now = time.monotonic()
+        
+        for process in processes:
             try:
-                processes = pynvml.nvmlDeviceGetComputeRunningProcesses(handle)
-                for proc in processes:
-                    if proc.pid == pid:
-                        # Found our process - calculate percentage
-                        mem_info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                        return (proc.usedGpuMemory / mem_info.total) * 100.0
-            except:
-                pass
+                with process.oneshot():
+                    # interval=None is non-blocking; psutil returns per-core percentage
+                    cpu_percent = process.cpu_percent(interval=None)
+                    rss = process.memory_info().rss
+                    try:
+                        io = process.io_counters()
+                        io_bytes = io.read_bytes + io.write_bytes
+                    except (AttributeError, psutil.AccessDenied): # Not available on macOS
+                        io_bytes = None
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self._last_io.pop(process.pid, None)
+                continue
             
-            # If we can't get process-specific, return overall GPU usage
-            return float(util.gpu)
-        except Exception as e:
-            print(f"Error getting NVIDIA GPU usage: {e}")
-            return 0.0
-    
-    def _get_gpu_usage_gputil(self) -> float:
-        """Get GPU usage using GPUtil"""
-        try:
-            gpus = GPUtil.getGPUs()
-            if gpus:
-                return gpus[0].load * 100
-        except:
-            pass
-        return 0.0
-    
-    def _get_gpu_usage_windows(self) -> float:
-        """Get GPU usage using Windows Performance Counters"""
-        if self.system != 'Windows':
-            return 0.0
+            io_rate = 0.0
+            if io_bytes is not None:
+                previous = self._last_io.get(process.pid)
+                if previous and now > previous[0]:
+                    io_rate = max(io_bytes - previous[1], 0) / (now - previous[0]) / 1_000_000
+                self._last_io[process.pid] = (now, io_bytes)
             
-        try:
-            # Try using Windows WMI
-            import subprocess
-            result = subprocess.run(
-                ['wmic', 'path', 'Win32_VideoController', 'get', 'CurrentUsage'],
-                capture_output=True,
-                text=True,
-                timeout=2
+            sample = ResourceSample(
+                pid=process.pid,
+                cpu=min(cpu_percent / self.cpu_count, 100.0), # Normalize to 0-100 range
+                memory=(rss / self.total_memory) * 100.0,
+                rss=rss,
+                gpu=gpu_by_pid.get(process.pid) or overall_gpu(),
+                io=io_rate
             )
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                for line in lines:
-                    if line.strip() and not 'CurrentUsage' in line:
-                        try:
-                            return float(line.strip())
-                        except:
-                            pass
-        except:
-            pass
+            samples[process.pid] = sample
+            self.metrics.record(process.pid, sample, now)
         
-        return 0.0
+        return samples
+    
+    def _sample_gpu_batch(self):
+        """
+        Read GPU usage for a whole batch from the sampler's latest snapshot (never blocks).
+
+        Returns:
+            Tuple of ({pid: process GPU %}, callable returning the overall GPU %).
+        """
+        snapshot = self.gpu_sampler.latest()
+        return snapshot.process_memory, lambda: snapshot.overall
     
     def get_resource_color(self, percentage: float, resource_type: str = 'cpu') -> str:
         """
@@ -257,3 +209,94 @@ class ResourceMonitor:
     def format_percentage(self, value: float) -> str:
         """Format percentage for display"""
         return f"{value:.1f}%"
+
+
+class ProcessStatsProvider:
+    """
+    Non-blocking, stateful per-process stats built on ResourceMonitor.sample_many.
+
+    One psutil.Process handle is kept per (pid, create_time), so cpu_percent(interval=None)
+    measures the delta since the previous tick instead of sleeping. Callers always get the
+    last known sample immediately; a new one is taken at most every min_interval seconds.
+    Entries not requested for idle_timeout seconds (untracked programs, one-off lookups)
+    are dropped even if the process is still running.
+    """
+    
+    def __init__(self, monitor: ResourceMonitor, min_interval: float = STATS_MIN_INTERVAL,
+                 idle_timeout: float = STATS_IDLE_TIMEOUT):
+        self.monitor = monitor
+        self.min_interval = min_interval
+        self.idle_timeout = idle_timeout
+        self._handles: Dict[Tuple[int, float], psutil.Process] = {}
+        self._samples: Dict[Tuple[int, float], Tuple[float, ResourceSample]] = {} # {key: (taken_at, sample)}
+        self._requested: Dict[Tuple[int, float], float] = {} # {key: monotonic time of the last get_many}
+        self._pruned_at = time.monotonic()
+    
+    def _handle_key(self, process) -> Optional[Tuple[int, float]]:
+        """Returns the (pid, create_time) key for a Popen or psutil.Process, priming a new handle."""
+        try:
+            handle = process if isinstance(process, psutil.Process) else psutil.Process(process.pid)
+            key = (handle.pid, handle.create_time()) # create_time is cached by psutil.Process
+        except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
+            return None
+        if key not in self._handles:
+            try:
+                handle.cpu_percent(interval=None) # Prime: the first call always returns 0.0
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return None
+            self._handles[key] = handle
+        return key
+    
+    def get(self, process) -> Optional[ResourceSample]:
+        """Returns the latest sample for a process without blocking, or None if it is gone."""
+        return self.get_many([process]).get(getattr(process, 'pid', None))
+    
+    def get_many(self, processes: Iterable) -> Dict[int, ResourceSample]:
+        """Returns {pid: latest sample} for several processes, refreshing the stale ones in one batch."""
+        keyed = [(process, self._handle_key(process)) for process in processes]
+        now = time.monotonic()
+        for _, key in keyed:
+            if key is not None:
+                self._requested[key] = now
+        if now - self._pruned_at >= self.idle_timeout:
+            self._prune(now)
+        stale = [process for process, key in keyed
+                 if key is not None and (key not in self._samples or now - self._samples[key][0] >= self.min_interval)]
+        if stale:
+            self.tick(stale)
+        result = {}
+        for process, key in keyed:
+            cached = self._samples.get(key) if key is not None else None
+            if cached:
+                result[key[0]] = cached[1]
+        return result
+    
+    def tick(self, processes: Iterable):
+        """Samples every given process in one batch and drops handles of processes that exited."""
+        keys = [key for key in (self._handle_key(p) for p in processes) if key is not None]
+        handles = [self._handles[key] for key in keys]
+        samples = self.monitor.sample_many(handles)
+        now = time.monotonic()
+        for key in keys:
+            sample = samples.get(key[0])
+            if sample is not None:
+                self._samples[key] = (now, sample)
+            else: # Vanished or access denied since the handle was cached
+                self._drop(key)
+    
+    def forget(self, process):
+        """Drops the cached handle and sample for a process."""
+        for key in [key for key in self._handles if key[0] == getattr(process, 'pid', None)]:
+            self._drop(key)
+
+    def _prune(self, now: float):
+        """Drops every entry that has not been requested within idle_timeout."""
+        self._pruned_at = now
+        for key in [key for key in self._handles if now - self._requested.get(key, 0.0) >= self.idle_timeout]:
+            self._drop(key)
+
+    def _drop(self, key):
+        self._handles.pop(key, None)
+        self._samples.pop(key, None)
+        self._requested.pop(key, None)
+        self.monitor._last_io.pop(key[0], None) # Its io rate baseline
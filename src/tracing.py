@@ -0,0 +1,213 @@
+# EZ Streaming
+# Copyright (C) 2025 Dkmariolink <thedkmariolink@gmail.com>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Tracing for EZ Streaming - Records launch spans and exports Chrome trace_event JSON
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional
+
+TRACE_DIRNAME = "traces"                 # Per-run trace files, next to the config
+SUMMARY_FILENAME = "launch_summary.json" # Compact summaries of recent runs
+MAX_EVENTS = 20000   # Ring buffer size; older events are dropped
+MAX_TRACE_FILES = 10 # Oldest trace files beyond this are deleted
+MAX_SUMMARIES = 20
+
+# Span categories
+CAT_SEQUENCE = "sequence" # Whole run and scheduling
+CAT_DELAY = "delay"       # Waiting on a configured/learned delay
+CAT_SPAWN = "spawn"       # Creating the process (Popen) and getting the result back
+CAT_READY = "ready"       # Waiting for a readiness probe (the app's own startup)
+CAT_UI = "ui"             # Qt-thread work: widget updates, tracking
+CAT_CONFIG = "config"     # Loading/saving configuration
+CAT_PREFETCH = "prefetch" # Warming upcoming programs' files during delays (background thread)
+
+
+class Tracer:
+    """
+    Collects timed spans on a monotonic clock, from any thread.
+
+    Synchronous work is recorded with span(); work that starts in one callback and ends
+    in another (delays, spawns, readiness waits) with begin()/end(), which become async
+    events so overlapping program launches get their own tracks in Perfetto/about:tracing.
+    """
+
+    def __init__(self, max_events: int = MAX_EVENTS):
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._open: Dict[object, dict] = {} # begin() key -> pending async event
+        self._next_id = 1
+        self._pid = os.getpid()
+        self._run_start: Optional[float] = None
+        self._run_name = ""
+        self._run_wall = 0.0
+
+    @staticmethod
+    def now_us() -> float:
+        """Microseconds on the monotonic clock used for every event."""
+        return time.perf_counter() * 1_000_000
+
+    def _add(self, event: dict):
+        event.setdefault("pid", self._pid)
+        event.setdefault("tid", threading.get_ident())
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name: str, cat: str, **args):
+        """Records the duration of a with-block as a complete ("X") event."""
+        start = self.now_us()
+        try:
+            yield
+        finally:
+            self._add({"name": name, "cat": cat, "ph": "X", "ts": start, "dur": self.now_us() - start, "args": args})
+
+    def instant(self, name: str, cat: str, **args):
+        """Records a point in time."""
+        self._add({"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self.now_us(), "args": args})
+
+    def begin(self, key, name: str, cat: str, **args):
+        """Starts an async span that end(key) will close (a pending span with the same key is closed first)."""
+        self.end(key)
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            self._open[key] = {"name": name, "cat": cat, "id": event_id, "args": args}
+        self._add({"name": name, "cat": cat, "ph": "b", "id": event_id, "ts": self.now_us(), "args": args})
+
+    def end(self, key, **args):
+        """Closes the async span started with begin(key); unknown keys are ignored."""
+        with self._lock:
+            pending = self._open.pop(key, None)
+        if pending:
+            self._add({"name": pending["name"], "cat": pending["cat"], "ph": "e", "id": pending["id"],
+                       "ts": self.now_us(), "args": args})
+
+    def begin_run(self, name: str):
+        """Marks the start of a launch run; export covers events from here on."""
+        self._run_start = self.now_us()
+        self._run_wall = time.time()
+        self._run_name = name
+        self.begin("__run__", name, CAT_SEQUENCE)
+
+    def end_run(self, out_dir: Optional[str] = None) -> Optional[dict]:
+        """
+        Closes the current run and, if out_dir is given, writes its trace and summary there.
+
+        Returns:
+            dict: The run summary, or None if no run was active.
+        """
+        if self._run_start is None:
+            return None
+        self.end("__run__")
+        with self._lock:
+            events = [e for e in self._events if e["ts"] >= self._run_start]
+        summary = self.summarize(events)
+        self._run_start = None
+        if out_dir:
+            self._write(out_dir, events, summary)
+        return summary
+
+    def summarize(self, events) -> dict:
+        """Builds a compact summary: total time, time per category and per program."""
+        by_category: Dict[str, float] = {}
+        programs: Dict[str, Dict[str, float]] = {}
+        starts = {}
+        durations = []
+        for event in events:
+            phase = event["ph"]
+            if phase == "X":
+                durations.append((event, event["dur"]))
+            elif phase == "b":
+                starts[event["id"]] = event
+            elif phase == "e" and event["id"] in starts:
+                begin = starts.pop(event["id"])
+                durations.append((begin, event["ts"] - begin["ts"]))
+
+        total = 0.0
+        for event, duration in durations:
+            seconds = duration / 1_000_000
+            if event["cat"] == CAT_SEQUENCE and event["name"] == self._run_name:
+                total = seconds
+                continue
+            by_category[event["cat"]] = by_category.get(event["cat"], 0.0) + seconds
+            program = event.get("args", {}).get("program")
+            if program:
+                per_program = programs.setdefault(program, {})
+                per_program[event["cat"]] = round(per_program.get(event["cat"], 0.0) + seconds, 3)
+        return {
+            "run": self._run_name,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self._run_wall)),
+            "total_s": round(total, 3),
+            "by_category_s": {cat: round(value, 3) for cat, value in sorted(by_category.items())},
+            "programs_s": programs
+        }
+
+    def chrome_trace(self, events) -> dict:
+        """Wraps events in the Chrome trace_event JSON object format."""
+        metadata = [{"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": "EZ Streaming"}}]
+        for thread in threading.enumerate():
+            metadata.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": thread.ident,
+                             "args": {"name": thread.name}})
+        return {"traceEvents": metadata + list(events), "displayTimeUnit": "ms"}
+
+    def _write(self, out_dir: str, events, summary: dict):
+        try:
+            trace_dir = os.path.join(out_dir, TRACE_DIRNAME)
+            os.makedirs(trace_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._run_wall))
+            trace_path = os.path.join(trace_dir, f"launch-{stamp}.json")
+            with open(trace_path, 'w', encoding='utf-8') as f:
+                json.dump(self.chrome_trace(events), f)
+            summary["trace_file"] = trace_path
+            for old in sorted(name for name in os.listdir(trace_dir) if name.startswith("launch-"))[:-MAX_TRACE_FILES]:
+                os.remove(os.path.join(trace_dir, old))
+
+            summary_path = os.path.join(out_dir, SUMMARY_FILENAME)
+            try:
+                with open(summary_path, 'r', encoding='utf-8') as f:
+                    runs = json.load(f)
+                if not isinstance(runs, list):
+                    runs = []
+            except (OSError, ValueError):
+                runs = []
+            runs = (runs + [summary])[-MAX_SUMMARIES:]
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump(runs, f, indent=2)
+            print(f"[Tracer] Launch trace written to {trace_path}")
+        except OSError as e:
+            print(f"[Tracer] Could not write launch trace: {e}")
+
+
+tracer = Tracer() # Shared by every module that records spans
+
+
+def traced(name: str, cat: str):
+    """Decorator that records every call of a function as a span on the shared tracer."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator